@@ -0,0 +1,51 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+
+from benchmarks.utils import bench, TRADE, DIFF_DEPTH
+from cpro import codec
+from cpro.models.ws_stream import unmarshal_frame
+
+# python -m benchmarks.bench_codec
+
+TRADE_FRAME = json.dumps(TRADE).encode()
+ORDER_BOOK = json.dumps({
+    "lastUpdateId": 1027024,
+    "bids": [[f"{4 - i / 1000:.8f}", "431.00000000"] for i in range(1000)],
+    "asks": [[f"{4 + i / 1000:.8f}", "12.00000000"] for i in range(1000)],
+}).encode()
+
+
+def main():
+    for name in codec.CODECS:
+        try:
+            selected = codec.set_codec(name)
+        except ImportError:
+            print(f"{name} is not installed")
+            continue
+        bench(f"{name} loads order book (1000 levels)", lambda: selected.loads(ORDER_BOOK))
+        bench(f"{name} dumps diff depth", lambda: selected.dumps(DIFF_DEPTH))
+        bench(f"{name} unmarshal_frame trade", lambda: unmarshal_frame(TRADE_FRAME))
+    codec.set_codec(None)
+
+
+if __name__ == "__main__":
+    main()
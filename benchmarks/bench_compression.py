@@ -0,0 +1,105 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gzip
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.bench_lazy import exchange_information
+from benchmarks.utils import bench
+from cpro.client.rest import BlockingHTTPClient
+from cpro.codec import dumps_bytes
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import ChartIntervals
+from cpro.models.rest.request import GraphDataRequest
+
+# python -m benchmarks.bench_compression
+# Wall times are over loopback, where bandwidth is free; the bytes are what a real link has to carry.
+
+KLINES = [
+    [1672515780000 + i * 60000, "3521000.50", "3521900.00", "3520100.25", "3521450.75", "12.52310000",
+     1672515839999 + i * 60000, "44093182.41", 128, "6.10230000", "21485231.77", "0"]
+    for i in range(1000)
+]
+PAYLOADS = {
+    APIEndpoints.GET_EXCHANGE_INFO.value.endpoint: dumps_bytes(exchange_information(1000)),
+    APIEndpoints.GET_GRAPH_DATA.value.endpoint: dumps_bytes(KLINES),
+}
+LINK_RATE = 20e6  # bits per second
+# compressed once up front, as a CDN in front of the API would serve them
+ENCODED = {
+    path: {"gzip": gzip.compress(body, 6), "deflate": zlib.compress(body, 6), "identity": body}
+    for path, body in PAYLOADS.items()
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    sent = 0
+
+    def do_GET(self):
+        accepted = [_.strip() for _ in self.headers.get("Accept-Encoding", "").split(",")]
+        encoding = next((_ for _ in ("gzip", "deflate") if _ in accepted), "identity")
+        body = ENCODED[self.path.split("?")[0]][encoding]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        _Handler.sent += len(body)
+
+    def log_message(self, *_):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(("localhost", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    requests = {
+        "exchangeInfo, 1000 symbols": lambda client: APIEndpoints.GET_EXCHANGE_INFO.execute(client),
+        "klines, 1000 candles": lambda client: APIEndpoints.GET_GRAPH_DATA.execute(
+            client, GraphDataRequest("BTCPHP", ChartIntervals._1m, limit=1000)
+        ),
+    }
+    try:
+        for name, request in requests.items():
+            for encoding in ("identity", "gzip, deflate"):
+                client = BlockingHTTPClient()
+                client.API_BASE_URL = f"http://localhost:{server.server_address[1]}"
+                client.ACCEPT_ENCODING = encoding
+                _Handler.sent = 0
+                started = time.perf_counter()
+                request(client)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"{f'{name} ({encoding})':<48} {_Handler.sent:>14,} bytes {elapsed * 1e3:>10.2f} ms (cold), "
+                    f"{_Handler.sent * 8 / LINK_RATE * 1e3:.1f} ms to transfer at {LINK_RATE / 1e6:.0f} Mbit/s"
+                )
+                bench(f"{name} ({encoding})", lambda: request(client), number=20, repeat=3)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+
+from benchmarks.utils import bench, ACCOUNT_UPDATE, BALANCE_UPDATE, ORDER_UPDATE
+from cpro.codec import loads
+from cpro.models.ud_stream import unmarshal_stream_data, AccountUpdateData, BalanceUpdateData, OrderUpdateData
+
+# python -m benchmarks.bench_dispatch
+
+EVENTS = (
+    (AccountUpdateData, ACCOUNT_UPDATE),
+    (BalanceUpdateData, BALANCE_UPDATE),
+    (OrderUpdateData, ORDER_UPDATE),
+)
+
+
+def main():
+    try:
+        from cpro.models.structs import decode_stream_data
+    except ImportError:
+        decode_stream_data = None
+
+    for cls, data in EVENTS:
+        frame = json.dumps(data).encode()
+        bench(f"{cls.__name__}.from_dict", lambda: cls.from_dict(data))
+        bench(f"unmarshal_stream_data {data['e']}", lambda: unmarshal_stream_data(data))
+        bench(f"loads + unmarshal_stream_data {data['e']}", lambda: unmarshal_stream_data(loads(frame)))
+        if decode_stream_data:
+            bench(f"struct tier {data['e']}", lambda: decode_stream_data(frame))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from benchmarks.utils import bench
+from cpro.models.lazy import lazy
+from cpro.models.rest.response import ExchangeInformationResponse
+
+# python -m benchmarks.bench_lazy
+
+
+def exchange_information(symbols: int) -> dict:
+    return {
+        "timezone": "UTC", "serverTime": 1672515782136, "exchangeFilters": [],
+        "symbols": [{
+            "symbol": f"COIN{i}PHP", "status": "trading", "baseAsset": f"COIN{i}", "baseAssetPrecision": 8,
+            "quoteAsset": "PHP", "quoteAssetPrecision": 2, "orderTypes": ["LIMIT", "MARKET", "LIMIT_MAKER"],
+            "filters": [
+                {"filterType": "PRICE_FILTER", "minPrice": "0.01", "maxPrice": "1000000", "tickSize": "0.01"},
+                {"filterType": "LOT_SIZE", "minQty": "0.0001", "maxQty": "100000", "stepSize": "0.0001"},
+            ]
+        } for i in range(symbols)]
+    }
+
+
+def main():
+    for symbols in (10, 100, 1000):
+        data = exchange_information(symbols)
+        wanted = f"COIN{symbols // 2}PHP"
+        bench(
+            f"eager, one symbol of {symbols}",
+            lambda: next(_ for _ in ExchangeInformationResponse.from_dict(data).symbols if _.symbol == wanted)
+        )
+        bench(
+            f"lazy, one symbol of {symbols}",
+            lambda: lazy(ExchangeInformationResponse).from_dict(data).symbols.find(symbol=wanted).filters
+        )
+
+
+if __name__ == "__main__":
+    main()
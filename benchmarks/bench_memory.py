@@ -0,0 +1,71 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gc
+import tracemalloc
+
+from benchmarks.utils import TRADE, AGGREGATE_TRADE, BOOK_TICKER, ORDER_UPDATE, DIFF_DEPTH
+from cpro.models.compact import compact
+from cpro.models.options import DecodeOptions, NumericMode, TimestampMode, decode_options
+from cpro.models.ud_stream import OrderUpdateData
+from cpro.models.ws_stream import TradeData, AggregateTradeData, IndividualSymbolBookTickerData, DiffDepthData
+
+# python -m benchmarks.bench_memory
+
+MODELS = (
+    (DiffDepthData, DIFF_DEPTH),
+    (TradeData, TRADE),
+    (AggregateTradeData, AGGREGATE_TRADE),
+    (IndividualSymbolBookTickerData, BOOK_TICKER),
+    (OrderUpdateData, ORDER_UPDATE),
+)
+COUNT = 2000
+
+
+def retained_bytes(cls, data: dict, count: int = COUNT) -> float:
+    """
+    :return: The bytes retained per decoded instance, including the values it holds
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls.from_dict(data) for _ in range(count)]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del instances
+    return retained / count
+
+
+def main():
+    for label, options in (
+            ("default", DecodeOptions()),
+            ("epoch millis, scaled", DecodeOptions(
+                timestamp_mode=TimestampMode.EPOCH_MILLIS, numeric_mode=NumericMode.SCALED
+            )),
+    ):
+        print(f"-- {label}")
+        with decode_options(options):
+            for cls, data in MODELS:
+                before, after = retained_bytes(cls, data), retained_bytes(compact(cls), data)
+                print(f"{cls.__name__:<40} {before:>8.0f} B -> {after:>8.0f} B per instance")
+
+
+if __name__ == "__main__":
+    main()
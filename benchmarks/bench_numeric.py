@@ -0,0 +1,41 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from benchmarks.utils import bench, TRADE, DIFF_DEPTH
+from cpro.models.options import DecodeOptions, NumericMode, decode_options
+from cpro.models.ws_stream import TradeData, DiffDepthData
+
+# python -m benchmarks.bench_numeric
+
+
+def main():
+    for mode in NumericMode:
+        with decode_options(DecodeOptions(numeric_mode=mode)):
+            bench(f"TradeData.from_dict ({mode.name})", lambda: TradeData.from_dict(TRADE))
+            bench(f"DiffDepthData.from_dict ({mode.name})", lambda: DiffDepthData.from_dict(DIFF_DEPTH))
+            depth = DiffDepthData.from_dict(DIFF_DEPTH)
+            bench(
+                f"DiffDepthData notional ({mode.name})",
+                lambda: sum(order.price * order.qty for order in depth.bidsUpdated + depth.asksUpdated)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from decimal import Decimal
+
+from benchmarks.utils import bench
+from cpro.client.rest import APICredentials
+from cpro.client.template import OrderTemplate
+from cpro.models.rest.enums import OrderSides, OrderTypes, TimeInForce
+from cpro.models.rest.request import NewOrderRequest
+
+# python -m benchmarks.bench_orders
+
+CREDENTIALS = APICredentials(
+    "tAQfOrPIZAhym0qHISRt8EFvxPemdBm5j5WMlkm3Ke9aFp0EGWC2CGM8GHV4kCYW",
+    "lH3ELTNiFxCQTmi9pPcWWikhsjO04Yoqw3euoHUuOLC3GYBW64ZqzQsiOEHXQS76"
+)
+PRICE = Decimal("3521000.50")
+QUANTITY = Decimal("0.0125")
+
+
+def main():
+    template = OrderTemplate(
+        CREDENTIALS, "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT, timeInForce=TimeInForce.GOOD_TIL_CANCELLED
+    )
+
+    def request_path():
+        return NewOrderRequest(
+            "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT, timeInForce=TimeInForce.GOOD_TIL_CANCELLED, price=PRICE,
+            quantity=QUANTITY, newClientOrderId="quote-1"
+        ).to_encoded().sign(CREDENTIALS.api_key, CREDENTIALS.api_secret).params
+
+    old = bench("NewOrderRequest encode + sign", request_path)
+    new = bench("OrderTemplate.encode", lambda: template.encode(
+        price=PRICE, quantity=QUANTITY, client_order_id="quote-1"
+    ))
+    bench("OrderTemplate.encode (pre-formatted numbers)", lambda: template.encode(
+        price="3521000.50", quantity="0.0125", client_order_id="quote-1"
+    ))
+    print(f"{'speedup':<48} {new / old:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
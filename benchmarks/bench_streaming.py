@@ -0,0 +1,68 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gc
+import tracemalloc
+
+from benchmarks.bench_compression import KLINES
+from cpro.client.streaming import JSONArraySplitter, element_decoder
+from cpro.codec import dumps_bytes, loads
+from cpro.models.rest.response import GraphDataResponse
+
+# python -m benchmarks.bench_streaming
+
+CHUNK_SIZE = 64 * 1024
+
+
+def peak_bytes(fn) -> int:
+    """
+    :return: The most memory allocated at once while running `fn`
+    """
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    for copies in (1, 10, 50):
+        chunks = [dumps_bytes(KLINES * copies)]
+        chunks = [chunks[0][i:i + CHUNK_SIZE] for i in range(0, len(chunks[0]), CHUNK_SIZE)]
+        size = sum(map(len, chunks))
+
+        def whole():
+            # the body is read whole, parsed whole, then decoded whole
+            GraphDataResponse.from_dict(loads(b"".join(chunks)))
+
+        def streamed():
+            splitter, decode = JSONArraySplitter(), element_decoder(GraphDataResponse)
+            for chunk in chunks:
+                for element in splitter.feed(chunk):
+                    decode(loads(element))
+
+        name = f"{1000 * copies} klines, {size / 1e6:.1f}MB"
+        whole_peak, streamed_peak = peak_bytes(whole), peak_bytes(streamed)
+        print(f"{name:<32} whole {whole_peak / 1e6:>8.1f}MB peak, streamed {streamed_peak / 1e6:>6.1f}MB peak")
+
+
+if __name__ == "__main__":
+    main()
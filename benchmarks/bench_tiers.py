@@ -0,0 +1,67 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import sys
+import tempfile
+
+from benchmarks.utils import bench, TRADE, AGGREGATE_TRADE, DIFF_DEPTH
+from cpro.client.recorder import FrameRecorder, FrameReplayer, FrameSource
+from cpro.models.options import ModelTier, DecodeOptions, TimestampMode, NumericMode
+
+# python -m benchmarks.bench_tiers [recording directory]
+# decodes a recorded corpus with both model tiers, a synthetic one is recorded when no directory is given
+
+SYNTHETIC_FRAMES = 3000
+
+
+def record_synthetic(directory: str) -> None:
+    samples = [json.dumps(sample) for sample in (TRADE, AGGREGATE_TRADE, DIFF_DEPTH)]
+    with FrameRecorder(directory, FrameSource.WEBSOCKET_STREAM) as recorder:
+        for i in range(SYNTHETIC_FRAMES):
+            recorder.record(samples[i % len(samples)], 1_000_000_000 + i * 1_000_000)
+
+
+def run(directory: str) -> None:
+    frames = [frame for _, frame in FrameReplayer(directory).frames()]
+    print(f"-- {len(frames)} frames from {directory}")
+    for label, replayer in (
+            ("dataclass", FrameReplayer(directory)),
+            ("dataclass, epoch millis, float", FrameReplayer(directory, decode_options=DecodeOptions(
+                timestamp_mode=TimestampMode.EPOCH_MILLIS, numeric_mode=NumericMode.FLOAT
+            ))),
+            ("struct", FrameReplayer(directory, model_tier=ModelTier.STRUCT)),
+    ):
+        decode = replayer.decode
+        ops = bench(f"{label} corpus", lambda: [decode(frame) for frame in frames], number=1)
+        print(f"{'':<48} {ops * len(frames):>14,.0f} frames/s")
+
+
+def main():
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        record_synthetic(directory)
+        run(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+
+from benchmarks.utils import bench, TRADE
+from cpro.models.options import DecodeOptions, TimestampMode, decode_options
+from cpro.models.ws_stream import TradeData, unmarshal_frame
+
+# python -m benchmarks.bench_timestamps
+
+TRADE_FRAME = json.dumps(TRADE)
+
+
+def main():
+    for mode in TimestampMode:
+        with decode_options(DecodeOptions(timestamp_mode=mode)):
+            bench(f"TradeData.from_dict ({mode.name})", lambda: TradeData.from_dict(TRADE))
+            bench(f"unmarshal_frame trade ({mode.name})", lambda: unmarshal_frame(TRADE_FRAME))
+
+
+if __name__ == "__main__":
+    main()
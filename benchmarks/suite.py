@@ -0,0 +1,322 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import typing
+import warnings
+from datetime import datetime
+from decimal import Decimal
+
+from aiohttp import web
+
+from benchmarks.utils import measure
+from cpro.client.rest import APICredentials, AsyncIOHTTPClient, BlockingHTTPClient, HTTPClient
+from cpro.codec import dumps, get_codec
+from cpro.models.rest import response
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import OrderSides, OrderTypes, TimeInForce, ChartIntervals, OrderResponseTypes
+from cpro.models.rest.filter import create_filter
+from cpro.models.rest.request import NewOrderRequest, QuerySingleOrderRequest, CancelSingleOrderRequest, \
+    GraphDataRequest, OrderBookRequest, AccountTradesRequest, ExchangeInformationTickerRequest, RequestPayload
+from cpro.models.ud_stream import unmarshal_stream_data
+from cpro.models.ws_stream import unmarshal_frame
+
+# python -m benchmarks.suite [--only decode/] [--compare <baseline.json or commit>]
+#
+# Runs every benchmark offline, against the payloads of `benchmarks/fixtures` and a local stub of the API, and saves
+# the results to `benchmarks/results/<commit>.json` to compare later commits against.
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+RESULTS = os.path.join(os.path.dirname(__file__), "results")
+CREDENTIALS = APICredentials(
+    "tAQfOrPIZAhym0qHISRt8EFvxPemdBm5j5WMlkm3Ke9aFp0EGWC2CGM8GHV4kCYW",
+    "lH3ELTNiFxCQTmi9pPcWWikhsjO04Yoqw3euoHUuOLC3GYBW64ZqzQsiOEHXQS76"
+)
+TIMESTAMP = datetime(2024, 3, 1, 12, 0, 0)
+# requests sent by each client in the transport benchmarks, and how many of them at once by the async one
+TRANSPORT_REQUESTS = 500
+TRANSPORT_CONCURRENCY = 32
+
+Benchmarks = typing.Dict[str, typing.Callable[[], typing.Any]]
+
+
+def load_fixture(name: str) -> typing.Any:
+    with open(os.path.join(FIXTURES, f"{name}.json")) as file:
+        return json.load(file)
+
+
+def _requests() -> typing.Dict[str, RequestPayload]:
+    return {
+        "NewOrderRequest": NewOrderRequest(
+            "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT, timestamp=TIMESTAMP, timeInForce=TimeInForce.GOOD_TIL_CANCELLED,
+            quantity=Decimal("0.0125"), price=Decimal("3521000.50"), newClientOrderId="quote-1",
+            newOrderRespType=OrderResponseTypes.ACK
+        ),
+        "QuerySingleOrderRequest": QuerySingleOrderRequest(orderId=1234567890, timestamp=TIMESTAMP),
+        "CancelSingleOrderRequest": CancelSingleOrderRequest(origClientOrderId="quote-1", timestamp=TIMESTAMP),
+        "AccountTradesRequest": AccountTradesRequest("BTCPHP", limit=1000, timestamp=TIMESTAMP),
+        "GraphDataRequest": GraphDataRequest("BTCPHP", ChartIntervals._1m, limit=1000),
+        "OrderBookRequest": OrderBookRequest("BTCPHP", 200),
+        "ExchangeInformationTickerRequest": ExchangeInformationTickerRequest(symbols=["BTCPHP", "ETHPHP", "USDTPHP"]),
+    }
+
+
+def encode_benchmarks() -> Benchmarks:
+    return {f"encode/{name}": request.to_encoded for name, request in _requests().items()}
+
+
+def sign_benchmarks() -> Benchmarks:
+    benchmarks = {}
+    for name in ("NewOrderRequest", "QuerySingleOrderRequest", "AccountTradesRequest"):
+        encoded = _requests()[name].to_encoded()
+        benchmarks[f"sign/{name}"] = lambda encoded=encoded: encoded.sign(CREDENTIALS.api_key, CREDENTIALS.api_secret)
+    return benchmarks
+
+
+def decode_benchmarks() -> Benchmarks:
+    return {
+        f"decode/{name}": lambda cls=getattr(response, name), data=data: cls.from_dict(data)
+        for name, data in load_fixture("rest_responses").items()
+    }
+
+
+def stream_benchmarks() -> Benchmarks:
+    frames = load_fixture("stream_frames")
+    benchmarks = {
+        f"unmarshal_frame/{event}": lambda text=dumps(data): unmarshal_frame(text)
+        for event, data in frames["stream"].items()
+    }
+    benchmarks.update({
+        f"unmarshal_stream_data/{event}": lambda data=data: unmarshal_stream_data(data)
+        for event, data in frames["user_stream"].items()
+    })
+    return benchmarks
+
+
+def filter_benchmarks() -> Benchmarks:
+    return {
+        f"create_filter/{data['filterType']}": lambda data=data: create_filter(data) for data in load_fixture("filters")
+    }
+
+
+def _stub_app() -> web.Application:
+    # answers as the API would, with the recorded payloads
+    responses = load_fixture("rest_responses")
+    depth = dumps(responses["OrderBookResponse"])
+    order = dumps(responses["NewOrderACKResponse"])
+
+    async def order_book(_: web.Request) -> web.Response:
+        return web.Response(text=depth, content_type="application/json")
+
+    async def new_order(_: web.Request) -> web.Response:
+        return web.Response(text=order, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get(APIEndpoints.GET_ORDER_BOOK.value.endpoint, order_book)
+    app.router.add_post(APIEndpoints.NEW_ORDER.value.endpoint, new_order)
+    return app
+
+
+class StubServer:
+    """
+    Serves `_stub_app` from an event loop of its own thread, so blocking clients can be benchmarked against it too.
+    """
+
+    def __init__(self):
+        self.base_url = None
+        self._loop = asyncio.new_event_loop()
+        self._runner: typing.Optional[web.AppRunner] = None
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    async def _start(self) -> str:
+        self._runner = web.AppRunner(_stub_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "localhost", 0)
+        await site.start()
+        return f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        self.base_url = asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def _transport_requests() -> typing.Dict[str, typing.Tuple[APIEndpoints, typing.Callable[[], RequestPayload]]]:
+    return {
+        "GET_ORDER_BOOK": (APIEndpoints.GET_ORDER_BOOK, lambda: OrderBookRequest("BTCPHP")),
+        "NEW_ORDER": (APIEndpoints.NEW_ORDER, lambda: _requests()["NewOrderRequest"]),
+    }
+
+
+def _client(cls: typing.Type[HTTPClient], base_url: str) -> HTTPClient:
+    client = cls(CREDENTIALS)
+    client.API_BASE_URL = base_url
+    return client
+
+
+def transport_results(base_url: str, repeat: int) -> typing.Dict[str, float]:
+    """
+    :return: The best time per request of each client (the async one sending several at once), in seconds
+    """
+    results = {}
+    for name, (endpoint, payload) in _transport_requests().items():
+        client = _client(BlockingHTTPClient, base_url)
+        results[f"transport/blocking/{name}"] = measure(
+            lambda: endpoint.execute(client, payload()), number=TRANSPORT_REQUESTS // 5, repeat=repeat
+        )
+
+        async def run() -> float:
+            async with _client(AsyncIOHTTPClient, base_url) as async_client:
+                semaphore = asyncio.Semaphore(TRANSPORT_CONCURRENCY)
+
+                async def send():
+                    async with semaphore:
+                        await endpoint.execute_async(async_client, payload())
+
+                await asyncio.gather(*(send() for _ in range(TRANSPORT_CONCURRENCY)))  # warms the pool up
+                best = float("inf")
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    await asyncio.gather(*(send() for _ in range(TRANSPORT_REQUESTS)))
+                    best = min(best, (time.perf_counter() - started) / TRANSPORT_REQUESTS)
+                return best
+
+        results[f"transport/async/{name}"] = asyncio.run(run())
+    return results
+
+
+def _commit() -> typing.Tuple[typing.Optional[str], bool]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def run(only: typing.Optional[str] = None, repeat: int = 3) -> dict:
+    """
+    :param only: Only run the benchmarks whose name starts with `only`
+    :return: The results, as saved
+    """
+    benchmarks: Benchmarks = {
+        **encode_benchmarks(), **sign_benchmarks(), **decode_benchmarks(), **stream_benchmarks(), **filter_benchmarks()
+    }
+    timings = {}
+    for name, fn in benchmarks.items():
+        if only is None or name.startswith(only):
+            timings[name] = measure(fn, repeat=repeat)
+            _print(name, timings[name])
+    if only is None or "transport/".startswith(only) or only.startswith("transport/"):
+        with StubServer() as server:
+            for name, timing in transport_results(server.base_url, repeat).items():
+                if only is None or name.startswith(only):
+                    timings[name] = timing
+                    _print(name, timing)
+
+    commit, dirty = _commit()
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "codec": get_codec().name,
+        "results": {name: {"ops_per_sec": 1 / timing, "us_per_op": timing * 1e6} for name, timing in timings.items()},
+    }
+
+
+def _print(name: str, timing: float) -> None:
+    print(f"{name:<64} {1 / timing:>14,.0f} ops/s {timing * 1e6:>10.2f} us/op")
+
+
+def compare(baseline: dict, results: dict, threshold: float = 0.1) -> typing.List[str]:
+    """
+    Prints the change of each benchmark present in both runs.
+
+    :param threshold: The fraction of the baseline throughput a benchmark may lose before it counts as a regression
+    :return: The names of the benchmarks which regressed
+    """
+    regressions = []
+    print(f"\ncompared to {baseline.get('commit') or 'baseline'} ({baseline.get('date')}):")
+    for name, result in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        regressed = change < -threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<64} {change:>+9.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def _baseline_path(baseline: str) -> str:
+    # either a file, or the commit of a previous run
+    return baseline if os.path.exists(baseline) else os.path.join(RESULTS, f"{baseline}.json")
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks of cpro.py")
+    parser.add_argument("--only", help="only run the benchmarks whose name starts with this, e.g. decode/")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="where to save the results, benchmarks/results/<commit>.json by default")
+    parser.add_argument("--compare", help="results to compare against, a file or the commit of a saved run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="throughput lost counted as a regression")
+    args = parser.parse_args(argv)
+    # the `params: None` of `StatusedAPIResponse` warns on every decode
+    warnings.filterwarnings("ignore", category=RuntimeWarning, module="dataclasses_json")
+
+    results = run(args.only, args.repeat)
+    output = args.output or os.path.join(
+        RESULTS, f"{results['commit'] or 'local'}{'-dirty' if results['dirty'] else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nsaved to {output}")
+
+    if args.compare:
+        with open(_baseline_path(args.compare)) as file:
+            if compare(json.load(file), results, args.threshold):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import timeit
+import typing
+
+TRADE = {
+    "e": "trade", "E": 1672515782136, "s": "BNBBTC", "t": 12345, "p": "0.001", "q": "100",
+    "b": 88, "a": 50, "T": 1672515782136, "m": True, "M": True
+}
+AGGREGATE_TRADE = {
+    "e": "aggTrade", "E": 1672515782136, "s": "BNBBTC", "a": 12345, "p": "0.001", "q": "100",
+    "f": 100, "l": 105, "T": 1672515782136, "m": True, "M": True
+}
+BOOK_TICKER = {"u": 400900217, "s": "BNBUSDT", "b": "25.35190000", "B": "31.21000000", "a": "25.36520000", "A": "40.66000000"}
+ORDER_UPDATE = {
+    "e": "executionReport", "E": 1499405658658, "s": "ETHBTC", "c": "mUvoqJxFIILMdfAW5iGSOW", "S": "BUY",
+    "o": "LIMIT", "f": "GTC", "q": "1.00000000", "p": "0.10264410", "P": "0.00000000", "x": "NEW", "X": "NEW",
+    "r": "NONE", "i": 4293153, "l": "0.00000000", "z": "0.00000000", "L": "0.00000000", "n": "0", "N": None,
+    "T": 1499405658657, "t": -1, "w": True, "m": False, "O": 1499405658657, "Z": "0.00000000", "Y": "0.00000000",
+    "Q": "0.00000000"
+}
+ACCOUNT_UPDATE = {
+    "e": "outboundAccountPosition", "E": 1564034571105, "u": 1564034571073,
+    "B": [{"a": "ETH", "f": "10000.000000", "l": "0.000000"}, {"a": "PHP", "f": "2500.50", "l": "100.00"}]
+}
+BALANCE_UPDATE = {"e": "balanceUpdate", "E": 1573200697110, "a": "BTC", "d": "100.00000000", "T": 1573200697068}
+DIFF_DEPTH = {
+    "e": "depthUpdate", "E": 1672515782136, "s": "BNBBTC", "U": 157, "u": 160,
+    "b": [["0.0024", "10"], ["0.0023", "7.25"], ["0.0022", "1.5"]],
+    "a": [["0.0026", "100"], ["0.0027", "1.5"], ["0.0028", "3"]]
+}
+
+
+def measure(fn: typing.Callable[[], typing.Any], number: typing.Optional[int] = None, repeat: int = 5) -> float:
+    """
+    Runs `fn` `number` times (auto-ranged to ~0.2s when `None`), `repeat` times over.
+
+    :return: The best time per call, in seconds
+    """
+    timer = timeit.Timer(fn)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def bench(name: str, fn: typing.Callable[[], typing.Any], number: typing.Optional[int] = None, repeat: int = 5) -> float:
+    """
+    Runs `fn` `number` times (auto-ranged to ~0.2s when `None`), `repeat` times over and prints the best run.
+
+    :return: The best throughput, in calls per second
+    """
+    best = measure(fn, number, repeat)
+    print(f"{name:<48} {1 / best:>14,.0f} ops/s {best * 1e6:>10.2f} us/op")
+    return 1 / best
@@ -0,0 +1,440 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import aiohttp
+from websockets.exceptions import ConnectionClosed
+
+from cpro.client.rest import BlockingHTTPClient, AsyncIOHTTPClient
+from cpro.client.sse import BlockingSSEClient, AsyncSSEClient
+from cpro.models.fields import Number, to_epoch_millis
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import OrderStatus
+from cpro.models.rest.request import AccountInformationRequest, CurrentOpenOrdersRequest
+from cpro.models.rest.response import AccountInformationResponse, CurrentOpenOrdersResponse
+from cpro.models.ud_stream import UserDataStreamEventTypes
+
+_logger = logging.getLogger(__name__)
+
+_OPEN_STATUSES = frozenset((OrderStatus.NEW, OrderStatus.PARTIALLY_FILLED))
+# closed orders remembered so that late events can not bring them back
+_CLOSED_ORDERS_KEPT = 4096
+
+
+@dataclass(frozen=True)
+class Balance:
+    asset: str
+    free: Number
+    locked: Number
+    # epoch milliseconds of the account update this balance is from
+    updateTime: int
+
+
+@dataclass(frozen=True)
+class OpenOrder:
+    symbol: str
+    orderID: int
+    clientOrderID: str
+    side: typing.Any  # `OrderSides`
+    orderType: typing.Any  # `OrderType` from the stream, `OrderTypes` from a snapshot
+    timeInForce: typing.Any  # `TimeInForce`
+    price: Number
+    quantity: Number
+    executedQuantity: Number
+    status: OrderStatus
+    # epoch milliseconds of the event (or snapshot) this order is from
+    updateTime: int
+
+
+class AccountState:
+    """
+    Balances and open orders of an account, seeded from REST snapshots and kept current by the user data stream
+    events passed to `apply`. Events (and snapshots) older than what is already known are ignored, so snapshots can be
+    taken while the stream is running.
+
+    Works with the events of both model tiers and with any `DecodeOptions`, as long as the REST client decodes amounts
+    the same way as the stream client.
+    """
+
+    def __init__(self):
+        self.balances: typing.Dict[str, Balance] = {}
+        self.orders: typing.Dict[int, OpenOrder] = {}
+        self._orders_by_client_id: typing.Dict[str, int] = {}
+        self._orders_by_symbol: typing.Dict[str, typing.Dict[int, OpenOrder]] = {}
+        self._closed_orders: typing.OrderedDict[int, int] = OrderedDict()
+        # epoch milliseconds of the last applied event
+        self.last_event_time = 0
+
+    def balance(self, asset: str) -> typing.Optional[Balance]:
+        return self.balances.get(asset)
+
+    def free(self, asset: str) -> typing.Optional[Number]:
+        balance = self.balances.get(asset)
+        return balance.free if balance else None
+
+    def order(self, order_id: int) -> typing.Optional[OpenOrder]:
+        return self.orders.get(order_id)
+
+    def order_by_client_id(self, client_order_id: str) -> typing.Optional[OpenOrder]:
+        order_id = self._orders_by_client_id.get(client_order_id)
+        return None if order_id is None else self.orders.get(order_id)
+
+    def open_orders(self, symbol: str) -> typing.List[OpenOrder]:
+        return list(self._orders_by_symbol.get(symbol, {}).values())
+
+    def _put_order(self, order: OpenOrder) -> None:
+        self.orders[order.orderID] = order
+        self._orders_by_client_id[order.clientOrderID] = order.orderID
+        self._orders_by_symbol.setdefault(order.symbol, {})[order.orderID] = order
+
+    def _close_order(self, order_id: int, closed_at: int) -> None:
+        self._closed_orders[order_id] = closed_at
+        if len(self._closed_orders) > _CLOSED_ORDERS_KEPT:
+            self._closed_orders.popitem(last=False)
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return
+        if self._orders_by_client_id.get(order.clientOrderID) == order_id:
+            del self._orders_by_client_id[order.clientOrderID]
+        symbol_orders = self._orders_by_symbol[order.symbol]
+        del symbol_orders[order_id]
+        if not symbol_orders:
+            del self._orders_by_symbol[order.symbol]
+
+    def _is_stale_order(self, order_id: int, update_time: int) -> bool:
+        current = self.orders.get(order_id)
+        if current is not None and current.updateTime > update_time:
+            return True
+        closed_at = self._closed_orders.get(order_id)
+        return closed_at is not None and closed_at >= update_time
+
+    def apply(self, event) -> bool:
+        """
+        :param event: An `AccountUpdateData`, `BalanceUpdateData` or `OrderUpdateData` of either model tier
+        :return: Whether the event changed the state, `False` for stale or unrelated events
+        """
+        event_type = UserDataStreamEventTypes(event.eventType)
+        event_time = to_epoch_millis(event.eventTime)
+        self.last_event_time = max(self.last_event_time, event_time)
+
+        if event_type == UserDataStreamEventTypes.ACCOUNT_UPDATE:
+            # absolute balances of every asset changed by the update
+            update_time = to_epoch_millis(event.lastAccountUpdatetime)
+            applied = False
+            for update in event.balanceUpdates:
+                current = self.balances.get(update.asset)
+                if current is not None and current.updateTime > update_time:
+                    continue
+                self.balances[update.asset] = Balance(update.asset, update.free, update.locked, update_time)
+                applied = True
+            return applied
+
+        if event_type == UserDataStreamEventTypes.BALANCE_UPDATE:
+            # deposits and withdrawals, already included in any balance set at or after their clear time
+            clear_time = to_epoch_millis(event.clearTime)
+            current = self.balances.get(event.asset)
+            if current is None or current.updateTime >= clear_time:
+                return False
+            self.balances[event.asset] = Balance(event.asset, current.free + event.delta, current.locked, clear_time)
+            return True
+
+        if event_type == UserDataStreamEventTypes.ORDER_UPDATE:
+            if self._is_stale_order(event.orderID, event_time):
+                return False
+            status = OrderStatus(event.currentOrderStatus)
+            if status not in _OPEN_STATUSES:
+                self._close_order(event.orderID, event_time)
+                return True
+            self._put_order(OpenOrder(
+                symbol=event.symbol,
+                orderID=event.orderID,
+                clientOrderID=event.clientOrderID,
+                side=event.side,
+                orderType=event.orderType,
+                timeInForce=event.timeInForce,
+                price=event.orderPrice,
+                quantity=event.orderQuantity,
+                executedQuantity=event.cumulativeFilledQuantity,
+                status=status,
+                updateTime=event_time
+            ))
+            return True
+
+        return False
+
+    def reconcile_balances(self, account: AccountInformationResponse) -> None:
+        """
+        Replaces every balance not updated since the snapshot, assets missing from the snapshot are dropped.
+        """
+        update_time = to_epoch_millis(account.updateTime)
+        snapshot = {balance.asset: balance for balance in account.balances}
+        for asset, current in list(self.balances.items()):
+            if asset not in snapshot and current.updateTime <= update_time:
+                del self.balances[asset]
+        for asset, balance in snapshot.items():
+            current = self.balances.get(asset)
+            if current is None or current.updateTime <= update_time:
+                self.balances[asset] = Balance(asset, balance.free, balance.locked, update_time)
+
+    def reconcile_orders(self, symbol: str, open_orders: CurrentOpenOrdersResponse, requested_at: int) -> None:
+        """
+        :param requested_at: Epoch milliseconds at which the snapshot was requested, orders known before then but
+        missing from the snapshot have been closed
+        """
+        snapshot = {order.orderId: order for order in open_orders.orders}
+        for order_id, current in list(self._orders_by_symbol.get(symbol, {}).items()):
+            if order_id not in snapshot and current.updateTime < requested_at:
+                self._close_order(order_id, requested_at)
+        for order_id, order in snapshot.items():
+            update_time = to_epoch_millis(order.updateTime)
+            if self._is_stale_order(order_id, update_time):
+                continue
+            self._put_order(OpenOrder(
+                symbol=order.symbol,
+                orderID=order_id,
+                clientOrderID=order.clientOrderId,
+                side=order.side,
+                orderType=order.type,
+                timeInForce=order.timeInForce,
+                price=order.price,
+                quantity=order.origQty,
+                executedQuantity=order.executedQty,
+                status=order.status,
+                updateTime=update_time
+            ))
+
+
+def _now_millis() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class AccountStateEngine:
+    """
+    Keeps an `AccountState` current from the user data stream, reconciling it against REST snapshots when the stream
+    (re)connects and every `reconcile_interval` seconds. Reads go straight to `state` and never hit the network.
+
+    Open orders are only snapshotted for `symbols`, as the exchange requires a symbol to list them.
+    """
+
+    def __init__(
+            self,
+            symbols: typing.Iterable[str],
+            *,
+            reconcile_interval: float = 5 * 60,
+            reconnect_delay: float = 5
+    ):
+        self.symbols = list(symbols)
+        self.reconcile_interval = reconcile_interval
+        self.reconnect_delay = reconnect_delay
+        self.state = AccountState()
+        self.last_reconcile = 0.0
+        self.reconnects = 0
+
+    def _reconcile_due(self) -> bool:
+        return time.monotonic() - self.last_reconcile >= self.reconcile_interval
+
+
+class BlockingAccountStateEngine(AccountStateEngine):
+    def __init__(
+            self,
+            http_client: BlockingHTTPClient,
+            sse_client: BlockingSSEClient,
+            symbols: typing.Iterable[str],
+            **kwargs
+    ):
+        super().__init__(symbols, **kwargs)
+        self.http_client = http_client
+        self.sse_client = sse_client
+        self.ready = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+        self._error: typing.Optional[Exception] = None
+
+    def reconcile(self) -> None:
+        requested_at = _now_millis()
+        self.state.reconcile_balances(
+            APIEndpoints.GET_ACCOUNT_INFORMATION.execute(self.http_client, AccountInformationRequest())
+        )
+        for symbol in self.symbols:
+            self.state.reconcile_orders(symbol, APIEndpoints.CURRENT_OPEN_ORDERS.execute(
+                self.http_client, CurrentOpenOrdersRequest(symbol)
+            ), requested_at)
+        self.last_reconcile = time.monotonic()
+        self.ready.set()
+
+    def run(self) -> None:
+        """
+        Follows the user data stream until `stop` is called, reconnecting (and reconciling) whenever it drops. The
+        periodic reconciliation happens between events, failures after the first snapshot are logged rather than
+        raised.
+        """
+        while not self._stopped.is_set():
+            try:
+                with self.sse_client as client:
+                    self.reconcile()
+                    for event in client:
+                        self.state.apply(event)
+                        if self._stopped.is_set():
+                            return
+                        if self._reconcile_due():
+                            self._reconcile_periodically()
+            except (ConnectionClosed, OSError):
+                pass
+            except Exception as e:
+                if not self.ready.is_set():
+                    raise  # no snapshot was ever taken, `start` raises it
+                _logger.warning("Following the account state failed, reconnecting in %ss", self.reconnect_delay,
+                                exc_info=e)
+            self.reconnects += 1
+            self._stopped.wait(self.reconnect_delay)
+
+    def _reconcile_periodically(self) -> None:
+        try:
+            self.reconcile()
+        except Exception as e:
+            # retried on the next interval, or when the stream reconnects
+            self.last_reconcile = time.monotonic()
+            _logger.warning("Reconciling the account state failed", exc_info=e)
+
+    def _run_thread(self) -> None:
+        try:
+            self.run()
+        except Exception as e:
+            self._error = e
+            self.ready.set()
+
+    def start(self) -> "BlockingAccountStateEngine":
+        """
+        Runs the engine in a daemon thread, waiting for the first snapshot before returning.
+        """
+        self._thread = threading.Thread(target=self._run_thread, daemon=True)
+        self._thread.start()
+        self.ready.wait()
+        if self._error:
+            raise self._error
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+class AsyncAccountStateEngine(AccountStateEngine):
+    def __init__(
+            self,
+            http_client: AsyncIOHTTPClient,
+            sse_client: AsyncSSEClient,
+            symbols: typing.Iterable[str],
+            **kwargs
+    ):
+        super().__init__(symbols, **kwargs)
+        self.http_client = http_client
+        self.sse_client = sse_client
+        self.ready = asyncio.Event()
+        self._task: typing.Optional[asyncio.Task] = None
+        self._error: typing.Optional[Exception] = None
+
+    async def reconcile(self) -> None:
+        requested_at = _now_millis()
+        account, *open_orders = await asyncio.gather(
+            APIEndpoints.GET_ACCOUNT_INFORMATION.execute_async(self.http_client, AccountInformationRequest()),
+            *(APIEndpoints.CURRENT_OPEN_ORDERS.execute_async(
+                self.http_client, CurrentOpenOrdersRequest(symbol)
+            ) for symbol in self.symbols)
+        )
+        self.state.reconcile_balances(account)
+        for symbol, orders in zip(self.symbols, open_orders):
+            self.state.reconcile_orders(symbol, orders, requested_at)
+        self.last_reconcile = time.monotonic()
+        self.ready.set()
+
+    async def _reconcile_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                # retried on the next interval, or when the stream reconnects
+                _logger.warning("Reconciling the account state failed", exc_info=e)
+
+    async def run(self) -> None:
+        """
+        Follows the user data stream until cancelled, reconnecting (and reconciling) whenever it drops.
+        """
+        while True:
+            try:
+                async with self.sse_client as client:
+                    # the snapshot is taken while the stream connects, events already applied are kept
+                    reconciler = asyncio.create_task(self._reconcile_on_connect())
+                    try:
+                        async for event in client:
+                            self.state.apply(event)
+                    finally:
+                        reconciler.cancel()
+            except (ConnectionClosed, OSError, aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            self.reconnects += 1
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _reconcile_on_connect(self) -> None:
+        while True:
+            try:
+                await self.reconcile()
+                break
+            except Exception as e:
+                transient = isinstance(e, (OSError, aiohttp.ClientError, asyncio.TimeoutError))
+                if not transient and not self.ready.is_set():
+                    # no snapshot was ever taken, `start` raises it as the blocking engine does
+                    self._error = e
+                    self.ready.set()
+                    return
+                _logger.warning("Reconciling the account state failed, retrying in %ss", self.reconnect_delay,
+                                exc_info=e)
+                await asyncio.sleep(self.reconnect_delay)
+        await self._reconcile_periodically()
+
+    async def start(self) -> "AsyncAccountStateEngine":
+        """
+        Runs the engine in a background task, waiting for the first snapshot before returning.
+        """
+        self._task = asyncio.create_task(self.run())
+        ready = asyncio.create_task(self.ready.wait())
+        await asyncio.wait((self._task, ready), return_when=asyncio.FIRST_COMPLETED)
+        if self._task.done():
+            ready.cancel()
+            self._task.result()  # raises what stopped the engine
+        if self._error:
+            await self.stop()
+            raise self._error
+        return self
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,233 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import collections
+import threading
+import time
+import typing
+from enum import Enum, auto
+
+from cpro.client.rest import APIEndpoint
+from cpro.client.retry import is_transient
+from cpro.exception import CProException
+from cpro.models.rest.enums import SecurityType
+
+T = typing.TypeVar("T")
+
+
+class EndpointGroup(Enum):
+    MARKET_DATA = auto()
+    TRADING = auto()
+    WALLET = auto()
+    FIAT = auto()
+    CONVERT = auto()
+
+
+_GROUP_PREFIXES = (
+    ("/openapi/convert/", EndpointGroup.CONVERT),
+    ("/openapi/fiat/", EndpointGroup.FIAT),
+    ("/openapi/wallet/", EndpointGroup.WALLET),
+    ("/openapi/v1/capital/", EndpointGroup.WALLET),
+    ("/openapi/v3/payment-request/", EndpointGroup.WALLET),
+    ("/merchant-api/", EndpointGroup.WALLET),
+)
+
+
+def endpoint_group(endpoint: APIEndpoint) -> EndpointGroup:
+    for prefix, group in _GROUP_PREFIXES:
+        if endpoint.endpoint.startswith(prefix):
+            return group
+    if endpoint.security == SecurityType.NONE:
+        return EndpointGroup.MARKET_DATA
+    # orders, account information, trade fees and listen keys
+    return EndpointGroup.TRADING
+
+
+class BreakerState(Enum):
+    CLOSED = auto()
+    OPEN = auto()
+    HALF_OPEN = auto()
+
+
+class CircuitOpenException(CProException):
+    def __init__(self, group: EndpointGroup, retry_after: float):
+        self.group = group
+        self.retry_after = retry_after
+        super().__init__(f"Circuit of {group.name} endpoints is open, retry in {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Trips open once at least `failure_ratio` of the last `window` calls (and no fewer than `min_calls`) failed with a
+    transient error or took longer than `slow_call_duration` seconds. While open calls fail fast with
+    `CircuitOpenException`, after `open_duration` seconds `probes` calls are let through (half-open) and close the
+    circuit again if they all succeed.
+    """
+
+    def __init__(
+            self,
+            group: EndpointGroup,
+            *,
+            window: int = 20,
+            min_calls: int = 10,
+            failure_ratio: float = 0.5,
+            slow_call_duration: typing.Optional[float] = None,
+            open_duration: float = 10,
+            probes: int = 1,
+            on_state_change: typing.Optional[typing.Callable[[EndpointGroup, BreakerState, BreakerState], None]] = None
+    ):
+        self.group = group
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_duration = slow_call_duration
+        self.open_duration = open_duration
+        self.probes = probes
+        self.on_state_change = on_state_change
+        self.state = BreakerState.CLOSED
+        self.opened_at = 0.0
+        self.rejected = 0
+        # whether each of the last `window` calls failed
+        self._outcomes: typing.Deque[bool] = collections.deque(maxlen=window)
+        self._failures = 0
+        self._probes_started = 0
+        self._probes_passed = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, state: BreakerState) -> None:
+        previous, self.state = self.state, state
+        self._outcomes.clear()
+        self._failures = self._probes_started = self._probes_passed = 0
+        if state == BreakerState.OPEN:
+            self.opened_at = time.monotonic()
+        if self.on_state_change is not None:
+            self.on_state_change(self.group, previous, state)
+
+    def acquire(self) -> bool:
+        """
+        :return: Whether the call is a half-open probe
+        :raises CircuitOpenException: When the call should not be made
+        """
+        with self._lock:
+            if self.state == BreakerState.OPEN:
+                retry_after = self.opened_at + self.open_duration - time.monotonic()
+                if retry_after > 0:
+                    self.rejected += 1
+                    raise CircuitOpenException(self.group, retry_after)
+                self._transition(BreakerState.HALF_OPEN)
+            if self.state == BreakerState.HALF_OPEN:
+                if self._probes_started >= self.probes:
+                    self.rejected += 1
+                    raise CircuitOpenException(self.group, 0)
+                self._probes_started += 1
+                return True
+            return False
+
+    def release(self, probe: bool) -> None:
+        """
+        Ends a call without an outcome (cancelled), giving its probe back if it was one.
+        """
+        with self._lock:
+            if probe and self.state == BreakerState.HALF_OPEN and self._probes_started > 0:
+                self._probes_started -= 1
+
+    def record(self, failed: bool) -> None:
+        with self._lock:
+            if self.state == BreakerState.HALF_OPEN:
+                if failed:
+                    self._transition(BreakerState.OPEN)
+                else:
+                    self._probes_passed += 1
+                    if self._probes_passed >= self.probes:
+                        self._transition(BreakerState.CLOSED)
+                return
+            if self.state == BreakerState.OPEN:
+                return  # a call started before the circuit opened
+            if len(self._outcomes) == self._outcomes.maxlen:
+                self._failures -= self._outcomes[0]
+            self._outcomes.append(failed)
+            self._failures += failed
+            if len(self._outcomes) >= self.min_calls and self._failures >= self.failure_ratio * len(self._outcomes):
+                self._transition(BreakerState.OPEN)
+
+    def _failed(self, started: float, error: typing.Optional[BaseException] = None) -> bool:
+        if error is not None:
+            return is_transient(error)
+        return self.slow_call_duration is not None and time.monotonic() - started > self.slow_call_duration
+
+    def call(self, fn: typing.Callable[..., T], *args) -> T:
+        self.acquire()
+        started = time.monotonic()
+        try:
+            result = fn(*args)
+        except Exception as e:
+            self.record(self._failed(started, e))
+            raise
+        self.record(self._failed(started))
+        return result
+
+    async def call_async(self, fn: typing.Callable[..., typing.Awaitable[T]], *args) -> T:
+        probe = self.acquire()
+        started = time.monotonic()
+        try:
+            result = await fn(*args)
+        except Exception as e:
+            self.record(self._failed(started, e))
+            raise
+        except BaseException:
+            # a cancelled call says nothing about the exchange, but must give its probe back
+            self.release(probe)
+            raise
+        self.record(self._failed(started))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state.name,
+            "calls": len(self._outcomes),
+            "failures": self._failures,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakers:
+    """
+    A `CircuitBreaker` per `EndpointGroup`, so an outage of one (say market data) does not stop calls to the others.
+
+    EX: `AsyncIOHTTPClient(credentials, breakers=CircuitBreakers(slow_call_duration=2))`
+    """
+
+    def __init__(self, **options):
+        """
+        :param options: The options of every `CircuitBreaker`
+        """
+        self.breakers = {group: CircuitBreaker(group, **options) for group in EndpointGroup}
+        self._by_endpoint: typing.Dict[APIEndpoint, CircuitBreaker] = dict()
+
+    def __getitem__(self, group: EndpointGroup) -> CircuitBreaker:
+        return self.breakers[group]
+
+    def for_endpoint(self, endpoint: APIEndpoint) -> CircuitBreaker:
+        breaker = self._by_endpoint.get(endpoint)
+        if breaker is None:
+            breaker = self._by_endpoint[endpoint] = self.breakers[endpoint_group(endpoint)]
+        return breaker
+
+    def snapshot(self) -> dict:
+        return {group.name: breaker.snapshot() for group, breaker in self.breakers.items()}
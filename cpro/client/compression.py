@@ -0,0 +1,119 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import typing
+import zlib
+from http.client import HTTPResponse
+
+try:
+    import brotli  # pip install "cpro.py[brotli]"
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# the encodings responses are asked in, `aiohttp` decodes the same ones (brotli too, when installed)
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+# how much of a compressed body is read off the socket at a time
+CHUNK_SIZE = 64 * 1024
+
+
+class _Decompressor(typing.Protocol):
+    def decompress(self, data: bytes) -> bytes:
+        ...
+
+    def flush(self) -> bytes:
+        ...
+
+
+class _DeflateDecompressor:
+    # servers disagree on whether `deflate` means a zlib stream or a raw one, so tell them apart by its header
+    def __init__(self):
+        self._decompressor: typing.Optional[_Decompressor] = None
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._decompressor is None:
+            if not data:
+                return b""
+            zlib_stream = len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] << 8 | data[1]) % 31 == 0
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS if zlib_stream else -zlib.MAX_WBITS)
+        return self._decompressor.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush() if self._decompressor is not None else b""
+
+
+class _BrotliDecompressor:
+    def __init__(self):
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        if hasattr(self._decompressor, "process"):
+            return self._decompressor.process(data)
+        return self._decompressor.decompress(data)  # brotlicffi
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def decompressor(encoding: typing.Optional[str]) -> typing.Optional[_Decompressor]:
+    """
+    :return: A streaming decompressor for a `Content-Encoding`, `None` when the body is not encoded
+    """
+    encoding = (encoding or "identity").strip().lower()
+    if encoding == "identity":
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecompressor()
+    if encoding == "br" and brotli is not None:
+        return _BrotliDecompressor()
+    raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+def iter_body(response: HTTPResponse, chunk_size: int = CHUNK_SIZE) -> typing.Iterator[bytes]:
+    """
+    Reads the body of `response` a chunk at a time, decompressing each as it arrives.
+    """
+    decoder = decompressor(response.headers.get("Content-Encoding"))
+    while True:
+        # whatever arrived, up to `chunk_size`, rather than waiting for `chunk_size` bytes
+        chunk = response.read1(chunk_size)
+        if not chunk:
+            break
+        if decoder is not None:
+            chunk = decoder.decompress(chunk)
+        if chunk:
+            yield chunk
+    if decoder is not None:
+        tail = decoder.flush()
+        if tail:
+            yield tail
+
+
+def read_body(response: HTTPResponse) -> bytes:
+    """
+    Reads the body of `response`, decompressing it chunk by chunk as it arrives.
+    """
+    if decompressor(response.headers.get("Content-Encoding")) is None:
+        return response.read()
+    return b"".join(iter_body(response))
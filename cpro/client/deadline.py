@@ -0,0 +1,81 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import contextlib
+import time
+import typing
+from contextvars import ContextVar
+from datetime import datetime
+
+from cpro.models.rest.enums import SecurityType
+
+# the longest `recvWindow` the exchange accepts, in milliseconds
+MAX_RECV_WINDOW = 60000
+
+# `time.monotonic()` by which the requests of the current context must be done
+_current_deadline: ContextVar[typing.Optional[float]] = ContextVar("cpro_deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> typing.Iterator[float]:
+    """
+    Bounds every request made within the block (retries included) to `seconds` from now, or less when an outer block
+    ends sooner. Signed requests carry the time left as their `recvWindow`, so the exchange rejects rather than
+    executes them once the caller has given up on them.
+
+    EX: `with deadline(0.5): await APIEndpoints.NEW_ORDER.execute_async(client, order)`
+    """
+    current = _current_deadline.get()
+    at = time.monotonic() + seconds
+    token = _current_deadline.set(at if current is None else min(current, at))
+    try:
+        yield _current_deadline.get()
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining() -> typing.Optional[float]:
+    """
+    :return: The seconds left before the current deadline, `None` outside of any
+    """
+    at = _current_deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def default_timeout(security: SecurityType) -> float:
+    """
+    :return: How long a request to an endpoint of `security` may take when no timeout was configured for it, in seconds
+    """
+    if security == SecurityType.TRADE:
+        return 5  # orders going through late are worse than failing
+    if security == SecurityType.NONE:
+        return 10
+    return 15  # wallet, fiat and convert requests are slower
+
+
+def recv_window(timestamp: datetime) -> typing.Optional[int]:
+    """
+    :return: The `recvWindow` making the exchange drop a request signed at `timestamp` once the current deadline has
+    passed (in milliseconds, at most `MAX_RECV_WINDOW`), `None` outside of any deadline
+    """
+    left = remaining()
+    if left is None:
+        return None
+    return min(MAX_RECV_WINDOW, int((time.time() + left - timestamp.timestamp()) * 1000))
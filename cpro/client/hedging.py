@@ -0,0 +1,153 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import time
+import typing
+
+from cpro.client.metrics import LatencyHistogram
+from cpro.client.ratelimit import AsyncRateLimiter
+from cpro.client.rest import APIEndpoint
+from cpro.client.retry import RetryBudget
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import SecurityType
+from cpro.models.rest.response import TResponsePayload
+
+T = typing.TypeVar("T")
+
+
+def is_hedge_safe(endpoint: APIEndpoint) -> bool:
+    """
+    :return: Whether sending `endpoint` twice has no effect beyond the request count, only unsigned `GET`s qualify
+    """
+    return endpoint.method == "GET" and endpoint.security == SecurityType.NONE
+
+
+class HedgeStats:
+    def __init__(self):
+        self.requests = 0
+        self.hedged = 0
+        # hedges which answered before the request they duplicated
+        self.won = 0
+        # hedges not sent for lack of hedge budget or rate limit
+        self.throttled = 0
+
+    def snapshot(self) -> dict:
+        return dict(vars(self))
+
+
+class HedgePolicy:
+    """
+    Sends a duplicate of a request still unanswered after the `percentile` latency of its endpoint, taking whichever
+    answers first, the other is cancelled. Duplicates are capped to a `ratio` of the requests (see `RetryBudget`) and
+    are only sent when `limiter` has a token to spare right away.
+
+    EX: `AsyncIOHTTPClient(hedging=HedgePolicy(limiter=market_data_limiter))`
+    """
+
+    def __init__(
+            self,
+            endpoints: typing.Iterable[APIEndpoints] = (
+                    APIEndpoints.GET_ORDER_BOOK, APIEndpoints.GET_SYMBOL_ORDER_BOOK_TICKER
+            ),
+            *,
+            percentile: float = 95,
+            min_samples: int = 20,
+            initial_delay: float = 0.1,
+            min_delay: float = 0.005,
+            ratio: float = 0.05,
+            reserve: int = 5,
+            limiter: typing.Optional[AsyncRateLimiter] = None
+    ):
+        """
+        :param initial_delay: The hedging delay until `min_samples` latencies of an endpoint were seen, in seconds
+        """
+        endpoints = [endpoint.value for endpoint in endpoints]
+        unsafe = [endpoint.endpoint for endpoint in endpoints if not is_hedge_safe(endpoint)]
+        if unsafe:
+            raise ValueError(f"Only unsigned GET endpoints can be hedged, not {unsafe}")
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.budget = RetryBudget(ratio, reserve)
+        self.limiter = limiter
+        self.latencies: typing.Dict[APIEndpoint, LatencyHistogram] = {
+            endpoint: LatencyHistogram() for endpoint in endpoints
+        }
+        self.stats: typing.Dict[APIEndpoint, HedgeStats] = {endpoint: HedgeStats() for endpoint in endpoints}
+
+    def applies(self, endpoint: APIEndpoint) -> bool:
+        return endpoint in self.latencies
+
+    def delay(self, endpoint: APIEndpoint) -> float:
+        latencies = self.latencies[endpoint]
+        if latencies.count < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, latencies.percentile(self.percentile) / 1e6)
+
+    def _may_hedge(self, stats: HedgeStats) -> bool:
+        if not self.budget.withdraw():
+            stats.throttled += 1
+            return False
+        if self.limiter is not None and not self.limiter.try_acquire():
+            stats.throttled += 1
+            return False
+        stats.hedged += 1
+        return True
+
+    async def _timed(self, endpoint: APIEndpoint, send: typing.Awaitable[T]) -> T:
+        started = time.perf_counter_ns()
+        try:
+            return await send
+        finally:
+            # cancelled losers are the slow tail, leaving them out would pull the percentile (and delay) down
+            self.latencies[endpoint].record((time.perf_counter_ns() - started) // 1000)
+
+    async def run(
+            self,
+            send: typing.Callable[..., typing.Awaitable[TResponsePayload]],
+            endpoint: APIEndpoint,
+            *args
+    ) -> TResponsePayload:
+        """
+        :param send: Sends the request, called again with the same arguments for the hedge
+        """
+        stats = self.stats[endpoint]
+        stats.requests += 1
+        self.budget.deposit()
+        primary = asyncio.ensure_future(self._timed(endpoint, send(endpoint, *args)))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay(endpoint))
+            if not done and self._may_hedge(stats):
+                pending.add(asyncio.ensure_future(self._timed(endpoint, send(endpoint, *args))))
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        stats.won += task is not primary
+                        return task.result()
+                if not pending:
+                    # both failed, the primary's error says more
+                    return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,222 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+import typing
+
+from cpro.models.fields import to_epoch_millis
+
+_SUB_BUCKET_BITS = 4
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of latencies in microseconds, every bucket is within 12.5% of the values it holds.
+    """
+
+    def __init__(self):
+        self.buckets: typing.Dict[int, int] = dict()
+        self.count = 0
+        self.total = 0
+        self.min: typing.Optional[int] = None
+        self.max: typing.Optional[int] = None
+        # observations that came out below zero, usually a sign of an outdated clock offset
+        self.negative = 0
+
+    @staticmethod
+    def _bucket(value: int) -> int:
+        bits = value.bit_length()
+        if bits <= _SUB_BUCKET_BITS:
+            return value
+        shift = bits - _SUB_BUCKET_BITS
+        return (shift << (_SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @staticmethod
+    def _bucket_upper_bound(bucket: int) -> int:
+        if bucket < 1 << _SUB_BUCKET_BITS:
+            return bucket
+        sub_buckets = 1 << (_SUB_BUCKET_BITS - 1)
+        shift, mantissa = divmod(bucket, sub_buckets)
+        shift -= 1
+        return ((mantissa + sub_buckets + 1) << shift) - 1
+
+    def record(self, microseconds: int) -> None:
+        if microseconds < 0:
+            self.negative += 1
+            microseconds = 0
+        bucket = self._bucket(microseconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += microseconds
+        self.min = microseconds if self.min is None else min(self.min, microseconds)
+        self.max = microseconds if self.max is None else max(self.max, microseconds)
+
+    def percentile(self, percentile: float) -> typing.Optional[int]:
+        """
+        :return: The upper bound (in microseconds) of the bucket holding the given percentile (0-100)
+        """
+        if not self.count:
+            return None
+        rank = percentile / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self._bucket_upper_bound(bucket), self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        """
+        :return: A summary of the histogram, in milliseconds
+        """
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count / 1000,
+            "min": self.min / 1000,
+            "p50": self.percentile(50) / 1000,
+            "p90": self.percentile(90) / 1000,
+            "p99": self.percentile(99) / 1000,
+            "max": self.max / 1000,
+            "negative": self.negative,
+        }
+
+
+class StreamLatency:
+    def __init__(self):
+        # exchange event time (E) -> local receive, corrected for the server clock offset
+        self.network = LatencyHistogram()
+        # exchange trade time (T) -> local receive, for the streams carrying trades
+        self.trade = LatencyHistogram()
+        # local receive -> decoded model
+        self.decode = LatencyHistogram()
+        # decoded model -> consumer done with it (asked for the next one)
+        self.handoff = LatencyHistogram()
+
+    def snapshot(self) -> dict:
+        return {
+            "network": self.network.snapshot(),
+            "trade": self.trade.snapshot(),
+            "decode": self.decode.snapshot(),
+            "handoff": self.handoff.snapshot(),
+        }
+
+
+class LatencyMetrics:
+    """
+    Per-stream exchange-to-client latency, fed by the WebSocket and user data stream clients when passed as their
+    `metrics`.
+
+    The exchange's clock is estimated from ping round trips (see `update_clock_offset`), so that the local clock drifting
+    from the server's does not show up as network latency.
+    """
+
+    def __init__(self):
+        self.streams: typing.Dict[str, StreamLatency] = dict()
+        # server clock - local clock
+        self.clock_offset_ms = 0.0
+        self._best_round_trip_ns: typing.Optional[int] = None
+
+    def update_clock_offset(self, server_time_ms: int, sent_ns: int, received_ns: int) -> None:
+        """
+        Updates the clock offset from a request sent at `sent_ns` and answered at `received_ns` (local `time_ns()`),
+        assuming the server read its clock halfway through the round trip. Round trips slower than the best seen so far
+        get less weight, as they carry more uncertainty.
+        """
+        round_trip_ns = received_ns - sent_ns
+        offset_ms = server_time_ms - (sent_ns + round_trip_ns / 2) / 1e6
+        if self._best_round_trip_ns is None or round_trip_ns <= self._best_round_trip_ns:
+            self._best_round_trip_ns = round_trip_ns
+            self.clock_offset_ms = offset_ms
+        else:
+            self.clock_offset_ms += (offset_ms - self.clock_offset_ms) * self._best_round_trip_ns / round_trip_ns / 4
+
+    def sync_clock(self, client) -> None:
+        """
+        Estimates the clock offset through `GET_SERVER_TIME` using a blocking `HTTPClient`.
+        """
+        from cpro.models.rest.endpoints import APIEndpoints
+
+        sent_ns = time.time_ns()
+        response = APIEndpoints.GET_SERVER_TIME.execute(client)
+        self.update_clock_offset(to_epoch_millis(response.serverTime), sent_ns, time.time_ns())
+
+    @staticmethod
+    def stream_key(frame) -> str:
+        event_type = getattr(frame, "eventType", None)
+        name = event_type.value if event_type is not None else type(frame).__name__
+        symbol = getattr(frame, "symbol", None)
+        return f"{symbol.lower()}@{name}" if symbol else name
+
+    def _stream(self, frame) -> typing.Optional[StreamLatency]:
+        # frames without an event time (RPC responses, pings, raw frames) are not observed
+        if getattr(frame, "eventTime", None) is None:
+            return None
+        key = self.stream_key(frame)
+        stream = self.streams.get(key)
+        if stream is None:
+            stream = self.streams[key] = StreamLatency()
+        return stream
+
+    def observe(self, frame, received_ns: int, decoded_ns: int, delivered_ns: typing.Optional[int] = None) -> None:
+        """
+        Records the latencies of a decoded frame, frames without an event time (RPC responses, pings) are ignored.
+        """
+        stream = self._stream(frame)
+        if stream is None:
+            return
+        event_time = frame.eventTime
+
+        server_received_us = (received_ns / 1e6 + self.clock_offset_ms) * 1000
+        stream.network.record(int(server_received_us - to_epoch_millis(event_time) * 1000))
+        trade_time = getattr(frame, "tradeTime", None)
+        if trade_time is not None:
+            stream.trade.record(int(server_received_us - to_epoch_millis(trade_time) * 1000))
+        stream.decode.record((decoded_ns - received_ns) // 1000)
+        if delivered_ns is not None:
+            stream.handoff.record((delivered_ns - decoded_ns) // 1000)
+
+    def observe_handoff(self, frame, decoded_ns: int, delivered_ns: int) -> None:
+        """
+        Records how long the consumer took with a frame already passed to `observe`, `delivered_ns` being when it asked
+        for the next one.
+        """
+        stream = self._stream(frame)
+        if stream is not None:
+            stream.handoff.record((delivered_ns - decoded_ns) // 1000)
+
+    def snapshot(self) -> dict:
+        return {
+            "clock_offset_ms": self.clock_offset_ms,
+            "streams": {key: stream.snapshot() for key, stream in self.streams.items()},
+        }
+
+    def degraded(self, threshold_ms: float, percentile: float = 99) -> typing.List[str]:
+        """
+        :return: The streams whose network latency at `percentile` is above `threshold_ms`
+        """
+        return [
+            key for key, stream in self.streams.items()
+            if stream.network.count and stream.network.percentile(percentile) / 1000 > threshold_ms
+        ]
+
+    def reset(self) -> None:
+        self.streams.clear()
@@ -0,0 +1,405 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+import typing
+from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from decimal import Decimal
+
+import aiohttp
+
+from cpro.client.rest import BlockingHTTPClient, AsyncIOHTTPClient
+from cpro.client.retry import NO_SUCH_ORDER, TRANSIENT_CODES
+from cpro.exception import CoinsAPIException, HTTPException
+from cpro.models.fields import to_epoch_millis
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import OrderStatus, OrderSides
+from cpro.models.rest.request import NewOrderRequest, CancelSingleOrderRequest, CancelAllOpenOrdersRequest, \
+    QuerySingleOrderRequest
+from cpro.models.rest.response import NewOrderResponse, CancelledOrdersList, CancelOrderResponse, QueryOrderResponse
+
+_OPEN_STATUSES = frozenset((OrderStatus.NEW, OrderStatus.PARTIALLY_FILLED))
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _rejected(error: BaseException) -> bool:
+    """
+    :return: Whether the exchange definitely did not take the order, as opposed to timeouts, resets and server errors
+    after which the order may or may not have been placed
+    """
+    if isinstance(error, CoinsAPIException):
+        return error.code not in TRANSIENT_CODES
+    if isinstance(error, (HTTPException, aiohttp.ClientResponseError)):
+        return 400 <= error.status < 500
+    return False
+
+
+def _base36(value: int) -> str:
+    digits = []
+    while True:
+        value, digit = divmod(value, 36)
+        digits.append(_DIGITS[digit])
+        if not value:
+            return "".join(reversed(digits))
+
+
+class ClientOrderIDGenerator:
+    """
+    Generates `newClientOrderId`s unique across restarts and processes: a prefix, a per generator token (start time
+    and random bits) and a counter, within the 36 characters allowed by the exchange.
+    """
+
+    def __init__(self, prefix: str = "cpro"):
+        token = _base36(time.time_ns() // 1_000_000)[-8:] + _base36(int.from_bytes(os.urandom(4), "big"))[:4]
+        self.prefix = f"{prefix}{token}"
+        if len(self.prefix) > 28:
+            raise ValueError(f"Prefix `{prefix}` leaves no room for the order counter.")
+        self._counter = itertools.count(1)
+
+    def __call__(self) -> str:
+        return f"{self.prefix}{_base36(next(self._counter))}"
+
+
+@dataclass
+class TrackedOrder:
+    clientOrderId: str
+    symbol: str
+    side: OrderSides
+    type: typing.Any  # `OrderTypes` when placed, `OrderType` once updated by the stream
+    quantity: typing.Optional[Decimal] = None
+    price: typing.Optional[Decimal] = None
+    orderId: typing.Optional[int] = None
+    # `None` until the exchange acknowledges the order
+    status: typing.Optional[OrderStatus] = None
+    executedQuantity: typing.Optional[Decimal] = None
+    # epoch milliseconds of the last update applied
+    updateTime: int = 0
+
+    @property
+    def is_pending(self) -> bool:
+        return self.status is None
+
+    @property
+    def is_open(self) -> bool:
+        return self.status is None or self.status in _OPEN_STATUSES
+
+
+class OrderTable:
+    """
+    The orders placed through an `OrderManager` which are in flight or still open, indexed by client order id, order
+    id and symbol. Orders leave the table once they are filled, cancelled or rejected.
+    """
+
+    def __init__(self):
+        self._by_client_id: typing.Dict[str, TrackedOrder] = {}
+        self._by_order_id: typing.Dict[int, TrackedOrder] = {}
+        self._by_symbol: typing.Dict[str, typing.Dict[str, TrackedOrder]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_client_id)
+
+    def __contains__(self, client_order_id: str) -> bool:
+        return client_order_id in self._by_client_id
+
+    def get(self, client_order_id: str) -> typing.Optional[TrackedOrder]:
+        return self._by_client_id.get(client_order_id)
+
+    def by_order_id(self, order_id: int) -> typing.Optional[TrackedOrder]:
+        return self._by_order_id.get(order_id)
+
+    def open_orders(self, symbol: str) -> typing.List[TrackedOrder]:
+        return list(self._by_symbol.get(symbol, {}).values())
+
+    def pending(self) -> typing.List[TrackedOrder]:
+        """
+        :return: The orders not yet acknowledged, including those whose placement failed without a definite answer
+        """
+        return [order for order in self._by_client_id.values() if order.is_pending]
+
+    def symbols(self) -> typing.List[str]:
+        return list(self._by_symbol)
+
+    def add(self, order: TrackedOrder) -> None:
+        if order.clientOrderId in self._by_client_id:
+            raise ValueError(f"Order `{order.clientOrderId}` is already tracked.")
+        self._by_client_id[order.clientOrderId] = order
+        self._by_symbol.setdefault(order.symbol, {})[order.clientOrderId] = order
+        if order.orderId is not None:
+            self._by_order_id[order.orderId] = order
+
+    def remove(self, order: TrackedOrder) -> None:
+        if self._by_client_id.pop(order.clientOrderId, None) is None:
+            return
+        if order.orderId is not None:
+            self._by_order_id.pop(order.orderId, None)
+        symbol_orders = self._by_symbol[order.symbol]
+        del symbol_orders[order.clientOrderId]
+        if not symbol_orders:
+            del self._by_symbol[order.symbol]
+
+    def _update(
+            self,
+            order: TrackedOrder,
+            status: OrderStatus,
+            update_time: int,
+            order_id: typing.Optional[int] = None,
+            executed_quantity: typing.Optional[Decimal] = None
+    ) -> None:
+        if update_time < order.updateTime:
+            return
+        if order_id is not None and order.orderId is None:
+            order.orderId = order_id
+            self._by_order_id[order_id] = order
+        order.status = status
+        order.updateTime = update_time
+        # the filled quantity is cumulative, a lower one comes from a response which raced a fill
+        if executed_quantity is not None and executed_quantity >= (order.executedQuantity or 0):
+            order.executedQuantity = executed_quantity
+        if status not in _OPEN_STATUSES:
+            self.remove(order)
+
+    def apply_response(self, order: TrackedOrder, response: NewOrderResponse) -> None:
+        """
+        The user data stream may report an order before its response arrives, responses of orders which already left
+        the table or which are not newer than the last event applied are ignored.
+        """
+        transact_time = to_epoch_millis(response.transactTime)
+        if self._by_client_id.get(order.clientOrderId) is not order:
+            return
+        if order.status is not None and transact_time <= order.updateTime:
+            return
+        # ACK responses carry no status, the order is on the book by then
+        self._update(
+            order, getattr(response, "status", OrderStatus.NEW), transact_time, response.orderId,
+            getattr(response, "executedQty", None)
+        )
+
+    def apply_order(self, order: TrackedOrder, response: typing.Union[QueryOrderResponse, CancelOrderResponse]) -> None:
+        update_time = to_epoch_millis(response.updateTime)
+        if self._by_client_id.get(order.clientOrderId) is order and update_time >= order.updateTime:
+            self._update(order, response.status, update_time, response.orderId, response.executedQty)
+
+    def apply_cancelled(self, response: typing.Union[CancelOrderResponse, CancelledOrdersList]) -> None:
+        for cancelled in getattr(response, "orders", (response,)):
+            order = self._by_order_id.get(cancelled.orderId) or self._by_client_id.get(cancelled.clientOrderId)
+            if order is not None:
+                self.apply_order(order, cancelled)
+
+    def apply(self, event) -> typing.Optional[TrackedOrder]:
+        """
+        :param event: An `OrderUpdateData` of either model tier
+        :return: The tracked order updated by the event, `None` for orders not placed through this table and events
+        older than the last update applied
+        """
+        order = self._by_order_id.get(event.orderID) or self._by_client_id.get(event.clientOrderID)
+        if order is None:
+            return None
+        event_time = to_epoch_millis(event.eventTime)
+        if event_time < order.updateTime:
+            return None
+        order.type = event.orderType
+        self._update(
+            order, OrderStatus(event.currentOrderStatus), event_time, event.orderID, event.cumulativeFilledQuantity
+        )
+        return order
+
+
+class OrderManager(ABC):
+    """
+    Places orders with generated client order ids and tracks them in an `OrderTable`, which is kept current by
+    passing the `OrderUpdateData` events of the user data stream to `apply` instead of polling `QUERY_ORDER`.
+    """
+
+    def __init__(self, *, client_order_ids: typing.Optional[ClientOrderIDGenerator] = None):
+        self.client_order_ids = client_order_ids or ClientOrderIDGenerator()
+        self.orders = OrderTable()
+
+    def apply(self, event) -> typing.Optional[TrackedOrder]:
+        return self.orders.apply(event)
+
+    def _track(self, request: NewOrderRequest) -> typing.Tuple[NewOrderRequest, TrackedOrder]:
+        if not request.newClientOrderId:
+            request = replace(request, newClientOrderId=self.client_order_ids())
+        order = TrackedOrder(
+            clientOrderId=request.newClientOrderId,
+            symbol=request.symbol,
+            side=request.side,
+            type=request.type,
+            quantity=request.quantity,
+            price=request.price
+        )
+        self.orders.add(order)
+        return request, order
+
+    def _placement_failed(self, order: TrackedOrder, error: BaseException) -> None:
+        # unless rejected, the order may have reached the exchange, it stays pending until the stream or `reconcile`
+        # settles it
+        if _rejected(error):
+            self.orders.remove(order)
+
+    @staticmethod
+    def _query_request(order: TrackedOrder) -> QuerySingleOrderRequest:
+        return QuerySingleOrderRequest(origClientOrderId=order.clientOrderId)
+
+    def _cancel_request(self, order: typing.Union[TrackedOrder, str]) -> CancelSingleOrderRequest:
+        if isinstance(order, str):
+            order = self.orders.get(order) or TrackedOrder(order, "", OrderSides.BUY, None)
+        if order.orderId is not None:
+            return CancelSingleOrderRequest(orderId=order.orderId)
+        return CancelSingleOrderRequest(origClientOrderId=order.clientOrderId)
+
+
+class BlockingOrderManager(OrderManager):
+    def __init__(
+            self,
+            http_client: BlockingHTTPClient,
+            *,
+            client_order_ids: typing.Optional[ClientOrderIDGenerator] = None,
+            concurrency: int = 8
+    ):
+        super().__init__(client_order_ids=client_order_ids)
+        self.http_client = http_client
+        self.concurrency = concurrency
+
+    def place(self, request: NewOrderRequest) -> TrackedOrder:
+        request, order = self._track(request)
+        try:
+            response = APIEndpoints.NEW_ORDER.execute(self.http_client, request)
+        except Exception as e:
+            self._placement_failed(order, e)
+            raise
+        self.orders.apply_response(order, response)
+        return order
+
+    def reconcile(self, order: TrackedOrder) -> typing.Optional[TrackedOrder]:
+        """
+        Queries an order by its client order id, for orders left pending by a `place` which failed without a definite
+        answer.
+
+        :return: The order, `None` if the exchange never received it
+        """
+        try:
+            response = APIEndpoints.QUERY_ORDER.execute(self.http_client, self._query_request(order))
+        except CoinsAPIException as e:
+            if e.code != NO_SUCH_ORDER:
+                raise
+            self.orders.remove(order)
+            return None
+        self.orders.apply_order(order, response)
+        return order
+
+    def cancel(self, order: typing.Union[TrackedOrder, str]) -> CancelOrderResponse:
+        """
+        :param order: A tracked order, or the client order id of one
+        """
+        response = APIEndpoints.CANCEL_ORDER.execute(self.http_client, self._cancel_request(order))
+        self.orders.apply_cancelled(response)
+        return response
+
+    def cancel_all(self, symbol: str) -> CancelledOrdersList:
+        response = APIEndpoints.CANCEL_OPEN_ORDERS.execute(self.http_client, CancelAllOpenOrdersRequest(symbol))
+        self.orders.apply_cancelled(response)
+        return response
+
+    def flatten(self, symbols: typing.Optional[typing.Iterable[str]] = None) -> typing.Dict[str, CancelledOrdersList]:
+        """
+        Cancels every open order of `symbols` (by default every symbol with a tracked order), `concurrency` symbols at
+        a time.
+        """
+        symbols = list(self.orders.symbols() if symbols is None else symbols)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(symbols)))) as executor:
+            return dict(zip(symbols, executor.map(self.cancel_all, symbols)))
+
+
+class AsyncOrderManager(OrderManager):
+    def __init__(
+            self,
+            http_client: AsyncIOHTTPClient,
+            *,
+            client_order_ids: typing.Optional[ClientOrderIDGenerator] = None,
+            concurrency: int = 8
+    ):
+        super().__init__(client_order_ids=client_order_ids)
+        self.http_client = http_client
+        self.concurrency = concurrency
+
+    async def place(self, request: NewOrderRequest) -> TrackedOrder:
+        request, order = self._track(request)
+        try:
+            response = await APIEndpoints.NEW_ORDER.execute_async(self.http_client, request)
+        except BaseException as e:
+            self._placement_failed(order, e)
+            raise
+        self.orders.apply_response(order, response)
+        return order
+
+    async def reconcile(self, order: TrackedOrder) -> typing.Optional[TrackedOrder]:
+        """
+        Queries an order by its client order id, for orders left pending by a `place` which failed without a definite
+        answer.
+
+        :return: The order, `None` if the exchange never received it
+        """
+        try:
+            response = await APIEndpoints.QUERY_ORDER.execute_async(self.http_client, self._query_request(order))
+        except CoinsAPIException as e:
+            if e.code != NO_SUCH_ORDER:
+                raise
+            self.orders.remove(order)
+            return None
+        self.orders.apply_order(order, response)
+        return order
+
+    async def cancel(self, order: typing.Union[TrackedOrder, str]) -> CancelOrderResponse:
+        """
+        :param order: A tracked order, or the client order id of one
+        """
+        response = await APIEndpoints.CANCEL_ORDER.execute_async(self.http_client, self._cancel_request(order))
+        self.orders.apply_cancelled(response)
+        return response
+
+    async def cancel_all(self, symbol: str) -> CancelledOrdersList:
+        response = await APIEndpoints.CANCEL_OPEN_ORDERS.execute_async(
+            self.http_client, CancelAllOpenOrdersRequest(symbol)
+        )
+        self.orders.apply_cancelled(response)
+        return response
+
+    async def flatten(
+            self,
+            symbols: typing.Optional[typing.Iterable[str]] = None
+    ) -> typing.Dict[str, CancelledOrdersList]:
+        """
+        Cancels every open order of `symbols` (by default every symbol with a tracked order), `concurrency` symbols at
+        a time.
+        """
+        symbols = list(self.orders.symbols() if symbols is None else symbols)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def cancel_all(symbol: str) -> CancelledOrdersList:
+            async with semaphore:
+                return await self.cancel_all(symbol)
+
+        return dict(zip(symbols, await asyncio.gather(*(cancel_all(symbol) for symbol in symbols))))
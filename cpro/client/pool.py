@@ -0,0 +1,398 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import collections
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import struct
+import time
+import typing
+from multiprocessing import shared_memory
+
+from cpro.client.wss import AsyncIOWSClient
+from cpro.models.binary import pack_model, unpack_model
+from cpro.models.options import DecodeOptions
+from cpro.models.ws_stream import StreamData, StreamSubscribeRequest, StreamUnsubscribeRequest
+
+_HEADER = struct.Struct("<QQ")  # total bytes written, total bytes read
+_COUNTER = struct.Struct("<Q")
+_WRITTEN_OFFSET, _READ_OFFSET = 0, _COUNTER.size
+_RECORD_LENGTH = struct.Struct("<I")
+
+_logger = logging.getLogger(__name__)
+
+
+class SharedRingBuffer:
+    """
+    Single-producer / single-consumer byte queue living in a `multiprocessing.shared_memory` segment.
+
+    Records are length prefixed and may wrap around the end of the buffer. The producer signals every record through the
+    `items` semaphore, which also orders the shared memory writes against the consumer's reads. Each side only ever
+    stores its own counter of the header, the producer the written one and the consumer the read one.
+    """
+
+    def __init__(self, capacity: int, *, name: typing.Optional[str] = None, items=None):
+        self.capacity = capacity
+        self.items = items
+        self._memory = shared_memory.SharedMemory(name=name, create=name is None, size=_HEADER.size + capacity)
+        self._owner = name is None
+        if self._owner:
+            _HEADER.pack_into(self._memory.buf, 0, 0, 0)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def _positions(self) -> typing.Tuple[int, int]:
+        return _HEADER.unpack_from(self._memory.buf, 0)
+
+    def _copy_in(self, position: int, data: bytes) -> None:
+        start = _HEADER.size + position % self.capacity
+        head = min(len(data), _HEADER.size + self.capacity - start)
+        self._memory.buf[start:start + head] = data[:head]
+        if head < len(data):
+            self._memory.buf[_HEADER.size:_HEADER.size + len(data) - head] = data[head:]
+
+    def _copy_out(self, position: int, length: int) -> bytes:
+        start = _HEADER.size + position % self.capacity
+        head = min(length, _HEADER.size + self.capacity - start)
+        data = bytes(self._memory.buf[start:start + head])
+        if head < length:
+            data += bytes(self._memory.buf[_HEADER.size:_HEADER.size + length - head])
+        return data
+
+    def put(self, data: bytes, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Appends a record, waiting up to `timeout` seconds for the consumer to free up space.
+
+        :return: False if the record could not be written in time
+        """
+        record = _RECORD_LENGTH.pack(len(data)) + data
+        if len(record) > self.capacity:
+            raise ValueError(f"Record of {len(data)} bytes does not fit in a {self.capacity} byte buffer")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            written, read = self._positions()
+            if self.capacity - (written - read) >= len(record):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.0005)
+
+        self._copy_in(written, record)
+        _COUNTER.pack_into(self._memory.buf, _WRITTEN_OFFSET, written + len(record))
+        if self.items is not None:
+            self.items.release()
+        return True
+
+    def get_nowait(self) -> typing.Optional[bytes]:
+        written, read = self._positions()
+        if written == read:
+            return None
+        length, = _RECORD_LENGTH.unpack(self._copy_out(read, _RECORD_LENGTH.size))
+        data = self._copy_out(read + _RECORD_LENGTH.size, length)
+        _COUNTER.pack_into(self._memory.buf, _READ_OFFSET, read + _RECORD_LENGTH.size + length)
+        return data
+
+    def close(self) -> None:
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+def stream_symbol(stream: str) -> str:
+    """
+    `btcusdt@depth@100ms` -> `btcusdt`, all streams of a symbol are kept on the same shard to preserve their ordering.
+    """
+    return stream.split("@", 1)[0].lower()
+
+
+def shard_for(stream: str, shards: int) -> int:
+    """
+    Rendezvous (highest random weight) hashing of the stream's symbol, so that changing the number of shards only moves
+    the streams that have to move.
+    """
+    symbol = stream_symbol(stream).encode()
+    return max(
+        range(shards),
+        key=lambda shard: hashlib.blake2b(symbol, digest_size=8, salt=shard.to_bytes(8, "little")).digest()
+    )
+
+
+class _ShardWorker:
+    # seconds between reconnection attempts once the connection of the shard dropped
+    reconnect_delay = 1.0
+    # seconds given to a connection to resolve its pending subscription requests when closed
+    close_timeout = 5.0
+
+    def __init__(self, ring: SharedRingBuffer, control, options: typing.Optional[DecodeOptions] = None):
+        self.ring = ring
+        self.control = control
+        self.options = options
+        self.streams: typing.Set[str] = set()
+        self.client: typing.Optional[AsyncIOWSClient] = None
+        self.listener: typing.Optional[asyncio.Task] = None
+        self.connections = 0
+        # whether `client` is up, subscriptions made while it reconnects are left to the reconnection
+        self._connected = False
+
+    async def _connect(self) -> None:
+        streams = sorted(self.streams)
+        client = AsyncIOWSClient(streams[0], decode_options=self.options)
+        await client.__aenter__()
+        self.client = client
+        if streams[1:]:
+            await client.rpc_request(StreamSubscribeRequest(params=streams[1:]), lambda _: None)
+        self._connected = True
+        self.connections += 1
+        # catch up on the subscriptions changed while connecting
+        added, removed = self.streams.difference(streams), set(streams).difference(self.streams)
+        if added:
+            await client.rpc_request(StreamSubscribeRequest(params=sorted(added)), lambda _: None)
+        if removed:
+            await client.rpc_request(StreamUnsubscribeRequest(params=sorted(removed)), lambda _: None)
+
+    async def _disconnect(self) -> None:
+        self._connected = False
+        client, self.client = self.client, None
+        if client is None:
+            return
+        try:
+            await asyncio.wait_for(client.__aexit__(None, None, None), self.close_timeout)
+        except Exception:
+            pass  # the connection is already gone
+
+    async def _receive(self) -> None:
+        async for frame in self.client.listen():
+            if isinstance(frame, StreamData):
+                data = pack_model(frame)
+                if not self.ring.put(data, timeout=0):
+                    # the parent is lagging behind, wait for it without stalling the event loop
+                    await asyncio.to_thread(self.ring.put, data)
+
+    async def _listen(self) -> None:
+        """
+        Connects and forwards the frames of the connection to the parent, reconnecting and resubscribing `streams`
+        whenever it drops.
+        """
+        while self.streams:
+            try:
+                await self._connect()
+                await self._receive()
+                _logger.warning("Shard connection closed, reconnecting in %ss", self.reconnect_delay)
+            except Exception as e:
+                _logger.warning("Shard connection lost, reconnecting in %ss", self.reconnect_delay, exc_info=e)
+            await self._disconnect()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _subscribe(self, streams: typing.List[str]) -> None:
+        streams = [stream for stream in streams if stream not in self.streams]
+        if not streams:
+            return
+        self.streams.update(streams)
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.create_task(self._listen())
+        elif self._connected:
+            await self._request(StreamSubscribeRequest(params=streams))
+
+    async def _unsubscribe(self, streams: typing.List[str]) -> None:
+        streams = [stream for stream in streams if stream in self.streams]
+        if not streams:
+            return
+        self.streams.difference_update(streams)
+        if self._connected:
+            await self._request(StreamUnsubscribeRequest(params=streams))
+
+    async def _request(self, request) -> None:
+        try:
+            await self.client.rpc_request(request, lambda _: None)
+        except Exception as e:
+            # the listener reconnects with the current `streams`
+            _logger.warning("Shard subscription request failed", exc_info=e)
+
+    async def run(self) -> None:
+        try:
+            while True:
+                command, streams = await asyncio.to_thread(self.control.get)
+                if command == "subscribe":
+                    await self._subscribe(streams)
+                elif command == "unsubscribe":
+                    await self._unsubscribe(streams)
+                elif command == "stop":
+                    break
+        finally:
+            if self.listener is not None:
+                self.listener.cancel()
+            await self._disconnect()
+            self.ring.close()
+
+
+def _run_shard(ring_name: str, capacity: int, items, control, options: typing.Optional[DecodeOptions]) -> None:
+    ring = SharedRingBuffer(capacity, name=ring_name, items=items)
+    asyncio.run(_ShardWorker(ring, control, options).run())
+
+
+class _Shard:
+    def __init__(self, context, capacity: int, items, options: typing.Optional[DecodeOptions] = None):
+        self.ring = SharedRingBuffer(capacity, items=items)
+        self.control = context.Queue()
+        self.process = context.Process(
+            target=_run_shard, args=(self.ring.name, capacity, items, self.control, options), daemon=True
+        )
+        self.process.start()
+
+    def stop(self) -> None:
+        self.control.put(("stop", []))
+        self.process.join()
+
+
+class WSStreamPool:
+    """
+    Spreads WebSocket stream subscriptions over several worker processes, each running its own event loop and
+    `AsyncIOWSClient` connection. Decoded events are shipped back to the parent through shared memory in the compact
+    format of `cpro.models.binary`.
+
+    Events of a single symbol are ordered, events of different symbols are not ordered relative to each other. A shard
+    whose connection drops reconnects and resubscribes its streams, the events sent in between are lost.
+    """
+
+    def __init__(
+            self,
+            shards: typing.Optional[int] = None,
+            *,
+            buffer_size: int = 8 * 1024 * 1024,
+            decode_options: typing.Optional[DecodeOptions] = None
+    ):
+        self.shards = shards or os.cpu_count() or 1
+        self.buffer_size = buffer_size
+        self.decode_options = decode_options
+        self._context = multiprocessing.get_context("spawn")
+        self._items = None
+        self._workers: typing.List[_Shard] = []
+        self._assignments: typing.Dict[str, int] = dict()
+        self._pending: typing.Deque[bytes] = collections.deque()
+        self._next_ring = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self) -> None:
+        self._items = self._context.Semaphore(0)
+        self._workers = [self._spawn() for _ in range(self.shards)]
+
+    def stop(self) -> None:
+        for worker in self._workers:
+            worker.stop()
+            worker.ring.close()
+        self._workers.clear()
+        self._assignments.clear()
+        self._pending.clear()
+
+    def _spawn(self) -> _Shard:
+        return _Shard(self._context, self.buffer_size, self._items, self.decode_options)
+
+    @property
+    def subscriptions(self) -> typing.Dict[str, int]:
+        """
+        :return: A mapping of every subscribed stream to the shard serving it
+        """
+        return dict(self._assignments)
+
+    def _send(self, command: str, assignments: typing.Dict[str, int]) -> None:
+        by_shard: typing.Dict[int, typing.List[str]] = dict()
+        for stream, shard in assignments.items():
+            by_shard.setdefault(shard, []).append(stream)
+        for shard, streams in by_shard.items():
+            self._workers[shard].control.put((command, streams))
+
+    def subscribe(self, *streams: str) -> None:
+        added = {
+            stream: shard_for(stream, self.shards)
+            for stream in streams if stream not in self._assignments
+        }
+        self._assignments.update(added)
+        self._send("subscribe", added)
+
+    def unsubscribe(self, *streams: str) -> None:
+        removed = {stream: self._assignments.pop(stream) for stream in streams if stream in self._assignments}
+        self._send("unsubscribe", removed)
+
+    def resize(self, shards: int) -> None:
+        """
+        Changes the number of worker processes, only streams whose shard changed are moved.
+        """
+        if shards < 1:
+            raise ValueError("A stream pool needs at least one shard.")
+        while len(self._workers) < shards:
+            self._workers.append(self._spawn())
+
+        moved = {
+            stream: (shard, shard_for(stream, shards))
+            for stream, shard in self._assignments.items()
+            if shard_for(stream, shards) != shard
+        }
+        self._send("unsubscribe", {stream: old for stream, (old, _) in moved.items()})
+        self._send("subscribe", {stream: new for stream, (_, new) in moved.items()})
+        self._assignments.update({stream: new for stream, (_, new) in moved.items()})
+
+        while len(self._workers) > shards:
+            worker = self._workers.pop()
+            worker.stop()
+            # the permits of whatever the retired shard left behind are still in the semaphore, keep the records
+            while (data := worker.ring.get_nowait()) is not None:
+                self._pending.append(data)
+            worker.ring.close()
+        self.shards = shards
+
+    def get(self, timeout: typing.Optional[float] = None) -> StreamData:
+        """
+        Blocks until any of the shards produced an event.
+
+        :raises queue.Empty: if no event arrived within `timeout` seconds
+        """
+        if not self._items.acquire(timeout=timeout):
+            raise queue.Empty
+        if self._pending:
+            return unpack_model(self._pending.popleft())
+        while True:
+            # a permit guarantees a record in one of the rings, round-robin so that no shard starves the others
+            for _ in range(len(self._workers)):
+                worker = self._workers[self._next_ring % len(self._workers)]
+                self._next_ring += 1
+                data = worker.ring.get_nowait()
+                if data is not None:
+                    return unpack_model(data)
+
+    def __iter__(self) -> typing.Iterator[StreamData]:
+        while True:
+            yield self.get()
+
+    async def __aiter__(self) -> typing.AsyncIterator[StreamData]:
+        while True:
+            yield await asyncio.to_thread(self.get)
@@ -0,0 +1,73 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import time
+import typing
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket letting `rate` acquisitions through per `per` seconds, up to `burst` of them at once. Waiters are
+    served in the order they called `acquire`.
+
+    EX: `async with limiter: await client.do_request(...)`
+    """
+
+    def __init__(self, rate: float, per: float = 1, *, burst: typing.Optional[int] = None):
+        if rate <= 0 or per <= 0:
+            raise ValueError("`rate` and `per` must be positive.")
+        self.rate = rate / per
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        async with self._lock:  # FIFO, so no waiter is starved by later ones
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def try_acquire(self) -> bool:
+        """
+        :return: Whether a token was taken, without waiting nor jumping ahead of waiters
+        """
+        if self._lock.locked():
+            return False
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
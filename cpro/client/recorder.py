@@ -0,0 +1,233 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import gzip
+import os
+import struct
+import time
+import typing
+from enum import Enum
+
+from websockets import server as async_server
+from websockets.exceptions import ConnectionClosed
+
+from cpro.codec import dumps, loads
+from cpro.models.options import DecodeOptions, decode_options, ModelTier
+from cpro.models.ud_stream import unmarshal_stream_data
+from cpro.models.ws_stream import unmarshal_frame
+
+_MAGIC = b"CPROFRM1"
+_SEGMENT_HEADER = struct.Struct("<8sB")  # magic, frame source
+_FRAME_HEADER = struct.Struct("<qI")  # receive time (ns since epoch), frame length
+_SEGMENT_SUFFIX = ".frames.gz"
+
+
+class FrameSource(Enum):
+    WEBSOCKET_STREAM = 1  # frames of `WSClient`, decoded by `unmarshal_frame`
+    USER_DATA_STREAM = 2  # frames of `SSEClient`, decoded by `unmarshal_stream_data`
+
+
+class FrameRecorder:
+    """
+    Appends raw frames, as received by a client, to gzip compressed segment files in `directory`.
+
+    Pass it as the `recorder` of a `WSClient` or `SSEClient` to capture everything the client receives, EX:
+    `BlockingWSClient("btcusdt@depth@100ms", recorder=FrameRecorder("./capture", FrameSource.WEBSOCKET_STREAM))`
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            source: FrameSource,
+            *,
+            segment_size: int = 64 * 1024 * 1024,
+            compression_level: int = 6
+    ):
+        """
+        :param segment_size: Uncompressed bytes written to a segment before rotating to the next one
+        """
+        self.directory = directory
+        self.source = source
+        self.segment_size = segment_size
+        self.compression_level = compression_level
+        self._segment: typing.Optional[gzip.GzipFile] = None
+        self._segment_index = 0
+        self._segment_written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _rotate(self) -> None:
+        self.close()
+        while True:
+            self._segment_index += 1
+            path = os.path.join(self.directory, f"{self._segment_index:06d}{_SEGMENT_SUFFIX}")
+            if not os.path.exists(path):
+                break
+        self._segment = gzip.open(path, "wb", compresslevel=self.compression_level)
+        self._segment.write(_SEGMENT_HEADER.pack(_MAGIC, self.source.value))
+        self._segment_written = 0
+
+    def record(self, frame: typing.Union[str, bytes], received_ns: typing.Optional[int] = None) -> None:
+        if received_ns is None:
+            received_ns = time.time_ns()
+        if isinstance(frame, str):
+            frame = frame.encode()
+
+        if self._segment is None or self._segment_written >= self.segment_size:
+            self._rotate()
+        self._segment.write(_FRAME_HEADER.pack(received_ns, len(frame)))
+        self._segment.write(frame)
+        self._segment_written += _FRAME_HEADER.size + len(frame)
+
+    def close(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+
+class FrameReplayer:
+    """
+    Reads back the segments written by a `FrameRecorder` and feeds them through the library's decoders.
+
+    `speed` is a multiplier of the original pace (`1.0` replays in real time, `10.0` ten times faster), `None` replays
+    as fast as possible.
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            *,
+            decode_options: typing.Optional[DecodeOptions] = None,
+            model_tier: ModelTier = ModelTier.DATACLASS
+    ):
+        self.directory = directory
+        self.decode_options = decode_options
+        self.model_tier = model_tier
+        self.segments = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(_SEGMENT_SUFFIX)
+        )
+        if not self.segments:
+            raise ValueError(f"No recorded segments found in {directory}")
+        self.source = self._read_source(self.segments[0])
+
+    @staticmethod
+    def _read_source(path: str) -> FrameSource:
+        with gzip.open(path, "rb") as segment:
+            magic, source = _SEGMENT_HEADER.unpack(segment.read(_SEGMENT_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a recorded frame segment")
+        return FrameSource(source)
+
+    def frames(self) -> typing.Iterator[typing.Tuple[int, bytes]]:
+        """
+        :return: An iterator of every recorded (receive time in nanoseconds, raw frame) pair, in recording order
+        """
+        for path in self.segments:
+            with gzip.open(path, "rb") as segment:
+                magic, source = _SEGMENT_HEADER.unpack(segment.read(_SEGMENT_HEADER.size))
+                if magic != _MAGIC or FrameSource(source) != self.source:
+                    raise ValueError(f"{path} does not belong to this recording")
+                while header := segment.read(_FRAME_HEADER.size):
+                    received_ns, length = _FRAME_HEADER.unpack(header)
+                    yield received_ns, segment.read(length)
+
+    def decode(self, frame: bytes):
+        if self.model_tier == ModelTier.STRUCT:
+            from cpro.models.structs import decode_frame, decode_stream_data
+            if self.source == FrameSource.USER_DATA_STREAM:
+                return decode_stream_data(frame)
+            if (event := decode_frame(frame)) is not None:
+                return event
+        with decode_options(self.decode_options):
+            if self.source == FrameSource.USER_DATA_STREAM:
+                return unmarshal_stream_data(loads(frame))
+            return unmarshal_frame(frame)
+
+    def _paced(self, speed: typing.Optional[float]) -> typing.Iterator[typing.Tuple[float, bytes]]:
+        """
+        :return: An iterator of (seconds to wait before emitting, raw frame) pairs
+        """
+        started = time.monotonic()
+        first_ns = None
+        for received_ns, frame in self.frames():
+            if speed is None:
+                yield 0, frame
+                continue
+            if first_ns is None:
+                first_ns = received_ns
+            due = started + (received_ns - first_ns) / 1e9 / speed
+            yield max(0.0, due - time.monotonic()), frame
+
+    def replay_raw(self, speed: typing.Optional[float] = None) -> typing.Iterator[bytes]:
+        for delay, frame in self._paced(speed):
+            if delay:
+                time.sleep(delay)
+            yield frame
+
+    def replay(self, speed: typing.Optional[float] = None) -> typing.Iterator:
+        for frame in self.replay_raw(speed):
+            yield self.decode(frame)
+
+    async def replay_raw_async(self, speed: typing.Optional[float] = None) -> typing.AsyncIterator[bytes]:
+        for delay, frame in self._paced(speed):
+            if delay:
+                await asyncio.sleep(delay)
+            yield frame
+
+    async def replay_async(self, speed: typing.Optional[float] = None) -> typing.AsyncIterator:
+        async for frame in self.replay_raw_async(speed):
+            yield self.decode(frame)
+
+    def serve(self, host: str = "localhost", port: int = 0, *, speed: typing.Optional[float] = 1.0):
+        """
+        Serves the recording over WebSocket, every connection receives the whole recording. Point a client at it by
+        overriding its base URL, EX: `client.BASE_URL = "ws://localhost:8765/"`.
+
+        Ping requests are answered so that clients keep working when the recording outlasts their ping interval.
+
+        :return: An awaitable `websockets` server, to be used as `async with replayer.serve(...) as server:`
+        """
+
+        async def answer_pings(websocket) -> None:
+            async for message in websocket:
+                try:
+                    request = loads(message)
+                except ValueError:
+                    continue
+                if isinstance(request, dict) and "ping" in request:
+                    await websocket.send(dumps({"pong": request["ping"]}))
+
+        async def handler(websocket, *_) -> None:
+            pinger = asyncio.create_task(answer_pings(websocket))
+            try:
+                async for frame in self.replay_raw_async(speed):
+                    await websocket.send(frame.decode())
+            except ConnectionClosed:
+                pass
+            finally:
+                pinger.cancel()
+
+        return async_server.serve(handler, host, port)
@@ -18,20 +18,40 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import asyncio
+import contextlib
+import dataclasses
+import itertools
+import time
 import typing
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import datetime
 from http.client import HTTPResponse
-from json import dumps, loads
-from urllib.error import HTTPError
+from urllib.error import HTTPError, URLError
 from urllib.request import Request, HTTPErrorProcessor, build_opener
 
 import aiohttp
 
-from cpro.exception import HTTPException, CoinsAPIException
+from cpro.codec import dumps_bytes, loads
+from cpro.client.compression import ACCEPT_ENCODING, CHUNK_SIZE, iter_body, read_body
+from cpro.client.deadline import default_timeout, recv_window, remaining
+from cpro.client.ratelimit import AsyncRateLimiter
+from cpro.client.streaming import JSONArraySplitter, batched, element_decoder, items
+from cpro.exception import HTTPException, CoinsAPIException, DeadlineExceeded
+from cpro.models.lazy import lazy
+from cpro.models.options import DecodeOptions, RawMode, decode_options, get_raw_mode, raw_responses
 from cpro.models.rest.enums import SecurityType
-from cpro.models.rest.request import RequestPayload, TRequestPayload
-from cpro.models.rest.response import TResponsePayload
+from cpro.models.rest.request import RequestPayload, TRequestPayload, NewOrderRequest
+from cpro.models.rest.response import TResponsePayload, NewOrderResponse
+
+if typing.TYPE_CHECKING:
+    from cpro.client.breaker import CircuitBreakers
+    from cpro.client.hedging import HedgePolicy
+    from cpro.client.retry import Retrier
+    from cpro.client.scheduler import AsyncRequestScheduler
+    from cpro.client.template import OrderTemplate
+    from cpro.models.rest.endpoints import APIEndpoints
 
 
 @dataclass(frozen=True)
@@ -57,9 +77,36 @@ class APIEndpoint:
 
 class HTTPClient(ABC):
     API_BASE_URL = "https://api.pro.coins.ph"  # https://coins-docs.github.io/rest-api/#general-api-information
+    USER_AGENT = "cpro.py v0.0.1"
+    # set to "identity" for uncompressed responses
+    ACCEPT_ENCODING = ACCEPT_ENCODING
 
-    def __init__(self, credentials: APICredentials = None):
+    def __init__(
+            self,
+            credentials: APICredentials = None,
+            *,
+            decode_options: typing.Optional[DecodeOptions] = None,
+            retrier: typing.Optional["Retrier"] = None,
+            breakers: typing.Optional["CircuitBreakers"] = None,
+            timeouts: typing.Optional[typing.Mapping["APIEndpoints", float]] = None,
+            raw: typing.Optional[RawMode] = None
+    ):
+        """
+        :param retrier: Retries the requests failing with transient errors, none are retried when `None`
+        :param breakers: Fail requests fast while their group of endpoints keeps failing
+        :param timeouts: How long a single request to an endpoint may take in seconds, from connecting until its body is
+        read, see `default_timeout` for the others. A `cpro.client.deadline.deadline` shortens them further.
+        :param raw: Return the responses as parsed JSON or as the bytes received rather than as models, see also
+        `cpro.models.options.raw_responses`. The helpers of `cpro.client` built on a client need it to return models.
+        """
         self.credentials = credentials
+        self.decode_options = decode_options
+        self.retrier = retrier
+        self.breakers = breakers
+        self.raw = raw
+        self.timeouts: typing.Dict[APIEndpoint, float] = {
+            endpoint.value: timeout for endpoint, timeout in (timeouts or {}).items()
+        }
 
     @abstractmethod
     def do_request(
@@ -69,6 +116,35 @@ class HTTPClient(ABC):
     ) -> TResponsePayload:
         ...
 
+    def decode_response(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload],
+            response_data: typing.Union[dict, list]
+    ) -> TResponsePayload:
+        if get_raw_mode(self.raw) != RawMode.MODEL:
+            return response_data
+        response_cls = request.response_cls or request_payload.expected_response()
+        with decode_options(self.decode_options) as options:
+            if options.lazy_responses:
+                response_cls = lazy(response_cls)
+            return response_cls.from_dict(response_data)
+
+    def _passthrough(self, status: int, content: bytes) -> typing.Optional[bytes]:
+        """
+        :return: `content` when the bytes received were asked for and it holds no error, `None` otherwise
+        """
+        if status >= 400 or get_raw_mode(self.raw) != RawMode.BYTES:
+            return None
+        if b'"code"' in content[:64]:  # error bodies lead with their code, anything else is passed through unparsed
+            try:
+                response_data = loads(content)
+            except ValueError:
+                return content
+            if isinstance(response_data, dict):
+                raise_coins_exception(response_data)
+        return content
+
     def payload_to_tuple(self, request: APIEndpoint, payload: typing.Optional[RequestPayload] = None) -> tuple:
         json = {}
         data = ""
@@ -99,6 +175,71 @@ class HTTPClient(ABC):
 
         return json, data, params, headers
 
+    def timeout(self, request: APIEndpoint) -> float:
+        """
+        :return: How long the next request to `request` may take, in seconds
+        """
+        timeout = self.timeouts.get(request) or default_timeout(request.security)
+        left = remaining()
+        if left is None:
+            return timeout
+        if left <= 0:
+            raise DeadlineExceeded(request.endpoint)
+        return min(timeout, left)
+
+    @staticmethod
+    def _within_deadline(
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload]
+    ) -> typing.Optional[RequestPayload]:
+        # signed requests reaching the exchange after the deadline are rejected rather than executed late
+        if not request.security.is_signed() or not dataclasses.is_dataclass(request_payload):
+            return request_payload
+        timestamp = getattr(request_payload, "timestamp", None)
+        if not isinstance(timestamp, datetime) or not hasattr(request_payload, "recvWindow"):
+            return request_payload
+        window = recv_window(timestamp)
+        if window is None:
+            return request_payload
+        if window <= 0:
+            raise DeadlineExceeded(request.endpoint)
+        if request_payload.recvWindow is not None and request_payload.recvWindow <= window:
+            return request_payload
+        return dataclasses.replace(request_payload, recvWindow=window)
+
+    @staticmethod
+    def _timed_out(request: APIEndpoint, error: BaseException) -> None:
+        # tells the caller's deadline running out from a slow endpoint, which may still be retried
+        left = remaining()
+        if left is not None and left <= 0:
+            raise DeadlineExceeded(request.endpoint) from error
+
+    def _prepare_request(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload] = None
+    ) -> typing.Tuple[str, typing.Union[str, bytes], dict]:
+        """
+        Encodes and signs `request_payload`.
+
+        :return: The url, body and headers of the request
+        """
+        json, data, params, headers = self.payload_to_tuple(request, self._within_deadline(request, request_payload))
+        headers["User-Agent"] = self.USER_AGENT
+        headers["Accept-Encoding"] = self.ACCEPT_ENCODING
+
+        url = request.endpoint
+        if params:
+            url += f"?{params}"
+
+        if json and data:
+            raise ValueError("Only one of `json` or `data` can be passed.")
+
+        if json:
+            data = dumps_bytes(json)
+            headers["Content-Type"] = "application/json; charset=UTF-8"
+        return url, data, headers
+
 
 class _NonRaisingHTTPErrorProcessor(HTTPErrorProcessor):
     def http_response(self, _, response):
@@ -115,70 +256,403 @@ def raise_coins_exception(data: typing.Optional[dict]) -> None:
 
 
 class BlockingHTTPClient(HTTPClient):
+    USER_AGENT = "urllib/cpro.py v0.0.1"
+
+    def _open(
+            self,
+            request: APIEndpoint,
+            url: str,
+            data: typing.Union[str, bytes],
+            headers: dict,
+            timeout: float
+    ) -> HTTPResponse:
+        try:
+            # `timeout` bounds connecting and every read of the socket
+            return build_opener(_NonRaisingHTTPErrorProcessor).open(Request(
+                self.API_BASE_URL + url, data=data if isinstance(data, bytes) else data.encode(), headers=headers,
+                method=request.method.upper()
+            ), timeout=timeout)
+        except URLError as e:
+            if isinstance(e.reason, TimeoutError):
+                self._timed_out(request, e)
+                raise e.reason
+            raise
+        except TimeoutError as e:
+            self._timed_out(request, e)
+            raise
+
+    @staticmethod
+    def _read_within(request: APIEndpoint, response: HTTPResponse, expires_at: float) -> bytes:
+        # the socket timeout only bounds each read, so a trickling body is checked against `expires_at` and the
+        # deadline between chunks
+        sock = getattr(getattr(response.fp, "raw", None), "_sock", None)
+        chunks = []
+        body = iter_body(response)
+        while True:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(request.endpoint)
+            timeout = expires_at - time.monotonic()
+            if timeout <= 0:
+                raise TimeoutError(f"Timed out waiting on the response to {request.endpoint}")
+            if sock is not None:
+                sock.settimeout(timeout)
+            chunk = next(body, None)
+            if chunk is None:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    @staticmethod
+    def _response_data(response: HTTPResponse, content: bytes) -> typing.Union[dict, list, None]:
+        try:
+            response_data = loads(content)
+        except ValueError:
+            if response.status < 400:
+                raise
+            response_data = None  # error pages of the gateway in front of the API
+        raise_coins_exception(response_data)
+        if response.status >= 400:
+            raise HTTPException(
+                body=content.decode(response.headers.get_content_charset("utf-8")),
+                headers={key.lower(): value for key, value in response.headers.items()},
+                status=response.status
+            )
+        return response_data
+
+    def _send(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload],
+            url: str,
+            data: typing.Union[str, bytes],
+            headers: dict
+    ) -> TResponsePayload:
+        timeout = self.timeout(request)
+        expires_at = time.monotonic() + timeout
+        with self._open(request, url, data, headers, timeout) as response:
+            try:
+                content = self._read_within(request, response, expires_at)
+            except TimeoutError as e:
+                self._timed_out(request, e)
+                raise
+            if self._passthrough(response.status, content) is not None:
+                return content
+            return self.decode_response(request, request_payload, self._response_data(response, content))
+
+    def _guarded_send(self, request: APIEndpoint, *args) -> TResponsePayload:
+        if self.breakers is None:
+            return self._send(request, *args)
+        return self.breakers.for_endpoint(request).call(self._send, request, *args)
+
+    def _attempt(self, request: APIEndpoint, request_payload: typing.Optional[RequestPayload]) -> TResponsePayload:
+        return self._guarded_send(request, request_payload, *self._prepare_request(request, request_payload))
+
     def do_request(
             self,
             request: APIEndpoint,
             request_payload: typing.Optional[RequestPayload] = None
     ) -> TResponsePayload:
-        json, data, params, headers = self.payload_to_tuple(request, request_payload)
-        headers.update({"User-Agent": "urllib/cpro.py v0.0.1"})
+        with raw_responses(get_raw_mode(self.raw)):
+            if self.retrier is None:
+                return self._attempt(request, request_payload)
+            return self.retrier.run(self._attempt, request, request_payload)
+
+    def send_order(self, template: "OrderTemplate", **values) -> NewOrderResponse:
+        """
+        Places an order from `template`, see `OrderTemplate.encode` for `values`. Deadlines and the `raw` mode apply as
+        for `do_request`, but template orders skip the `retrier`, whose retries need a `NewOrderRequest` to sign anew.
+        """
+        from cpro.models.rest.endpoints import APIEndpoints
+
+        endpoint = APIEndpoints.NEW_ORDER.value
+        return self._guarded_send(
+            endpoint, template.request, f"{endpoint.endpoint}?{template.encode(**values)}", "",
+            {**template.headers, "User-Agent": self.USER_AGENT}
+        )
+
+    def _stream(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload]
+    ) -> typing.Iterator[list]:
+        decode = element_decoder(request.response_cls or request_payload.expected_response())
+        url, data, headers = self._prepare_request(request, request_payload)
+        splitter = JSONArraySplitter()
+        with self._open(request, url, data, headers, self.timeout(request)) as response:
+            if response.status >= 400:
+                self._response_data(response, read_body(response))
+            for chunk in iter_body(response):
+                elements = splitter.feed(chunk)
+                if elements:
+                    with decode_options(self.decode_options):
+                        decoded = [decode(loads(element)) for element in elements]
+                    yield decoded
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceeded(request.endpoint)
+        document = splitter.close()
+        if document is not None:
+            # an error, or a single element not wrapped in an array
+            response_data = loads(document)
+            raise_coins_exception(response_data)
+            yield items(self.decode_response(request, request_payload, response_data))
 
-        url = request.endpoint
-        if params:
-            url += f"?{params}"
+    def stream_request(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload] = None,
+            *,
+            batch_size: typing.Optional[int] = None
+    ) -> typing.Iterator:
+        """
+        Sends a request to an endpoint answering with a JSON array (klines, trades, order history, ...), decoding its
+        elements one by one as the body arrives instead of all at once, so memory stays flat however long the array
+        is. The request is not retried, nor guarded by the circuit breakers.
 
-        if json and data:
-            raise ValueError("Only one of `json` or `data` can be passed.")
+        EX: `for kline in client.stream_request(APIEndpoints.GET_GRAPH_DATA.value, GraphDataRequest(...)): ...`
 
-        if json:
-            request_data = dumps(data)
-            headers["Content-Type"] = "application/json; charset=UTF-8"
-        else:
-            request_data = data
-
-        with build_opener(_NonRaisingHTTPErrorProcessor).open(Request(
-                self.API_BASE_URL + url, data=request_data.encode(), headers=headers, method=request.method.upper()
-        )) as response:  # type: HTTPResponse
-            text_content = response.read().decode(
-                response.headers.get_content_charset("utf-8")
-            )
-            response_data = loads(text_content)
-            raise_coins_exception(response_data)
-            if response.status >= 400:
-                raise HTTPException(
-                    body=text_content,
-                    headers={key.lower(): value for key, value in response.headers.items()},
-                    status=response.status
-                )
-            return (request.response_cls or request_payload.expected_response()).from_dict(response_data)
+        :param batch_size: Yield lists of up to `batch_size` elements rather than the elements themselves
+        """
+        elements = itertools.chain.from_iterable(self._stream(request, request_payload))
+        return elements if batch_size is None else batched(elements, batch_size)
 
 
 class AsyncIOHTTPClient(HTTPClient):
-    async def do_request(
+    """
+    Used as an async context manager, the client keeps its connections pooled in one `aiohttp.ClientSession` until the
+    block exits, otherwise every request opens (and closes) its own session. Clients of several accounts can share a
+    `session`, and with it its pool, which is then left to the caller to close.
+    """
+    USER_AGENT = "aiohttp/cpro.py v0.0.1"
+    # pace of `submit_orders` when no `order_limiter` is given, keep it within the order rate limit of the account
+    ORDERS_PER_SECOND = 10
+
+    def __init__(
+            self,
+            credentials: APICredentials = None,
+            *,
+            decode_options: typing.Optional[DecodeOptions] = None,
+            retrier: typing.Optional["Retrier"] = None,
+            breakers: typing.Optional["CircuitBreakers"] = None,
+            timeouts: typing.Optional[typing.Mapping["APIEndpoints", float]] = None,
+            raw: typing.Optional[RawMode] = None,
+            session: typing.Optional[aiohttp.ClientSession] = None,
+            order_limiter: typing.Optional[AsyncRateLimiter] = None,
+            scheduler: typing.Optional["AsyncRequestScheduler"] = None,
+            hedging: typing.Optional["HedgePolicy"] = None
+    ):
+        """
+        :param scheduler: Queues requests beyond its concurrency by priority, cancels and orders first
+        :param hedging: Duplicates the slowest requests of latency-critical market data endpoints
+        """
+        super().__init__(
+            credentials, decode_options=decode_options, retrier=retrier, breakers=breakers, timeouts=timeouts, raw=raw
+        )
+        self.scheduler = scheduler
+        self.hedging = hedging
+        self._session = session
+        self._owns_session = session is None
+        self.order_limiter = order_limiter or AsyncRateLimiter(self.ORDERS_PER_SECOND)
+
+    @contextlib.asynccontextmanager
+    async def _request(self, method: str, url: str, **kwargs) -> typing.AsyncIterator[aiohttp.ClientResponse]:
+        if self._session is not None:
+            async with self._session.request(method, url, **kwargs) as response:
+                yield response
+            return
+        async with aiohttp.ClientSession() as session:
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+
+    async def close(self) -> None:
+        """
+        Closes the pooled session opened by `__aenter__`, a shared `session` is left open.
+        """
+        if self._owns_session and self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    async def __aenter__(self):
+        if self._owns_session and self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _send(
             self,
             request: APIEndpoint,
-            request_payload: typing.Optional[RequestPayload] = None
+            request_payload: typing.Optional[RequestPayload],
+            url: str,
+            data: typing.Union[str, bytes],
+            headers: dict
     ) -> TResponsePayload:
-        json, data, params, headers = self.payload_to_tuple(request, request_payload)
-        headers.update({"User-Agent": "aiohttp/cpro.py v0.0.1"})
-
-        url = request.endpoint
-        if params:
-            url += f"?{params}"
-
         try:
-            async with aiohttp.ClientSession() as cs:
-                async with cs.request(
-                        request.method.upper(), self.API_BASE_URL + url,
-                        data=data or None, json=json or None, headers=headers
-                ) as response:
-                    response_data = await response.json()
-                    raise_coins_exception(response_data)
-                    response.raise_for_status()
-                    return (request.response_cls or request_payload.expected_response()).from_dict(response_data)
+            async with self._request(
+                    request.method.upper(), self.API_BASE_URL + url, data=data or None, headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout(request))
+            ) as response:
+                content = await response.read()
+                if self._passthrough(response.status, content) is not None:
+                    return content
+                try:
+                    response_data = loads(content)
+                except ValueError:
+                    if response.status < 400:
+                        raise
+                    response_data = None  # error pages of the gateway in front of the API
+                raise_coins_exception(response_data)
+                response.raise_for_status()
+                return self.decode_response(request, request_payload, response_data)
         except HTTPError as e:
             raise HTTPException(
                 body=str(e.reason),
                 headers={key.lower(): value for key, value in e.headers.items()},
                 status=e.code
             )
+        except asyncio.TimeoutError as e:
+            self._timed_out(request, e)
+            raise
+
+    async def _breaker_send(self, request: APIEndpoint, *args) -> TResponsePayload:
+        if self.breakers is None:
+            return await self._send(request, *args)
+        return await self.breakers.for_endpoint(request).call_async(self._send, request, *args)
+
+    async def _guarded_send(self, request: APIEndpoint, *args) -> TResponsePayload:
+        if self.scheduler is None:
+            return await self._breaker_send(request, *args)
+        async with self.scheduler.slot(request):
+            return await self._breaker_send(request, *args)
+
+    async def _attempt(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload]
+    ) -> TResponsePayload:
+        prepared = self._prepare_request(request, request_payload)
+        if self.hedging is not None and self.hedging.applies(request):
+            return await self.hedging.run(self._guarded_send, request, request_payload, *prepared)
+        return await self._guarded_send(request, request_payload, *prepared)
+
+    async def do_request(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload] = None
+    ) -> TResponsePayload:
+        with raw_responses(get_raw_mode(self.raw)):
+            if self.retrier is None:
+                return await self._attempt(request, request_payload)
+            return await self.retrier.run_async(self._attempt, request, request_payload)
+
+    async def send_order(self, template: "OrderTemplate", **values) -> NewOrderResponse:
+        """
+        Places an order from `template`, see `OrderTemplate.encode` for `values`. Deadlines and the `raw` mode apply as
+        for `do_request`, but template orders skip the `retrier`, whose retries need a `NewOrderRequest` to sign anew.
+        """
+        from cpro.models.rest.endpoints import APIEndpoints
+
+        endpoint = APIEndpoints.NEW_ORDER.value
+        return await self._guarded_send(
+            endpoint, template.request, f"{endpoint.endpoint}?{template.encode(**values)}", "",
+            {**template.headers, "User-Agent": self.USER_AGENT}
+        )
+
+    def submit_orders(
+            self,
+            orders: typing.Iterable[NewOrderRequest],
+            *,
+            limiter: typing.Optional[AsyncRateLimiter] = None
+    ) -> typing.List["asyncio.Future[NewOrderResponse]"]:
+        """
+        Places `orders` concurrently, as fast as `limiter` (by default `order_limiter`, shared by every batch of this
+        client) allows. Each order is timestamped and signed once the limiter lets it through, so orders queued behind
+        the burst still reach the exchange within their `recvWindow`.
+
+        EX: `for result in await asyncio.gather(*client.submit_orders(grid), return_exceptions=True): ...`
+
+        :return: A future per order, in the order given, each failing on its own with the error of its order
+        """
+        from cpro.models.rest.endpoints import APIEndpoints
+
+        endpoint = APIEndpoints.NEW_ORDER.value
+        limiter = limiter or self.order_limiter
+        loop = asyncio.get_running_loop()
+
+        async def submit(order: NewOrderRequest) -> NewOrderResponse:
+            await limiter.acquire()
+            if dataclasses.is_dataclass(order) and isinstance(getattr(order, "timestamp", None), datetime):
+                order = dataclasses.replace(order, timestamp=datetime.now())
+            return await self._guarded_send(endpoint, order, *self._prepare_request(endpoint, order))
+
+        return [loop.create_task(submit(order)) for order in orders]
+
+    async def _stream(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload]
+    ) -> typing.AsyncIterator[list]:
+        decode = element_decoder(request.response_cls or request_payload.expected_response())
+        url, data, headers = self._prepare_request(request, request_payload)
+        timeout = self.timeout(request)
+        splitter = JSONArraySplitter()
+        try:
+            # no total timeout, the body arrives for as long as the array goes on
+            async with self._request(
+                    request.method.upper(), self.API_BASE_URL + url, data=data or None, headers=headers,
+                    timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+            ) as response:
+                if response.status >= 400:
+                    try:
+                        raise_coins_exception(loads(await response.read()))
+                    except ValueError:
+                        pass  # error pages of the gateway in front of the API
+                    response.raise_for_status()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    elements = splitter.feed(chunk)
+                    if elements:
+                        with decode_options(self.decode_options):
+                            decoded = [decode(loads(element)) for element in elements]
+                        yield decoded
+                    left = remaining()
+                    if left is not None and left <= 0:
+                        raise DeadlineExceeded(request.endpoint)
+        except asyncio.TimeoutError as e:
+            self._timed_out(request, e)
+            raise
+        document = splitter.close()
+        if document is not None:
+            # an error, or a single element not wrapped in an array
+            response_data = loads(document)
+            raise_coins_exception(response_data)
+            yield items(self.decode_response(request, request_payload, response_data))
+
+    async def stream_request(
+            self,
+            request: APIEndpoint,
+            request_payload: typing.Optional[RequestPayload] = None,
+            *,
+            batch_size: typing.Optional[int] = None
+    ) -> typing.AsyncIterator:
+        """
+        Sends a request to an endpoint answering with a JSON array (klines, trades, order history, ...), decoding its
+        elements one by one as the body arrives instead of all at once, so memory stays flat however long the array
+        is. The request is not retried, nor guarded by the circuit breakers or the scheduler.
+
+        EX: `async for kline in client.stream_request(APIEndpoints.GET_GRAPH_DATA.value, GraphDataRequest(...)): ...`
+
+        :param batch_size: Yield lists of up to `batch_size` elements rather than the elements themselves
+        """
+        batch = []
+        async for elements in self._stream(request, request_payload):
+            if batch_size is None:
+                for element in elements:
+                    yield element
+                continue
+            batch.extend(elements)
+            while len(batch) >= batch_size:
+                yield batch[:batch_size]
+                batch = batch[batch_size:]
+        if batch:
+            yield batch
@@ -0,0 +1,363 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import dataclasses
+import random
+import threading
+import time
+import typing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum, auto
+
+import aiohttp
+
+from cpro.client.deadline import remaining
+from cpro.client.rest import APIEndpoint
+from cpro.codec import dumps_bytes
+from cpro.exception import HTTPException, CoinsAPIException
+from cpro.models.options import RawMode, get_raw_mode, raw_responses
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.request import RequestPayload, NewOrderRequest, QuerySingleOrderRequest
+from cpro.models.rest.response import TResponsePayload, NewOrderResponse, NewOrderACKResponse, \
+    NewOrderRESULTResponse, QueryOrderResponse
+
+TRANSIENT_STATUSES = frozenset((429, 500, 502, 503, 504))
+# https://coins-docs.github.io/errors/#10xx---general-server-or-network-issues
+# DISCONNECTED, TOO_MANY_REQUESTS, UNEXPECTED_RESP, TIMEOUT
+TRANSIENT_CODES = frozenset((-1001, -1003, -1006, -1007))
+TOO_MANY_REQUESTS = -1003
+# https://coins-docs.github.io/errors/#20xx---processing-issues
+NO_SUCH_ORDER = -2013
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    :return: Whether `error` may not happen again on a retry (server errors, throttling, resets and timeouts)
+    """
+    if isinstance(error, HTTPException):
+        return error.status in TRANSIENT_STATUSES
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in TRANSIENT_STATUSES
+    if isinstance(error, CoinsAPIException):
+        return error.code in TRANSIENT_CODES
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, OSError))
+
+
+def is_throttled(error: BaseException) -> bool:
+    """
+    :return: Whether `error` is the exchange asking for fewer requests
+    """
+    if isinstance(error, (HTTPException, aiohttp.ClientResponseError)):
+        return error.status == 429
+    return isinstance(error, CoinsAPIException) and error.code == TOO_MANY_REQUESTS
+
+
+def retry_after(error: BaseException) -> typing.Optional[float]:
+    """
+    :return: The seconds to wait as told by the `Retry-After` header of a failed response, if any
+    """
+    headers = getattr(error, "headers", None)
+    value = headers.get("retry-after") if headers else None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryMode(Enum):
+    NEVER = auto()
+    ALWAYS = auto()
+    # orders are only retried when their `newClientOrderId` lets the exchange be asked whether they were placed
+    CLIENT_ORDER_ID = auto()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    mode: RetryMode = RetryMode.ALWAYS
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2
+    # the least wait after being throttled, retrying sooner only extends the ban
+    throttled_delay: float = 5
+
+    def delay(self, retry: int, error: typing.Optional[BaseException] = None) -> float:
+        """
+        :return: The wait before the `retry`th retry after `error`, exponential with full jitter, or for throttling
+        errors as long as their `Retry-After` and at least `throttled_delay`
+        """
+        if error is not None and is_throttled(error):
+            return max(self.throttled_delay, retry_after(error) or 0)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+NO_RETRY = RetryPolicy(RetryMode.NEVER)
+
+
+def default_policies() -> typing.Dict[APIEndpoints, RetryPolicy]:
+    """
+    :return: A retrying policy for every `GET` endpoint and `NEW_ORDER`, every other endpoint is not retried
+    """
+    policies = {
+        endpoint: RetryPolicy() if endpoint.value.method == "GET" else NO_RETRY
+        for endpoint in APIEndpoints
+    }
+    policies[APIEndpoints.NEW_ORDER] = RetryPolicy(RetryMode.CLIENT_ORDER_ID)
+    return policies
+
+
+class RetryBudget:
+    """
+    Caps retries to a `ratio` of the requests made, plus a `reserve` for when requests are few, so an exchange incident
+    cannot be amplified into a retry storm.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: int = 10):
+        self.ratio = ratio
+        self.reserve = reserve
+        self._tokens = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.reserve)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryStats:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        # requests which succeeded after failing at least once
+        self.recovered = 0
+        # orders found placed when checked before a retry
+        self.reconciled = 0
+        # requests given up on, out of attempts or of retry budget
+        self.exhausted = 0
+        self.budget_exhausted = 0
+
+    def snapshot(self) -> dict:
+        return dict(vars(self))
+
+
+class RetryMetrics:
+    def __init__(self):
+        self.endpoints: typing.Dict[str, RetryStats] = dict()
+
+    def stats(self, endpoint: APIEndpoint) -> RetryStats:
+        key = f"{endpoint.method} {endpoint.endpoint}"
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = RetryStats()
+        return stats
+
+    def snapshot(self) -> dict:
+        return {key: stats.snapshot() for key, stats in self.endpoints.items()}
+
+
+def _order_response(request: NewOrderRequest, order: QueryOrderResponse) -> NewOrderResponse:
+    acknowledged = dict(
+        symbol=order.symbol, orderId=order.orderId, clientOrderId=order.clientOrderId, transactTime=order.time
+    )
+    if request.expected_response() is NewOrderACKResponse:
+        return NewOrderACKResponse(**acknowledged)
+    # the fills of a FULL response are not part of the order
+    return NewOrderRESULTResponse(
+        **acknowledged, price=order.price, origQty=order.origQty, executedQty=order.executedQty, status=order.status,
+        timeInForce=order.timeInForce, type=order.type, side=order.side, stopPrice=order.stopPrice,
+        origQuoteOrderQty=order.origQuoteOrderQty
+    )
+
+
+def _as_raw(response: TResponsePayload) -> typing.Union[TResponsePayload, dict, bytes]:
+    # reconciled orders are returned as the order response would have been
+    mode = get_raw_mode()
+    if mode == RawMode.MODEL:
+        return response
+    response_data = response.to_dict(encode_json=True)
+    return response_data if mode == RawMode.JSON else dumps_bytes(response_data)
+
+
+class Retrier:
+    """
+    Retries the requests of an `HTTPClient` failing with a transient error (see `is_transient`), by the `RetryPolicy`
+    of their `APIEndpoints` member, within a shared `RetryBudget`.
+
+    An order which failed in a way that leaves unknown whether it was placed is looked up by its client order id
+    before being sent again, and the order found is returned instead of placing it twice.
+
+    EX: `BlockingHTTPClient(credentials, retrier=Retrier())`
+    """
+
+    def __init__(
+            self,
+            policies: typing.Optional[typing.Mapping[APIEndpoints, RetryPolicy]] = None,
+            *,
+            budget: typing.Optional[RetryBudget] = None,
+            metrics: typing.Optional[RetryMetrics] = None
+    ):
+        self.policies = {**default_policies(), **(policies or {})}
+        self.budget = budget or RetryBudget()
+        self.metrics = metrics or RetryMetrics()
+        self._by_endpoint = {endpoint.value: policy for endpoint, policy in self.policies.items()}
+
+    def policy(self, endpoint: APIEndpoint) -> RetryPolicy:
+        return self._by_endpoint.get(endpoint, NO_RETRY)
+
+    def _start(self, endpoint: APIEndpoint) -> typing.Tuple[RetryPolicy, RetryStats]:
+        self.budget.deposit()
+        stats = self.metrics.stats(endpoint)
+        stats.requests += 1
+        return self.policy(endpoint), stats
+
+    def _retry_delay(
+            self,
+            policy: RetryPolicy,
+            stats: RetryStats,
+            payload: typing.Optional[RequestPayload],
+            error: Exception,
+            attempt: int
+    ) -> typing.Optional[float]:
+        """
+        :return: The wait before retrying, `None` when `error` should be raised instead
+        """
+        if policy.mode == RetryMode.NEVER or not is_transient(error):
+            return None
+        if policy.mode == RetryMode.CLIENT_ORDER_ID and not getattr(payload, "newClientOrderId", None):
+            return None
+        if attempt >= policy.max_attempts:
+            stats.exhausted += 1
+            return None
+        delay = policy.delay(attempt, error)
+        left = remaining()
+        if left is not None and left <= delay:
+            return None  # the retry could not finish before the deadline anyway
+        if not self.budget.withdraw():
+            stats.budget_exhausted += 1
+            return None
+        stats.retries += 1
+        return delay
+
+    @staticmethod
+    def _refreshed(payload: typing.Optional[RequestPayload]) -> typing.Optional[RequestPayload]:
+        # a retry is signed anew, with a timestamp still within its recvWindow
+        if dataclasses.is_dataclass(payload) and isinstance(getattr(payload, "timestamp", None), datetime):
+            return dataclasses.replace(payload, timestamp=datetime.now())
+        return payload
+
+    @staticmethod
+    def _lookup(payload: NewOrderRequest) -> typing.Tuple[APIEndpoint, QuerySingleOrderRequest]:
+        return APIEndpoints.QUERY_ORDER.value, QuerySingleOrderRequest(
+            origClientOrderId=payload.newClientOrderId, recvWindow=payload.recvWindow
+        )
+
+    def _find(self, send, payload: NewOrderRequest) -> typing.Optional[QueryOrderResponse]:
+        try:
+            with raw_responses(RawMode.MODEL):
+                return send(*self._lookup(payload))
+        except CoinsAPIException as e:
+            if e.code != NO_SUCH_ORDER:
+                raise
+            return None
+
+    async def _find_async(self, send, payload: NewOrderRequest) -> typing.Optional[QueryOrderResponse]:
+        try:
+            with raw_responses(RawMode.MODEL):
+                return await send(*self._lookup(payload))
+        except CoinsAPIException as e:
+            if e.code != NO_SUCH_ORDER:
+                raise
+            return None
+
+    def run(
+            self,
+            send: typing.Callable[[APIEndpoint, typing.Optional[RequestPayload]], TResponsePayload],
+            endpoint: APIEndpoint,
+            payload: typing.Optional[RequestPayload] = None
+    ) -> TResponsePayload:
+        """
+        :param send: Makes a single attempt of a request
+        """
+        policy, stats = self._start(endpoint)
+        attempt, unsure = 1, False
+        while True:
+            try:
+                if unsure:
+                    order = self._find(send, payload)
+                    if order is not None:
+                        stats.reconciled += 1
+                        return _as_raw(_order_response(payload, order))
+                    unsure = False
+                response = send(endpoint, payload)
+                stats.recovered += attempt > 1
+                return response
+            except Exception as e:
+                delay = self._retry_delay(policy, stats, payload, e, attempt)
+                if delay is None:
+                    raise
+            unsure = policy.mode == RetryMode.CLIENT_ORDER_ID
+            payload = self._refreshed(payload)
+            attempt += 1
+            time.sleep(delay)
+
+    async def run_async(
+            self,
+            send: typing.Callable[[APIEndpoint, typing.Optional[RequestPayload]], typing.Awaitable[TResponsePayload]],
+            endpoint: APIEndpoint,
+            payload: typing.Optional[RequestPayload] = None
+    ) -> TResponsePayload:
+        """
+        :param send: Makes a single attempt of a request
+        """
+        policy, stats = self._start(endpoint)
+        attempt, unsure = 1, False
+        while True:
+            try:
+                if unsure:
+                    order = await self._find_async(send, payload)
+                    if order is not None:
+                        stats.reconciled += 1
+                        return _as_raw(_order_response(payload, order))
+                    unsure = False
+                response = await send(endpoint, payload)
+                stats.recovered += attempt > 1
+                return response
+            except Exception as e:
+                delay = self._retry_delay(policy, stats, payload, e, attempt)
+                if delay is None:
+                    raise
+            unsure = policy.mode == RetryMode.CLIENT_ORDER_ID
+            payload = self._refreshed(payload)
+            attempt += 1
+            await asyncio.sleep(delay)
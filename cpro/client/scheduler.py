@@ -0,0 +1,149 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+import typing
+from enum import Enum, auto
+
+from cpro.client.metrics import LatencyHistogram
+from cpro.client.ratelimit import AsyncRateLimiter
+from cpro.client.rest import APIEndpoint
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import SecurityType
+
+
+class Lane(Enum):
+    CANCEL = auto()
+    ORDER = auto()
+    ACCOUNT = auto()
+    MARKET_DATA = auto()
+
+
+# share of the dispatches each lane gets while all of them are busy
+DEFAULT_WEIGHTS = {
+    Lane.CANCEL: 16,
+    Lane.ORDER: 8,
+    Lane.ACCOUNT: 2,
+    Lane.MARKET_DATA: 1,
+}
+_CANCELS = frozenset((APIEndpoints.CANCEL_ORDER.value, APIEndpoints.CANCEL_OPEN_ORDERS.value))
+_ORDERS = frozenset((APIEndpoints.NEW_ORDER.value, APIEndpoints.TEST_NEW_ORDER.value))
+
+
+def request_lane(endpoint: APIEndpoint) -> Lane:
+    if endpoint in _CANCELS:
+        return Lane.CANCEL
+    if endpoint in _ORDERS:
+        return Lane.ORDER
+    if endpoint.security == SecurityType.NONE:
+        return Lane.MARKET_DATA
+    return Lane.ACCOUNT
+
+
+class AsyncRequestScheduler:
+    """
+    Lets `concurrency` requests of an `AsyncIOHTTPClient` run at once (keep it within the connection pool's limit),
+    queueing the others in lanes by the kind of request. Queued requests are dispatched by weighted fair queuing: each
+    gets a virtual finish time advancing by `1 / weight` of its lane, so cancels overtake a backlog of market data
+    while the market data still makes progress. Requests pass `limiter` once dispatched, in dispatch order.
+
+    EX: `AsyncIOHTTPClient(credentials, scheduler=AsyncRequestScheduler(8))`
+    """
+
+    def __init__(
+            self,
+            concurrency: int = 10,
+            *,
+            weights: typing.Optional[typing.Mapping[Lane, float]] = None,
+            limiter: typing.Optional[AsyncRateLimiter] = None
+    ):
+        self.concurrency = concurrency
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.limiter = limiter
+        # time spent queued by the requests of each lane
+        self.waits = {lane: LatencyHistogram() for lane in Lane}
+        self._active = 0
+        self._queue: typing.List[typing.Tuple[float, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._finish = {lane: 0.0 for lane in Lane}
+        self._lanes: typing.Dict[APIEndpoint, Lane] = dict()
+
+    def lane(self, endpoint: APIEndpoint) -> Lane:
+        lane = self._lanes.get(endpoint)
+        if lane is None:
+            lane = self._lanes[endpoint] = request_lane(endpoint)
+        return lane
+
+    @property
+    def queued(self) -> int:
+        return sum(not waiter.done() for *_, waiter in self._queue)
+
+    async def acquire(self, lane: Lane) -> None:
+        queued_at = time.perf_counter_ns()
+        if self._active < self.concurrency and not self._queue:
+            self._active += 1
+        else:
+            finish = max(self._virtual_time, self._finish[lane]) + 1 / self.weights[lane]
+            self._finish[lane] = finish
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (finish, next(self._sequence), waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release()  # cancelled right after being handed the slot
+                raise
+        self.waits[lane].record((time.perf_counter_ns() - queued_at) // 1000)
+        if self.limiter is not None:
+            try:
+                await self.limiter.acquire()
+            except BaseException:
+                self.release()
+                raise
+
+    def release(self) -> None:
+        while self._queue:
+            finish, _, waiter = heapq.heappop(self._queue)
+            if waiter.done():
+                continue  # cancelled while queued
+            self._virtual_time = finish
+            waiter.set_result(None)  # the slot passes on as is
+            return
+        self._active -= 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self, endpoint: APIEndpoint) -> typing.AsyncIterator[None]:
+        await self.acquire(self.lane(endpoint))
+        try:
+            yield
+        finally:
+            self.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "active": self._active,
+            "queued": self.queued,
+            "waits": {lane.name: histogram.snapshot() for lane, histogram in self.waits.items()},
+        }
@@ -19,37 +19,95 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import asyncio
-import json
+import logging
 import threading
 import typing
+from time import time_ns
 from abc import ABC
 
-import aiohttp
-import requests
 from websockets import client as async_client
 from websockets.sync import client as sync_client
 
-from cpro.exception import CoinsAPIException
+from cpro.client.metrics import LatencyMetrics
+from cpro.client.recorder import FrameRecorder
+from cpro.client.rest import APICredentials, HTTPClient, BlockingHTTPClient, AsyncIOHTTPClient
+from cpro.codec import loads
+from cpro.models.options import DecodeOptions, decode_options, ModelTier
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.request import CreateListenKeyRequest, ListenKeyRequest
 from cpro.models.ud_stream import UserStreamData, unmarshal_stream_data
 
-BASE_URL = "https://api.pro.coins.ph"
 BASE_WS_URL = "wss://wsapi.pro.coins.ph"
 
+_logger = logging.getLogger(__name__)
+
 
 class SSEClient(ABC):
-    def __init__(self, *, api_key: str, keepalive_interval: int = 30 * 60):
-        self.api_key = api_key
+    """
+    The listen key is created, kept alive and closed through the `USER_STREAM` endpoints of `APIEndpoints`, by
+    `http_client` when given (sharing its connections), otherwise by a client made from `api_key`.
+    """
+
+    def __init__(
+            self,
+            *,
+            api_key: typing.Optional[str] = None,
+            http_client: typing.Optional[HTTPClient] = None,
+            keepalive_interval: int = 30 * 60,
+            recorder: typing.Optional[FrameRecorder] = None,
+            metrics: typing.Optional[LatencyMetrics] = None,
+            decode_options: typing.Optional[DecodeOptions] = None,
+            model_tier: ModelTier = ModelTier.DATACLASS
+    ):
+        if http_client is None and api_key is None:
+            raise ValueError("One of `api_key` or `http_client` must be given.")
+        # a client made here is opened and closed along with this one, a given one is left to its owner
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or self._make_http_client(APICredentials(api_key))
         self.keepalive_interval = keepalive_interval
-
-    def _make_headers(self):
-        return {
-            "X-COINS-APIKEY": self.api_key
-        }
+        self.recorder = recorder
+        self.metrics = metrics
+        self.decode_options = decode_options
+        self.model_tier = model_tier
+        self.listen_key: typing.Optional[str] = None
+        self._decode_struct = None
+        if model_tier == ModelTier.STRUCT:
+            from cpro.models.structs import decode_stream_data
+            self._decode_struct = decode_stream_data
+
+    def _make_http_client(self, credentials: APICredentials) -> HTTPClient:
+        return AsyncIOHTTPClient(credentials)
+
+    def _decode(self, line: typing.Union[str, bytes]) -> typing.Tuple[UserStreamData, int, int]:
+        """
+        :return: A tuple of the decoded event, and the times (`time_ns()`) it was received and decoded at
+        """
+        received_ns = time_ns()
+        if self.recorder:
+            self.recorder.record(line, received_ns)
+        if self._decode_struct:
+            event = self._decode_struct(line)
+        else:
+            with decode_options(self.decode_options):
+                event = unmarshal_stream_data(loads(line))
+        return event, received_ns, time_ns()
+
+    def _observe(self, event: UserStreamData, received_ns: int, decoded_ns: int) -> None:
+        if self.metrics:
+            self.metrics.observe(event, received_ns, decoded_ns)
+
+    def _handed_off(self, event: UserStreamData, decoded_ns: int) -> None:
+        # the consumer is done with the event once it asks for the next one
+        if self.metrics:
+            self.metrics.observe_handoff(event, decoded_ns, time_ns())
+
+    def _stream_url(self) -> str:
+        return f"{BASE_WS_URL}/openapi/ws/{self.listen_key}"
 
 
 class KeepAliveThread(threading.Thread):
-    def __init__(self, *args, client_session: requests.Session, interval: int, listen_key: str, **kwargs):
-        self.client_session = client_session
+    def __init__(self, *args, http_client: BlockingHTTPClient, interval: int, listen_key: str, **kwargs):
+        self.http_client = http_client
         self.interval = interval
         self.listen_key = listen_key
         self.sleeper = threading.Event()
@@ -63,9 +121,11 @@ class KeepAliveThread(threading.Thread):
             if self.finished:
                 break  # don't send a keepalive after killing to keep it clean
 
-            self.client_session.put(f"{BASE_URL}/openapi/v1/userDataStream", params={
-                "listenKey": self.listen_key
-            })
+            try:
+                APIEndpoints.KEEPALIVE_LISTEN_KEY.execute(self.http_client, ListenKeyRequest(self.listen_key))
+            except Exception as e:
+                # the next keepalive may still make it before the listen key expires
+                _logger.warning("Listen key keepalive failed", exc_info=e)
 
     def stop(self) -> None:
         self.finished = True
@@ -73,28 +133,30 @@ class KeepAliveThread(threading.Thread):
 
 
 class BlockingSSEClient(SSEClient):
-    def __init__(self, *, api_key: str, keepalive_interval: int = 30 * 60):
-        super().__init__(api_key=api_key, keepalive_interval=keepalive_interval)
+    def __init__(
+            self,
+            *,
+            api_key: typing.Optional[str] = None,
+            http_client: typing.Optional[BlockingHTTPClient] = None,
+            keepalive_interval: int = 30 * 60,
+            recorder: typing.Optional[FrameRecorder] = None,
+            metrics: typing.Optional[LatencyMetrics] = None,
+            decode_options: typing.Optional[DecodeOptions] = None,
+            model_tier: ModelTier = ModelTier.DATACLASS
+    ):
+        super().__init__(
+            api_key=api_key, http_client=http_client, keepalive_interval=keepalive_interval, recorder=recorder,
+            metrics=metrics, decode_options=decode_options, model_tier=model_tier
+        )
         self.keepalive_task: typing.Optional[KeepAliveThread] = None
 
-    def send_keepalive(self, interval: int, sleeper: threading.Event):
-        while True:
-            sleeper.wait(timeout=interval)
-            self.client_session.put(f"{BASE_URL}/openapi/v1/userDataStream", params={
-                "listenKey": self.listen_key
-            })
+    def _make_http_client(self, credentials: APICredentials) -> HTTPClient:
+        return BlockingHTTPClient(credentials)
 
     def __enter__(self):
-        self.client_session = requests.Session()
-        self.client_session.headers = self._make_headers()
-
-        r = self.client_session.post(f"{BASE_URL}/openapi/v1/userDataStream")
-        data = r.json()
-        if data and "code" in data and "msg" in data:
-            raise CoinsAPIException(data["code"], data["msg"])
-        self.listen_key = data["listenKey"]
+        self.listen_key = APIEndpoints.CREATE_LISTEN_KEY.execute(self.http_client, CreateListenKeyRequest()).listenKey
         self.keepalive_task = KeepAliveThread(
-            client_session=self.client_session,
+            http_client=self.http_client,
             interval=self.keepalive_interval,
             listen_key=self.listen_key
         )
@@ -105,51 +167,74 @@ class BlockingSSEClient(SSEClient):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.keepalive_task.stop()
         self.keepalive_task.join()
-        self.client_session.delete(f"{BASE_URL}/openapi/v1/userDataStream", params={
-            "listenKey": self.listen_key
-        })
-
-        self.client_session.close()
+        APIEndpoints.CLOSE_LISTEN_KEY.execute(self.http_client, ListenKeyRequest(self.listen_key))
 
     def __iter__(self) -> typing.Iterator[UserStreamData]:
-        with sync_client.connect(f"{BASE_WS_URL}/openapi/ws/{self.listen_key}") as c:
+        with sync_client.connect(self._stream_url()) as c:
             for line in c:
-                yield unmarshal_stream_data(json.loads(line))
+                event, received_ns, decoded_ns = self._decode(line)
+                self._observe(event, received_ns, decoded_ns)
+                yield event
+                self._handed_off(event, decoded_ns)
 
 
 class AsyncSSEClient(SSEClient):
-    def __init__(self, *, api_key: str, keepalive_interval: int = 30 * 60):
-        super().__init__(api_key=api_key, keepalive_interval=keepalive_interval)
+    def __init__(
+            self,
+            *,
+            api_key: typing.Optional[str] = None,
+            http_client: typing.Optional[AsyncIOHTTPClient] = None,
+            keepalive_interval: int = 30 * 60,
+            recorder: typing.Optional[FrameRecorder] = None,
+            metrics: typing.Optional[LatencyMetrics] = None,
+            decode_options: typing.Optional[DecodeOptions] = None,
+            model_tier: ModelTier = ModelTier.DATACLASS
+    ):
+        super().__init__(
+            api_key=api_key, http_client=http_client, keepalive_interval=keepalive_interval, recorder=recorder,
+            metrics=metrics, decode_options=decode_options, model_tier=model_tier
+        )
         self.keepalive_task: typing.Optional[asyncio.Task] = None
 
     async def send_keepalive(self, interval):
         while True:
             await asyncio.sleep(interval)
-            await self.client_session.put(f"{BASE_URL}/openapi/v1/userDataStream", params={
-                "listenKey": self.listen_key
-            })
+            try:
+                await APIEndpoints.KEEPALIVE_LISTEN_KEY.execute_async(
+                    self.http_client, ListenKeyRequest(self.listen_key)
+                )
+            except Exception as e:
+                # the next keepalive may still make it before the listen key expires
+                _logger.warning("Listen key keepalive failed", exc_info=e)
 
     async def __aenter__(self):
-        self.client_session = aiohttp.ClientSession(headers=self._make_headers())
-
-        async with self.client_session.post(f"{BASE_URL}/openapi/v1/userDataStream") as r:
-            data = await r.json()
-            if data and "code" in data and "msg" in data:
-                raise CoinsAPIException(data["code"], data["msg"])
-            self.listen_key = data["listenKey"]
+        if self._owns_http_client:
+            # one pooled session for creating, renewing and closing the listen key
+            await self.http_client.__aenter__()
+        try:
+            self.listen_key = (await APIEndpoints.CREATE_LISTEN_KEY.execute_async(
+                self.http_client, CreateListenKeyRequest()
+            )).listenKey
+        except BaseException:
+            if self._owns_http_client:
+                await self.http_client.close()
+            raise
         self.keepalive_task = asyncio.create_task(self.send_keepalive(self.keepalive_interval))
 
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         self.keepalive_task.cancel()
-        await self.client_session.delete(f"{BASE_URL}/openapi/v1/userDataStream", params={
-            "listenKey": self.listen_key
-        })
-
-        await self.client_session.close()
+        try:
+            await APIEndpoints.CLOSE_LISTEN_KEY.execute_async(self.http_client, ListenKeyRequest(self.listen_key))
+        finally:
+            if self._owns_http_client:
+                await self.http_client.close()
 
     async def __aiter__(self) -> typing.AsyncIterator[UserStreamData]:
-        async with async_client.connect(f"{BASE_WS_URL}/openapi/ws/{self.listen_key}") as c:
+        async with async_client.connect(self._stream_url()) as c:
             async for line in c:
-                yield unmarshal_stream_data(json.loads(line))
+                event, received_ns, decoded_ns = self._decode(line)
+                self._observe(event, received_ns, decoded_ns)
+                yield event
+                self._handed_off(event, decoded_ns)
@@ -0,0 +1,164 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import dataclasses
+import re
+import typing
+
+from cpro.models.lazy import lazy
+from cpro.models.options import get_decode_options
+from cpro.models.rest.response import TResponsePayload
+
+T = typing.TypeVar("T")
+
+_STRUCTURE = re.compile(rb'[\[\]{}",]')
+_STRING_END = re.compile(rb'["\\]')
+_WHITESPACE = b" \t\r\n"
+
+
+class JSONArraySplitter:
+    """
+    Splits the elements of a top-level JSON array out of its bytes as they arrive, leaving the parsing of each element
+    to the codec. Only the element being received is buffered. Any other JSON document is buffered whole, see `close`.
+
+    EX: `for element in splitter.feed(chunk): handle(loads(element))`
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+        # where the element being received starts, right after the `[` or `,` before it
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+        self.is_array: typing.Optional[bool] = None
+        self.done = False
+
+    def feed(self, chunk: bytes) -> typing.List[bytes]:
+        """
+        :return: The elements completed by `chunk`, still encoded
+        """
+        self._buffer += chunk
+        if self.is_array is None:
+            stripped = self._buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                return []
+            self.is_array = stripped[:1] == b"["
+        if not self.is_array or self.done:
+            return []
+
+        elements = []
+        buffer, position = self._buffer, self._position
+        while True:
+            if self._in_string:
+                match = _STRING_END.search(buffer, position)
+                if match is None:
+                    position = len(buffer)
+                    break
+                position = match.end()
+                if match.group() == b"\\":
+                    if position == len(buffer):
+                        position -= 1  # the escaped byte is yet to arrive
+                        break
+                    position += 1
+                else:
+                    self._in_string = False
+                continue
+
+            match = _STRUCTURE.search(buffer, position)
+            if match is None:
+                position = len(buffer)
+                break
+            token, position = match.group(), match.end()
+            if token == b'"':
+                self._in_string = True
+            elif token in b"[{":
+                self._depth += 1
+                if self._depth == 1:
+                    self._start = position
+            elif token in b"]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    element = bytes(buffer[self._start:position - 1]).strip(_WHITESPACE)
+                    if element:
+                        elements.append(element)
+                    self.done = True
+                    break
+            elif self._depth == 1:  # a `,` between elements
+                elements.append(bytes(buffer[self._start:position - 1]).strip(_WHITESPACE))
+                self._start = position
+
+        # drops what was already split out, keeping the memory flat
+        consumed = len(buffer) if self.done else min(self._start, position)
+        del buffer[:consumed]
+        self._start -= consumed
+        self._position = position - consumed
+        return elements
+
+    def close(self) -> typing.Optional[bytes]:
+        """
+        :return: The whole document when it was not an array, `None` otherwise
+        """
+        if self.is_array:
+            if not self.done:
+                raise ValueError("The JSON array ended early")
+            return None
+        return bytes(self._buffer)
+
+
+def element_decoder(response_cls: typing.Type[TResponsePayload]) -> typing.Callable[[typing.Any], typing.Any]:
+    """
+    :return: A function decoding a single element of the array `response_cls` wraps, as `response_cls` would
+    """
+    hints = typing.get_type_hints(response_cls)
+    lists = [_ for _ in dataclasses.fields(response_cls) if typing.get_origin(hints[_.name]) is list]
+    if len(lists) != 1 or len(dataclasses.fields(response_cls)) != 1:
+        raise ValueError(f"{response_cls.__name__} does not wrap a JSON array")
+    items = lists[0]
+    decoder = items.metadata.get("dataclasses_json", {}).get("decoder")
+    if decoder is not None:
+        return lambda element: decoder([element])[0]
+
+    element_cls = typing.get_args(hints[items.name])[0]
+
+    def decode(element: typing.Any) -> typing.Any:
+        if get_decode_options().lazy_responses:
+            return lazy(element_cls).from_dict(element)
+        return element_cls.from_dict(element)
+
+    return decode
+
+
+def items(response: TResponsePayload) -> list:
+    """
+    :return: The elements of a response wrapping a JSON array
+    """
+    return getattr(response, dataclasses.fields(response)[0].name)
+
+
+def batched(elements: typing.Iterable[T], size: int) -> typing.Iterator[typing.List[T]]:
+    batch = []
+    for element in elements:
+        batch.append(element)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,141 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import time
+import typing
+from datetime import datetime
+
+from cpro.client.deadline import recv_window, remaining
+from cpro.client.rest import APICredentials
+from cpro.exception import DeadlineExceeded
+from cpro.models.fields import Number, encode_number, to_epoch_millis
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import OrderSides, OrderTypes, TimeInForce, AntiSelfTradingBehaviours, OrderResponseTypes
+from cpro.models.rest.request import NewOrderRequest
+
+# filled on every send, in the order `NewOrderRequest` encodes them
+_VARIABLE_FIELDS = ("timestamp", "quantity", "price", "newClientOrderId", "recvWindow")
+_BLOCK_SIZE = hashlib.sha256().block_size
+
+
+class OrderTemplate:
+    """
+    A `NewOrderRequest` with its fixed fields (symbol, side, type, timeInForce, stpFlag and newOrderRespType) encoded
+    once, for quoting the same kind of order many times over. `encode` only fills the price, quantity, timestamp,
+    client order id and recvWindow in, and signs with HMAC-SHA256 states keyed (and fed the fixed prefix of the query
+    string) in advance.
+
+    EX: `template = OrderTemplate(credentials, "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT_MAKER)`, then
+    `client.send_order(template, price=..., quantity=...)`
+    """
+
+    def __init__(
+            self,
+            credentials: APICredentials,
+            symbol: str,
+            side: OrderSides,
+            type: OrderTypes,
+            *,
+            timeInForce: typing.Optional[TimeInForce] = None,
+            stpFlag: typing.Optional[AntiSelfTradingBehaviours] = None,
+            newOrderRespType: typing.Optional[OrderResponseTypes] = None,
+            recvWindow: typing.Optional[int] = None
+    ):
+        if credentials.api_secret is None:
+            raise ValueError("API Secret required to sign orders!")
+        # the order every send would otherwise build, also picks the response of the order type
+        self.request = NewOrderRequest(
+            symbol, side, type, timestamp=None, timeInForce=timeInForce, stpFlag=stpFlag,
+            newOrderRespType=newOrderRespType, recvWindow=recvWindow
+        )
+        self.headers = {"Accept": "application/json", "X-COINS-APIKEY": credentials.api_key}
+
+        fixed = self.request.to_encoded().raw_params
+        prefix, variable, lead = [], [], ""
+        for name in NewOrderRequest.__dataclass_fields__:
+            if name in _VARIABLE_FIELDS:
+                variable.append((lead, f"&{name}="))
+                lead = ""
+            elif name in fixed:
+                if variable:
+                    lead += f"&{name}={fixed[name]}"
+                else:
+                    prefix.append(f"{name}={fixed[name]}")
+        self._prefix = "&".join(prefix)
+        # `timestamp` comes first and is always sent, so its key is part of the prefix
+        self._prefix += "&timestamp="
+        variable[0] = (variable[0][0], "")
+        self._variable = variable
+        self._tail = lead
+
+        key = credentials.api_secret.encode()
+        if len(key) > _BLOCK_SIZE:
+            key = hashlib.sha256(key).digest()
+        key = key.ljust(_BLOCK_SIZE, b"\0")
+        self._inner = hashlib.sha256(bytes(byte ^ 0x36 for byte in key))
+        self._inner.update(self._prefix.encode())
+        self._outer = hashlib.sha256(bytes(byte ^ 0x5C for byte in key))
+
+    def encode(
+            self,
+            *,
+            price: typing.Optional[typing.Union[Number, str]] = None,
+            quantity: typing.Optional[typing.Union[Number, str]] = None,
+            client_order_id: typing.Optional[str] = None,
+            timestamp: typing.Optional[typing.Union[datetime, int]] = None
+    ) -> str:
+        """
+        Within a `cpro.client.deadline.deadline` block the `recvWindow` of the template is shrunk so that the exchange
+        drops the order once the deadline has passed, as `do_request` does for `NewOrderRequest`s.
+
+        :param timestamp: Epoch milliseconds (or a `datetime`), now by default
+        :return: The signed query string of the order
+        :raises DeadlineExceeded: When the deadline has already passed
+        """
+        timestamp = time.time_ns() // 1_000_000 if timestamp is None else to_epoch_millis(timestamp)
+        window = self.request.recvWindow
+        if remaining() is not None:
+            left = recv_window(datetime.fromtimestamp(timestamp / 1000))
+            if left <= 0:
+                raise DeadlineExceeded(APIEndpoints.NEW_ORDER.value.endpoint)
+            if window is None or left < window:
+                window = left
+        values = (
+            str(timestamp),
+            quantity if quantity is None or isinstance(quantity, str) else encode_number(quantity),
+            price if price is None or isinstance(price, str) else encode_number(price),
+            client_order_id,
+            None if window is None else str(window)
+        )
+        parts = []
+        for (lead, key), value in zip(self._variable, values):
+            parts.append(lead)
+            if value is not None:
+                parts.append(key)
+                parts.append(value)
+        parts.append(self._tail)
+        variable = "".join(parts)
+
+        inner = self._inner.copy()
+        inner.update(variable.encode())
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        return f"{self._prefix}{variable}&signature={outer.hexdigest()}"
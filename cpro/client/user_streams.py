@@ -0,0 +1,222 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import heapq
+import time
+import typing
+
+import aiohttp
+from websockets import client as async_client
+from websockets.exceptions import ConnectionClosed
+
+from cpro.client.metrics import LatencyMetrics
+from cpro.client.rest import APICredentials, AsyncIOHTTPClient, HTTPClient
+from cpro.client.sse import SSEClient, BASE_WS_URL
+from cpro.exception import CoinsAPIException
+from cpro.models.options import DecodeOptions, ModelTier
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.request import CreateListenKeyRequest, ListenKeyRequest
+from cpro.models.ud_stream import UserStreamData
+
+# https://coins-docs.github.io/errors/#11xx---request-issues
+INVALID_LISTEN_KEY = -1125
+_LISTEN_KEY_EXPIRED = "listenKeyExpired"
+
+
+class AccountEvent(typing.NamedTuple):
+    account: str
+    event: UserStreamData
+
+
+class _AccountStream:
+    def __init__(self, account: str, api_key: str):
+        self.account = account
+        self.api_key = api_key
+        self.client: typing.Optional[SSEClient] = None
+        self.listen_key: typing.Optional[str] = None
+        self.websocket = None
+        self.reader: typing.Optional[asyncio.Task] = None
+        self.rotations = 0
+        self.failed_renewals = 0
+
+
+class AsyncUserDataStreamManager:
+    """
+    Follows the user data streams of many accounts at once, merged into a single async iterator of `AccountEvent`s.
+
+    Every listen key is renewed by one scheduler through the `USER_STREAM` endpoints, over one pooled HTTP session,
+    the renewals being staggered across the `keepalive_interval` instead of all firing at once. Failed renewals are
+    retried with an exponential backoff, and a listen key the exchange no longer knows (or reports as expired on the
+    stream) is replaced by a new one.
+
+    EX: `async with AsyncUserDataStreamManager({"main": key, "sub-1": sub_key}) as streams:
+    async for account, event in streams: ...`
+    """
+    API_BASE_URL = HTTPClient.API_BASE_URL
+    BASE_WS_URL = BASE_WS_URL
+
+    def __init__(
+            self,
+            api_keys: typing.Mapping[str, str],
+            *,
+            keepalive_interval: float = 30 * 60,
+            max_retries: int = 3,
+            retry_delay: float = 1,
+            reconnect_delay: float = 5,
+            buffer_size: int = 0,
+            metrics: typing.Optional[LatencyMetrics] = None,
+            decode_options: typing.Optional[DecodeOptions] = None,
+            model_tier: ModelTier = ModelTier.DATACLASS
+    ):
+        """
+        :param api_keys: The api key of every account, by the name their events are tagged with
+        :param buffer_size: Events buffered before the streams wait on the consumer, `0` for no limit
+        """
+        self.keepalive_interval = keepalive_interval
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.reconnect_delay = reconnect_delay
+        self.streams: typing.Dict[str, _AccountStream] = {
+            account: _AccountStream(account, api_key) for account, api_key in api_keys.items()
+        }
+        self._client_options = dict(
+            keepalive_interval=int(keepalive_interval), metrics=metrics, decode_options=decode_options,
+            model_tier=model_tier
+        )
+        self._session: typing.Optional[aiohttp.ClientSession] = None
+        self._events: asyncio.Queue = asyncio.Queue(buffer_size)
+        self._scheduler: typing.Optional[asyncio.Task] = None
+
+    async def _with_retries(self, call: typing.Callable[[], typing.Awaitable]):
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except CoinsAPIException as e:
+                if e.code == INVALID_LISTEN_KEY or attempt >= self.max_retries:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+                if attempt >= self.max_retries:
+                    raise
+            await asyncio.sleep(self.retry_delay * 2 ** attempt)
+            attempt += 1
+
+    async def _open(self, stream: _AccountStream) -> None:
+        response = await self._with_retries(lambda: APIEndpoints.CREATE_LISTEN_KEY.execute_async(
+            stream.client.http_client, CreateListenKeyRequest()
+        ))
+        stream.listen_key = response.listenKey
+
+    async def rotate(self, stream: _AccountStream) -> None:
+        """
+        Replaces the listen key of `stream`, its websocket reconnects with the new one.
+        """
+        await self._open(stream)
+        stream.rotations += 1
+        if stream.websocket is not None:
+            await stream.websocket.close()
+
+    async def _renew(self, stream: _AccountStream) -> None:
+        try:
+            await self._with_retries(lambda: APIEndpoints.KEEPALIVE_LISTEN_KEY.execute_async(
+                stream.client.http_client, ListenKeyRequest(stream.listen_key)
+            ))
+        except CoinsAPIException as e:
+            if e.code != INVALID_LISTEN_KEY:
+                raise
+            await self.rotate(stream)
+
+    async def _schedule_renewals(self) -> None:
+        now = time.monotonic()
+        # staggered evenly across the interval, so renewals never burst
+        due = [
+            (now + self.keepalive_interval * (index + 1) / len(self.streams), account)
+            for index, account in enumerate(self.streams)
+        ]
+        heapq.heapify(due)
+        while due:
+            due_at, account = heapq.heappop(due)
+            await asyncio.sleep(max(0.0, due_at - time.monotonic()))
+            stream = self.streams[account]
+            try:
+                await self._renew(stream)
+                stream.failed_renewals = 0
+            except (CoinsAPIException, aiohttp.ClientError, asyncio.TimeoutError, OSError):
+                # retried again on the next round, the key usually outlives a single missed renewal
+                stream.failed_renewals += 1
+            heapq.heappush(due, (due_at + self.keepalive_interval, account))
+
+    async def _read(self, stream: _AccountStream) -> None:
+        while True:
+            rotations = stream.rotations
+            try:
+                async with async_client.connect(f"{self.BASE_WS_URL}/openapi/ws/{stream.listen_key}") as websocket:
+                    stream.websocket = websocket
+                    async for line in websocket:
+                        try:
+                            event, received_ns, decoded_ns = stream.client._decode(line)
+                        except ValueError:
+                            text = line if isinstance(line, str) else line.decode()
+                            if _LISTEN_KEY_EXPIRED not in text:
+                                raise
+                            await self.rotate(stream)
+                            break
+                        stream.client._observe(event, received_ns, decoded_ns)
+                        await self._events.put(AccountEvent(stream.account, event))
+            except (ConnectionClosed, OSError):
+                pass
+            except Exception as e:
+                await self._events.put(AccountEvent(stream.account, e))
+                return
+            finally:
+                stream.websocket = None
+            if stream.rotations == rotations:
+                await asyncio.sleep(self.reconnect_delay)  # a new listen key reconnects at once
+
+    async def __aenter__(self):
+        # one connection pool for every account
+        self._session = aiohttp.ClientSession()
+        for stream in self.streams.values():
+            http_client = AsyncIOHTTPClient(APICredentials(stream.api_key), session=self._session)
+            http_client.API_BASE_URL = self.API_BASE_URL
+            stream.client = SSEClient(http_client=http_client, **self._client_options)
+        await asyncio.gather(*(self._open(stream) for stream in self.streams.values()))
+        for stream in self.streams.values():
+            stream.reader = asyncio.create_task(self._read(stream))
+        self._scheduler = asyncio.create_task(self._schedule_renewals())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        tasks = [self._scheduler, *(stream.reader for stream in self.streams.values())]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*(APIEndpoints.CLOSE_LISTEN_KEY.execute_async(
+            stream.client.http_client, ListenKeyRequest(stream.listen_key)
+        ) for stream in self.streams.values()), return_exceptions=True)
+        await self._session.close()
+
+    async def __aiter__(self) -> typing.AsyncIterator[AccountEvent]:
+        while True:
+            account_event = await self._events.get()
+            if isinstance(account_event.event, Exception):
+                raise account_event.event
+            yield account_event
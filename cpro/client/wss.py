@@ -22,12 +22,17 @@ import asyncio
 import typing
 from abc import abstractmethod, ABC
 from datetime import datetime
-from time import time
+from time import time, time_ns
 
 from websockets.exceptions import ConnectionClosedOK
 from websockets.sync import client as sync_client
 from websockets import client as async_client
 
+from cpro.client.metrics import LatencyMetrics
+from cpro.client.recorder import FrameRecorder
+from cpro.codec import loads
+from cpro.models.fields import to_epoch_millis
+from cpro.models.options import DecodeOptions, decode_options, ModelTier, RawMode
 from cpro.models.ws_stream import WSFrame, PingRequestFrame, unmarshal_frame, PingResponseFrame, TRPCRequestFrame, \
     TRPCResponseFrame
 
@@ -35,8 +40,25 @@ from cpro.models.ws_stream import WSFrame, PingRequestFrame, unmarshal_frame, Pi
 class WSClient(ABC):
     BASE_URL = "wss://wsapi.pro.coins.ph/openapi/quote/ws/v3/"
 
-    def __init__(self, stream: str):
+    def __init__(
+            self,
+            stream: str,
+            *,
+            recorder: typing.Optional[FrameRecorder] = None,
+            metrics: typing.Optional[LatencyMetrics] = None,
+            decode_options: typing.Optional[DecodeOptions] = None,
+            model_tier: ModelTier = ModelTier.DATACLASS
+    ):
         self.stream = stream
+        self.recorder = recorder
+        self.metrics = metrics
+        self.decode_options = decode_options
+        self.model_tier = model_tier
+        self._decode_struct = None
+        if model_tier == ModelTier.STRUCT:
+            from cpro.models.structs import decode_frame
+            self._decode_struct = decode_frame
+        self._received_ns = 0
         self._websocket = None
         self._awaiting_resolution: typing.Dict[int, typing.Tuple[
             typing.Type[TRPCResponseFrame], typing.Callable[[TRPCResponseFrame], None]
@@ -45,14 +67,38 @@ class WSClient(ABC):
         self._last_ping = time()
 
     @abstractmethod
-    def listen(self):
+    def listen(self, raw: typing.Optional[RawMode] = None):
         ...
 
+    def _record_received(self, data: str) -> None:
+        self._received_ns = time_ns()
+        if self.recorder:
+            self.recorder.record(data, self._received_ns)
+
+    def _record_clock_offset(self, response: PingResponseFrame, sent_ns: int) -> None:
+        if self.metrics:
+            self.metrics.update_clock_offset(to_epoch_millis(response.pong), sent_ns, self._received_ns)
+
+    def _unmarshal(self, json_data: str, *args) -> WSFrame:
+        if self._decode_struct and not args:
+            frame = self._decode_struct(json_data)
+            if frame is not None:
+                return frame
+        with decode_options(self.decode_options):
+            return unmarshal_frame(json_data, *args)
+
+    def _listened(self, data: str, raw: typing.Optional[RawMode]) -> typing.Union[WSFrame, dict, str]:
+        if raw == RawMode.BYTES:
+            return data
+        if raw == RawMode.JSON:
+            return loads(data)
+        return self._unmarshal(data)
+
     def _get_rpc_callbacks(self, json_data: str) -> typing.Generator[typing.Callable, WSFrame, None]:
         resolved_keys = []
         for request_id, (response_type, callback) in self._awaiting_resolution.items():
             try:
-                parsed = unmarshal_frame(json_data, response_type, request_id)
+                parsed = self._unmarshal(json_data, response_type, request_id)
                 yield callback, parsed
             except (KeyError, RuntimeError, ValueError):
                 continue
@@ -72,31 +118,38 @@ class BlockingWSClient(WSClient):
 
     def __exit__(self, exc_type, exc_value, traceback):
         while len(self._awaiting_resolution) > 0:
-            data = self._websocket.recv(PING_TIME)  # ensure ping every 5 minutes
+            data = self._recv(PING_TIME)  # ensure ping every 5 minutes
             self._handle_rpc_response(data)
             self._ensure_ping()
         self._websocket.close()
 
+    def _recv(self, timeout: float) -> str:
+        data = self._websocket.recv(timeout)
+        self._record_received(data)
+        return data
+
     def _send_payload(self, frame: WSFrame) -> None:
         self._websocket.send(frame.to_json())
 
     def _recv_payload(self, timeout: float) -> WSFrame:
-        return unmarshal_frame(self._websocket.recv(timeout))
+        return self._unmarshal(self._recv(timeout))
 
     def _ping_roundtrip(self) -> typing.Tuple[datetime, float]:
         """
         :return: A tuple of the server's time and the latency (in seconds)
         """
+        sent_ns = time_ns()
         self._send_payload(request := PingRequestFrame())
         while True:
-            data = self._websocket.recv(PING_TIME)
+            data = self._recv(PING_TIME)
             try:
-                response = unmarshal_frame(data)
+                response = self._unmarshal(data)
             except (KeyError, RuntimeError, ValueError):
                 continue
             if not self._handle_rpc_response(data) and not isinstance(response, PingResponseFrame):
                 continue
-            return response.pong, response.pong.timestamp() - request.ping.timestamp()
+            self._record_clock_offset(response, sent_ns)
+            return response.pong, (to_epoch_millis(response.pong) - to_epoch_millis(request.ping)) / 1000
 
     def _handle_rpc_response(self, json_data: str) -> bool:
         handled = False
@@ -123,7 +176,7 @@ class BlockingWSClient(WSClient):
         while attempts:
             try:
                 server_time, latency = self._ping_roundtrip()
-                self._last_ping = server_time.timestamp()
+                self._last_ping = to_epoch_millis(server_time) / 1000
                 break
             except TimeoutError as e:
                 attempts -= 1
@@ -131,14 +184,26 @@ class BlockingWSClient(WSClient):
                     self._websocket.close()
                     raise e
 
-    def listen(self) -> typing.Generator[str, None, None]:
+    def listen(self, raw: typing.Optional[RawMode] = None) -> typing.Generator[WSFrame, None, None]:
+        """
+        :param raw: Yield the frames as parsed JSON or as the text received rather than as models, raw frames are not
+        observed by `metrics`
+        """
+        metrics = self.metrics if raw in (None, RawMode.MODEL) else None
         try:
             while True:
-                data = self._websocket.recv(PING_TIME)  # ensure ping every 5 minutes
+                data = self._recv(PING_TIME)  # ensure ping every 5 minutes
 
                 # unhandled responses go back to the listener
                 if not self._handle_rpc_response(data):
-                    yield unmarshal_frame(data)
+                    frame = self._listened(data, raw)
+                    decoded_ns = time_ns()
+                    if metrics:
+                        metrics.observe(frame, self._received_ns, decoded_ns)
+                    yield frame
+                    if metrics:
+                        # the consumer is done with the frame once it asks for the next one
+                        metrics.observe_handoff(frame, decoded_ns, time_ns())
 
                 self._ensure_ping()
         except ConnectionClosedOK:
@@ -167,7 +232,7 @@ class AsyncIOWSClient(WSClient):
         while attempts:
             try:
                 server_time, latency = await self._ping_roundtrip()
-                self._last_ping = server_time.timestamp()
+                self._last_ping = to_epoch_millis(server_time) / 1000
                 break
             except TimeoutError as e:
                 attempts -= 1
@@ -179,22 +244,29 @@ class AsyncIOWSClient(WSClient):
         """
         :return: A tuple of the server's time and the latency (in seconds)
         """
+        sent_ns = time_ns()
         await self._send_payload(request := PingRequestFrame())
         while True:
-            data = await asyncio.wait_for(self._websocket.recv(), timeout=PING_TIME)  # ensure ping every 5 minutes
+            data = await self._recv(PING_TIME)  # ensure ping every 5 minutes
             try:
-                response = unmarshal_frame(data)
+                response = self._unmarshal(data)
             except (KeyError, RuntimeError, ValueError):
                 continue
             if not await self._handle_rpc_response(data) and not isinstance(response, PingResponseFrame):
                 continue
-            return response.pong, response.pong.timestamp() - request.ping.timestamp()
+            self._record_clock_offset(response, sent_ns)
+            return response.pong, (to_epoch_millis(response.pong) - to_epoch_millis(request.ping)) / 1000
+
+    async def _recv(self, timeout: float) -> str:
+        data = await asyncio.wait_for(self._websocket.recv(), timeout=timeout)
+        self._record_received(data)
+        return data
 
     async def _send_payload(self, frame: WSFrame) -> None:
         await self._websocket.send(frame.to_json())
 
     async def _recv_payload(self, timeout: float) -> WSFrame:
-        return unmarshal_frame(await asyncio.wait_for(self._websocket.recv(), timeout=timeout))
+        return self._unmarshal(await self._recv(timeout))
 
     async def rpc_request(
             self,
@@ -209,19 +281,31 @@ class AsyncIOWSClient(WSClient):
 
     async def __aexit__(self, exc_type, exc_value, traceback):
         while len(self._awaiting_resolution) > 0:
-            data = await asyncio.wait_for(self._websocket.recv(), timeout=PING_TIME)
+            data = await self._recv(PING_TIME)
             await self._handle_rpc_response(data)
             await self._ensure_ping()
         await self._websocket.close()
 
-    async def listen(self) -> typing.AsyncGenerator[str, None]:
+    async def listen(self, raw: typing.Optional[RawMode] = None) -> typing.AsyncGenerator[WSFrame, None]:
+        """
+        :param raw: Yield the frames as parsed JSON or as the text received rather than as models, raw frames are not
+        observed by `metrics`
+        """
+        metrics = self.metrics if raw in (None, RawMode.MODEL) else None
         try:
             while True:
-                data = await asyncio.wait_for(self._websocket.recv(), timeout=PING_TIME)  # ensure ping every 5 minutes
+                data = await self._recv(PING_TIME)  # ensure ping every 5 minutes
 
                 # unhandled responses go back to the listener
                 if not await self._handle_rpc_response(data):
-                    yield unmarshal_frame(data)
+                    frame = self._listened(data, raw)
+                    decoded_ns = time_ns()
+                    if metrics:
+                        metrics.observe(frame, self._received_ns, decoded_ns)
+                    yield frame
+                    if metrics:
+                        # the consumer is done with the frame once it asks for the next one
+                        metrics.observe_handoff(frame, decoded_ns, time_ns())
 
                 await self._ensure_ping()
         except ConnectionClosedOK:
@@ -0,0 +1,184 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+import typing
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+
+from cpro.models.fields import encode_number
+
+# Every JSON document the library parses or serialises goes through the codec returned by `get_codec`, which picks
+# the fastest backend installed (orjson, then msgspec, then the standard library). The `CPRO_JSON` environment
+# variable or `set_codec` forces a specific one.
+
+JSONInput = typing.Union[str, bytes, bytearray, memoryview]
+
+
+def _default(value: typing.Any) -> typing.Any:
+    if isinstance(value, Decimal):
+        return encode_number(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    if hasattr(value, "to_dict"):
+        return value.to_dict(encode_json=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _plain_decimals(value: typing.Any) -> typing.Any:
+    if isinstance(value, Decimal):
+        return encode_number(value)
+    if isinstance(value, dict):
+        return {key: _plain_decimals(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain_decimals(item) for item in value]
+    return value
+
+
+class JSONCodec(ABC):
+    name: str
+
+    @abstractmethod
+    def loads(self, data: JSONInput) -> typing.Any:
+        """
+        Parses a JSON document, straight from the received bytes when possible (skipping the UTF-8 decode).
+        """
+        ...
+
+    @abstractmethod
+    def dumps_bytes(self, value: typing.Any) -> bytes:
+        """
+        Serialises `value` into compact UTF-8 encoded JSON. `Decimal`, `Enum` and models are supported on top of the
+        JSON types.
+        """
+        ...
+
+    def dumps(self, value: typing.Any) -> str:
+        return self.dumps_bytes(value).decode()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class StdlibJSONCodec(JSONCodec):
+    name = "json"
+
+    def loads(self, data: JSONInput) -> typing.Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    def dumps(self, value: typing.Any) -> str:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default)
+
+    def dumps_bytes(self, value: typing.Any) -> bytes:
+        return self.dumps(value).encode()
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+        # handled by `_default` instead, to serialise the same way as the other backends
+        self._options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def loads(self, data: JSONInput) -> typing.Any:
+        return self._loads(data)
+
+    def dumps_bytes(self, value: typing.Any) -> bytes:
+        return self._dumps(value, default=_default, option=self._options)
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder(enc_hook=_default, decimal_format="string")
+
+    def loads(self, data: JSONInput) -> typing.Any:
+        return self._decoder.decode(data)
+
+    def dumps_bytes(self, value: typing.Any) -> bytes:
+        # `Decimal` is serialised natively (its `str()`, which may use an exponent) without going through `enc_hook`
+        return self._encoder.encode(_plain_decimals(value))
+
+
+CODECS: typing.Dict[str, typing.Type[JSONCodec]] = {
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+    StdlibJSONCodec.name: StdlibJSONCodec,
+}
+
+_codec: typing.Optional[JSONCodec] = None
+
+
+def _detect() -> JSONCodec:
+    preferred = os.getenv("CPRO_JSON")
+    if preferred:
+        return CODECS[preferred]()
+    for codec_cls in CODECS.values():
+        try:
+            return codec_cls()
+        except ImportError:
+            continue
+    return StdlibJSONCodec()
+
+
+def get_codec() -> JSONCodec:
+    global _codec
+    if _codec is None:
+        _codec = _detect()
+    return _codec
+
+
+def set_codec(codec: typing.Union[str, JSONCodec, None]) -> JSONCodec:
+    """
+    :param codec: A codec, the name of one in `CODECS`, or `None` to detect the fastest one again
+    :return: The codec now in use
+    """
+    global _codec
+    if isinstance(codec, str):
+        codec = CODECS[codec]()
+    _codec = codec
+    return get_codec()
+
+
+def loads(data: JSONInput) -> typing.Any:
+    return get_codec().loads(data)
+
+
+def dumps(value: typing.Any) -> str:
+    return get_codec().dumps(value)
+
+
+def dumps_bytes(value: typing.Any) -> bytes:
+    return get_codec().dumps_bytes(value)
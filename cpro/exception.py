@@ -38,3 +38,9 @@ class CoinsAPIException(CProException):
         self.code = code
         self.message = message
         super().__init__(f"Received code {code}: {message}")
+
+
+class DeadlineExceeded(CProException, TimeoutError):
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        super().__init__(f"Deadline exceeded before {endpoint} could complete")
@@ -0,0 +1,229 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import struct
+import typing
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from decimal import *
+from enum import Enum
+
+from cpro.models.compact import compact, is_compact, original
+from cpro.models.fields import EpochMillis
+from cpro.models.rest.enums import WSStreamDataEventTypes, ChartIntervals, ExecutionTypes, OrderSides, OrderType, \
+    TimeInForce, OrderStatus
+from cpro.models.rest.market import MarketOrder
+from cpro.models.ud_stream import UserDataStreamEventTypes, AccountBalanceUpdateData, AccountUpdateData, \
+    BalanceUpdateData, OrderUpdateData
+from cpro.models.ws_stream import AggregateTradeData, TradeData, GraphPointData, KlineCandlestickData, \
+    IndividualSymbolMiniTickerData, IndividualSymbolTickerData, IndividualSymbolBookTickerData, PartialBookDepthData, \
+    DiffDepthData
+
+# Compact, schema-less binary encoding for decoded stream models. Every value is prefixed with a one byte tag, models
+# and enums are referenced by their index in the registries below, so both ends must run the same library version.
+#
+# The order of these registries is part of the format, only ever append to them.
+_MODELS: typing.Tuple[type, ...] = (
+    AggregateTradeData,
+    TradeData,
+    GraphPointData,
+    KlineCandlestickData,
+    IndividualSymbolMiniTickerData,
+    IndividualSymbolTickerData,
+    IndividualSymbolBookTickerData,
+    PartialBookDepthData,
+    DiffDepthData,
+    MarketOrder,
+    AccountBalanceUpdateData,
+    AccountUpdateData,
+    BalanceUpdateData,
+    OrderUpdateData,
+)
+_ENUMS: typing.Tuple[typing.Type[Enum], ...] = (
+    WSStreamDataEventTypes,
+    ChartIntervals,
+    UserDataStreamEventTypes,
+    ExecutionTypes,
+    OrderSides,
+    OrderType,
+    TimeInForce,
+    OrderStatus,
+)
+
+_MODEL_INDEX = {cls: i for i, cls in enumerate(_MODELS)}
+_ENUM_INDEX = {cls: i for i, cls in enumerate(_ENUMS)}
+_MODEL_FIELDS = {cls: tuple(f.name for f in fields(cls)) for cls in _MODELS}
+
+_NONE = b"N"
+_TRUE = b"T"
+_FALSE = b"F"
+_INT = b"q"
+_BIGINT = b"I"
+_FLOAT = b"d"
+_DECIMAL = b"M"
+_STR = b"s"
+_DATETIME = b"t"
+_EPOCH_MILLIS = b"m"
+_ENUM = b"e"
+_LIST = b"l"
+_MODEL = b"D"
+_COMPACT_MODEL = b"C"
+
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_MODEL_HEADER = struct.Struct("<BB")
+
+_I64_MIN = -(1 << 63)
+_I64_MAX = (1 << 63) - 1
+
+
+def _pack_text(buffer: bytearray, text: str) -> None:
+    encoded = text.encode()
+    buffer += _U16.pack(len(encoded))
+    buffer += encoded
+
+
+def _pack_value(buffer: bytearray, value: typing.Any) -> None:
+    # bool and EpochMillis must be checked before int, Enum before str (AutoStrEnum members are also str instances)
+    if value is None:
+        buffer += _NONE
+    elif value is True:
+        buffer += _TRUE
+    elif value is False:
+        buffer += _FALSE
+    elif isinstance(value, EpochMillis):
+        buffer += _EPOCH_MILLIS
+        buffer += _I64.pack(value)
+    elif isinstance(value, Enum):
+        buffer += _ENUM
+        buffer += _U8.pack(_ENUM_INDEX[type(value)])
+        _pack_value(buffer, value.value)
+    elif isinstance(value, int):
+        if _I64_MIN <= value <= _I64_MAX:
+            buffer += _INT
+            buffer += _I64.pack(value)
+        else:
+            buffer += _BIGINT
+            _pack_text(buffer, str(value))
+    elif isinstance(value, float):
+        buffer += _FLOAT
+        buffer += _F64.pack(value)
+    elif isinstance(value, Decimal):
+        buffer += _DECIMAL
+        _pack_text(buffer, str(value))
+    elif isinstance(value, str):
+        buffer += _STR
+        _pack_text(buffer, value)
+    elif isinstance(value, datetime):
+        buffer += _DATETIME
+        buffer += _I64.pack(int(value.timestamp() * 1000))
+    elif isinstance(value, (list, tuple)):
+        buffer += _LIST
+        buffer += _U32.pack(len(value))
+        for item in value:
+            _pack_value(buffer, item)
+    elif is_dataclass(value) and original(type(value)) in _MODEL_INDEX:
+        model_cls = original(type(value))
+        names = _MODEL_FIELDS[model_cls]
+        buffer += _COMPACT_MODEL if is_compact(type(value)) else _MODEL
+        buffer += _MODEL_HEADER.pack(_MODEL_INDEX[model_cls], len(names))
+        for name in names:
+            _pack_value(buffer, getattr(value, name))
+    else:
+        raise TypeError(f"Unable to pack value of type {type(value)}")
+
+
+def _unpack_text(view: memoryview, offset: int) -> typing.Tuple[str, int]:
+    length, = _U16.unpack_from(view, offset)
+    offset += _U16.size
+    return str(view[offset:offset + length], "utf-8"), offset + length
+
+
+def _unpack_value(view: memoryview, offset: int) -> typing.Tuple[typing.Any, int]:
+    tag = view[offset:offset + 1].tobytes()
+    offset += 1
+    if tag == _NONE:
+        return None, offset
+    if tag == _TRUE:
+        return True, offset
+    if tag == _FALSE:
+        return False, offset
+    if tag == _INT:
+        return _I64.unpack_from(view, offset)[0], offset + _I64.size
+    if tag == _BIGINT:
+        text, offset = _unpack_text(view, offset)
+        return int(text), offset
+    if tag == _FLOAT:
+        return _F64.unpack_from(view, offset)[0], offset + _F64.size
+    if tag == _DECIMAL:
+        text, offset = _unpack_text(view, offset)
+        return Decimal(text), offset
+    if tag == _STR:
+        return _unpack_text(view, offset)
+    if tag == _DATETIME:
+        return datetime.fromtimestamp(_I64.unpack_from(view, offset)[0] / 1000.0), offset + _I64.size
+    if tag == _EPOCH_MILLIS:
+        return EpochMillis(_I64.unpack_from(view, offset)[0]), offset + _I64.size
+    if tag == _ENUM:
+        enum_cls = _ENUMS[view[offset]]
+        value, offset = _unpack_value(view, offset + 1)
+        return enum_cls(value), offset
+    if tag == _LIST:
+        count, = _U32.unpack_from(view, offset)
+        offset += _U32.size
+        items = []
+        for _ in range(count):
+            item, offset = _unpack_value(view, offset)
+            items.append(item)
+        return items, offset
+    if tag == _MODEL or tag == _COMPACT_MODEL:
+        index, count = _MODEL_HEADER.unpack_from(view, offset)
+        offset += _MODEL_HEADER.size
+        values = []
+        for _ in range(count):
+            value, offset = _unpack_value(view, offset)
+            values.append(value)
+        model_cls = compact(_MODELS[index]) if tag == _COMPACT_MODEL else _MODELS[index]
+        return model_cls(*values), offset
+    raise ValueError(f"Unknown tag {tag!r} at offset {offset - 1}")
+
+
+def pack_model(model: typing.Any) -> bytes:
+    """
+    Encodes a decoded stream model (and everything nested in it) into the compact binary format.
+    """
+    if original(type(model)) not in _MODEL_INDEX:
+        raise TypeError(f"{type(model)} is not a packable model")
+    buffer = bytearray()
+    _pack_value(buffer, model)
+    return bytes(buffer)
+
+
+def unpack_model(data: typing.Union[bytes, bytearray, memoryview]) -> typing.Any:
+    """
+    Decodes a model previously encoded with `pack_model`.
+    """
+    value, offset = _unpack_value(memoryview(data), 0)
+    if offset != len(data):
+        raise ValueError(f"Trailing data after packed model ({len(data) - offset} bytes)")
+    return value
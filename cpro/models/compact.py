@@ -0,0 +1,125 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import abc
+import types
+import typing
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
+
+from dataclasses_json import DataClassJsonMixin
+
+# Slotted, frozen variants of the data models, for when many decoded objects are kept alive at once. They decode,
+# encode and compare like the models they are generated from, and pass `isinstance` checks against them.
+
+TModel = typing.TypeVar("TModel")
+
+_compact_classes: typing.Dict[type, type] = dict()
+_original_classes: typing.Dict[type, type] = dict()
+
+
+class CompactModel:
+    __slots__ = ()
+
+    dataclass_json_config = None
+    to_json = DataClassJsonMixin.to_json
+    to_dict = DataClassJsonMixin.to_dict
+    from_json = DataClassJsonMixin.__dict__["from_json"]
+    from_dict = DataClassJsonMixin.__dict__["from_dict"]
+    schema = DataClassJsonMixin.__dict__["schema"]
+
+    def __reduce__(self):
+        return _restore, (original(type(self)), tuple(getattr(self, _.name) for _ in fields(self)))
+
+
+def _restore(cls: type, values: tuple):
+    return compact(cls)(*values)
+
+
+def _is_slotted(cls: type) -> bool:
+    return "__slots__" in vars(cls)
+
+
+def _compact_type(annotation):
+    if isinstance(annotation, type) and is_dataclass(annotation):
+        return compact(annotation)
+    args = typing.get_args(annotation)
+    if not args:
+        return annotation
+    args = tuple(_compact_type(arg) for arg in args)
+    if isinstance(annotation, types.GenericAlias):
+        return types.GenericAlias(typing.get_origin(annotation), args)
+    return annotation.copy_with(args)
+
+
+def _methods(cls: type) -> typing.Dict[str, typing.Any]:
+    """
+    :return: The methods and properties defined by `cls` and its bases, which are not part of the dataclass machinery
+    """
+    methods = dict()
+    for base in reversed(cls.__mro__):
+        if base in (object, DataClassJsonMixin):
+            continue
+        for name, value in vars(base).items():
+            if name.startswith("__") or name in CompactModel.__dict__:
+                continue
+            if isinstance(value, (types.FunctionType, classmethod, staticmethod, property)):
+                methods[name] = value
+    return methods
+
+
+def compact(cls: typing.Type[TModel]) -> typing.Type[TModel]:
+    """
+    :return: The slotted and frozen variant of the dataclass `cls`, nested models are swapped for their own variants.
+    Models which are already slotted are returned as is.
+    """
+    if cls in _original_classes or _is_slotted(cls):
+        return cls
+    if cls in _compact_classes:
+        return _compact_classes[cls]
+
+    namespace = _methods(cls)
+    namespace["__annotations__"] = {_.name: _compact_type(_.type) for _ in fields(cls)}
+    for _ in fields(cls):
+        namespace[_.name] = field(
+            default=_.default, default_factory=_.default_factory, init=_.init, repr=_.repr, hash=_.hash,
+            compare=_.compare, metadata=_.metadata
+        )
+    namespace["dataclass_json_config"] = getattr(cls, "dataclass_json_config", None)
+    namespace["__qualname__"] = namespace["__name__"] = f"Compact{cls.__name__}"
+    namespace["__module__"] = __name__
+    namespace["__doc__"] = cls.__doc__
+
+    compact_cls = dataclass(frozen=True, slots=True)(type(namespace["__name__"], (CompactModel,), namespace))
+    if isinstance(cls, abc.ABCMeta):
+        cls.register(compact_cls)
+    _compact_classes[cls] = compact_cls
+    _original_classes[compact_cls] = cls
+    return compact_cls
+
+
+def original(cls: type) -> type:
+    """
+    :return: The model `cls` was generated from by `compact`, or `cls` itself
+    """
+    return _original_classes.get(cls, cls)
+
+
+def is_compact(cls: type) -> bool:
+    return cls in _original_classes
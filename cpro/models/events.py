@@ -0,0 +1,58 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import typing
+
+from cpro.models.options import get_decode_options
+
+TModel = typing.TypeVar("TModel")
+
+
+class EventDecoders(typing.Generic[TModel]):
+    """
+    Maps the raw `e` field of stream events to the `from_dict` of the model they decode into. Built once per stream
+    type, so dispatching an event is a single dict lookup.
+    """
+
+    def __init__(self, models: typing.Mapping[str, typing.Type[TModel]]):
+        self.models = dict(models)
+        self._decoders: typing.Dict[str, typing.Callable[[dict], TModel]] = {
+            event: cls.from_dict for event, cls in self.models.items()
+        }
+        self._compact_decoders: typing.Optional[typing.Dict[str, typing.Callable[[dict], TModel]]] = None
+
+    def _compact(self) -> typing.Dict[str, typing.Callable[[dict], TModel]]:
+        if self._compact_decoders is None:
+            from cpro.models.compact import compact
+            self._compact_decoders = {event: compact(cls).from_dict for event, cls in self.models.items()}
+        return self._compact_decoders
+
+    def __contains__(self, event: str) -> bool:
+        return event in self._decoders
+
+    def decode(self, data: dict) -> TModel:
+        """
+        :raises ValueError: When the event is not one of this table
+        """
+        decoders = self._compact() if get_decode_options().compact_models else self._decoders
+        decoder = decoders.get(data.get("e"))
+        if decoder is None:
+            raise ValueError(f"Unhandled event: {data.get('e')}")
+        return decoder(data)
@@ -0,0 +1,107 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import typing
+from datetime import datetime, timezone, tzinfo
+from decimal import Decimal, ROUND_HALF_EVEN
+
+from cpro.models.options import get_decode_options, TimestampMode, NumericMode
+
+Number = typing.Union[Decimal, float, int]
+
+
+class EpochMillis(int):
+    """
+    A timestamp in milliseconds since the unix epoch, as sent by the exchange. Decoded in place of `datetime` objects
+    under `TimestampMode.EPOCH_MILLIS`, the `datetime` is only built when asked for.
+    """
+    __slots__ = ()
+
+    def to_datetime(self, tz: typing.Optional[tzinfo] = timezone.utc) -> datetime:
+        """
+        :param tz: Timezone of the returned datetime, `None` returns a naive datetime in the local timezone
+        """
+        return datetime.fromtimestamp(self / 1000.0, tz=tz)
+
+    def __repr__(self) -> str:
+        return f"EpochMillis({int(self)})"
+
+
+def to_epoch_millis(value: typing.Union[datetime, int]) -> int:
+    return int(value) if isinstance(value, int) else int(value.timestamp() * 1000)
+
+
+def encode_timestamp(value: typing.Optional[typing.Union[datetime, int]]) -> typing.Optional[int]:
+    if value is None:
+        return None
+    return to_epoch_millis(value)
+
+
+def decode_timestamp(value: int) -> typing.Union[datetime, EpochMillis]:
+    if get_decode_options().timestamp_mode == TimestampMode.EPOCH_MILLIS:
+        return EpochMillis(value)
+    return datetime.fromtimestamp(value / 1000.0)
+
+
+def _scale(value: typing.Union[str, int, float, Decimal], scale: int) -> int:
+    if isinstance(value, str) and "e" not in value and "E" not in value:
+        # fast path for the plain decimal strings sent by the exchange
+        whole, _, fraction = value.partition(".")
+        if len(fraction) <= scale:
+            return int(whole + fraction.ljust(scale, "0"))
+    if isinstance(value, float):
+        value = repr(value)
+    return int(Decimal(value).scaleb(scale).to_integral_value(ROUND_HALF_EVEN))
+
+
+def decode_number(value: typing.Union[str, int, float, Decimal, None]) -> typing.Optional[Number]:
+    """
+    Decodes a price or an amount according to the current `NumericMode`, values with more decimal places than
+    `numeric_scale` are rounded (half to even) under `NumericMode.SCALED`.
+    """
+    if value is None:
+        return None
+    options = get_decode_options()
+    if options.numeric_mode == NumericMode.FLOAT:
+        return float(value)
+    if options.numeric_mode == NumericMode.SCALED:
+        return _scale(value, options.numeric_scale)
+    return Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+
+
+def encode_number(value: typing.Optional[Number]) -> typing.Optional[str]:
+    """
+    Turns any representation produced by `decode_number` back into the exchange's plain fixed-point notation (`str()`
+    of a `Decimal` may use an exponent), `int` values are only taken as scaled by `numeric_scale` under
+    `NumericMode.SCALED`.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        value = Decimal(repr(value))
+    elif isinstance(value, str):
+        value = Decimal(value)
+    elif isinstance(value, int):
+        options = get_decode_options()
+        value = Decimal(value)
+        if options.numeric_mode == NumericMode.SCALED:
+            value = value.scaleb(-options.numeric_scale)
+    return format(value, "f")
+
@@ -0,0 +1,186 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import typing
+from collections.abc import Sequence
+from dataclasses import MISSING, Field, field, fields, is_dataclass, make_dataclass
+
+from dataclasses_json import DataClassJsonMixin
+
+from cpro.models.options import DecodeOptions, decode_options, get_decode_options
+
+# Lazy variants of the data models: the parsed JSON is kept as is, and every field is only decoded (then cached) the
+# first time it is read. Nested models and lists of models are lazy too, so reading one symbol out of
+# `ExchangeInformationResponse` only decodes that symbol.
+#
+# Unknown keys are not checked (`Undefined.RAISE`), as that would require looking at every key of every object.
+
+TModel = typing.TypeVar("TModel")
+
+_lazy_classes: typing.Dict[type, type] = dict()
+_UNDECODED = object()
+
+
+def _make(cls: type, raw: dict, options: DecodeOptions):
+    instance = cls.__new__(cls)
+    instance.__dict__["_raw"] = raw
+    instance.__dict__["_options"] = options
+    return instance
+
+
+class LazyList(Sequence):
+    """
+    A list of models decoded the first time each item is read.
+    """
+
+    def __init__(self, item_cls: type, raw: list, options: DecodeOptions):
+        self._item_cls = item_cls
+        self._raw = raw
+        self._options = options
+        self._items = [_UNDECODED] * len(raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is _UNDECODED:
+            item = self._items[index] = _make(self._item_cls, self._raw[index], self._options)
+        return item
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"LazyList({list(self)!r})"
+
+    def find(self, **criteria) -> typing.Optional[typing.Any]:
+        """
+        Finds the first item whose fields equal `criteria`, compared against the undecoded JSON so that the items
+        skipped over are never decoded. e.g. `response.symbols.find(symbol="BTCPHP")`
+
+        :return: The matching item, or `None`
+        """
+        keys = {self._item_cls._json_keys[name]: value for name, value in criteria.items()}
+        for index, raw in enumerate(self._raw):
+            if all(raw.get(key) == value for key, value in keys.items()):
+                return self[index]
+        return None
+
+
+class _LazyField:
+    def __init__(
+            self, name: str, key: str, field: Field, decode: typing.Callable[[typing.Any, DecodeOptions], typing.Any]
+    ):
+        self.name = name
+        self.key = key
+        self.field = field
+        self.decode = decode
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        raw = instance.__dict__["_raw"]
+        if self.key in raw:
+            value = raw[self.key]
+            if value is not None:
+                with decode_options(instance.__dict__["_options"]):
+                    value = self.decode(value, instance.__dict__["_options"])
+        elif self.field.default is not MISSING:
+            value = self.field.default
+        elif self.field.default_factory is not MISSING:
+            value = self.field.default_factory()
+        else:
+            raise KeyError(self.key)
+        # instance attributes take precedence over non-data descriptors, later reads skip this entirely
+        instance.__dict__[self.name] = value
+        return value
+
+
+def _json_key(model_field: Field) -> str:
+    letter_case = model_field.metadata.get("dataclasses_json", dict()).get("letter_case")
+    return letter_case(model_field.name) if letter_case else model_field.name
+
+
+def _decoder(cls: type, model_field: Field, field_type) -> typing.Callable[[typing.Any, DecodeOptions], typing.Any]:
+    decoder = model_field.metadata.get("dataclasses_json", dict()).get("decoder")
+    if decoder is not None:
+        return lambda value, _: decoder(value)
+    if isinstance(field_type, type) and is_dataclass(field_type):
+        lazy_cls = lazy(field_type)
+        return lambda value, options: _make(lazy_cls, value, options)
+    args = typing.get_args(field_type)
+    if typing.get_origin(field_type) is list and args and is_dataclass(args[0]):
+        lazy_cls = lazy(args[0])
+        return lambda value, options: LazyList(lazy_cls, value, options)
+
+    # any other field is decoded by `dataclasses_json` itself, through a model holding only that field
+    holder = make_dataclass(
+        f"_{cls.__name__}_{model_field.name}",
+        [(model_field.name, field_type, field(metadata=model_field.metadata))],
+        bases=(DataClassJsonMixin,)
+    )
+    key = _json_key(model_field)
+    return lambda value, _: getattr(holder.from_dict({key: value}), model_field.name)
+
+
+def _equals(self, other) -> bool:
+    if not isinstance(other, self._model):
+        return NotImplemented
+    return all(getattr(self, _.name) == getattr(other, _.name) for _ in fields(self._model))
+
+
+class LazyModel(DataClassJsonMixin):
+    _model: type = object
+    _json_keys: typing.Dict[str, str] = dict()
+
+    @classmethod
+    def from_dict(cls, kvs, *, infer_missing=False):
+        return _make(cls, kvs, get_decode_options())
+
+
+def lazy(cls: typing.Type[TModel]) -> typing.Type[TModel]:
+    """
+    :return: A subclass of the model `cls` whose `from_dict` defers decoding every field until it is read
+    """
+    if issubclass(cls, LazyModel):
+        return cls
+    if cls in _lazy_classes:
+        return _lazy_classes[cls]
+
+    keys = {_.name: _json_key(_) for _ in fields(cls)}
+    hints = typing.get_type_hints(cls)
+
+    # instances equal the eagerly decoded model holding the same data
+    namespace = {
+        "_model": cls, "_json_keys": keys, "__eq__": _equals, "__hash__": cls.__hash__,
+        "__module__": cls.__module__, "__doc__": cls.__doc__
+    }
+    lazy_cls = type(f"Lazy{cls.__name__}", (cls, LazyModel), namespace)
+    # registered before building the fields, for models nesting themselves
+    _lazy_classes[cls] = lazy_cls
+    for _ in fields(cls):
+        setattr(lazy_cls, _.name, _LazyField(_.name, keys[_.name], _, _decoder(cls, _, hints[_.name])))
+    if getattr(cls.from_dict, "__func__", None) is DataClassJsonMixin.from_dict.__func__:
+        # `@dataclass_json` models define `from_dict` on the class itself, taking precedence over `LazyModel`
+        lazy_cls.from_dict = LazyModel.__dict__["from_dict"]
+    return lazy_cls
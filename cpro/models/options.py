@@ -0,0 +1,144 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import contextlib
+import typing
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from enum import Enum, auto
+
+TModel = typing.TypeVar("TModel")
+
+
+class TimestampMode(Enum):
+    # Naive `datetime` objects in the local timezone
+    DATETIME = auto()
+    # `EpochMillis` integers, as sent by the exchange
+    EPOCH_MILLIS = auto()
+
+
+class NumericMode(Enum):
+    # `Decimal` objects, exact but slow to decode and to do arithmetic with
+    DECIMAL = auto()
+    # `float` objects, fast but inexact
+    FLOAT = auto()
+    # `int` objects holding the value multiplied by 10 ** `DecodeOptions.numeric_scale`, exact and fast
+    SCALED = auto()
+
+
+class ModelTier(Enum):
+    # `dataclasses_json` models, honouring every `DecodeOptions`
+    DATACLASS = auto()
+    # `msgspec.Struct` models of `cpro.models.structs`, decoded straight from the raw frame in one pass
+    STRUCT = auto()
+
+
+class RawMode(Enum):
+    # response models, decoded as set by the `DecodeOptions`
+    MODEL = auto()
+    # the parsed JSON `dict` / `list`, without decoding it into models
+    JSON = auto()
+    # the body as received, only parsed when it may hold an error of the API
+    BYTES = auto()
+
+
+@dataclass(frozen=True)
+class DecodeOptions:
+    """
+    Controls how models are decoded. Set globally through `set_default_decode_options`, or per client through their
+    `decode_options` argument.
+    """
+    timestamp_mode: TimestampMode = TimestampMode.DATETIME
+    numeric_mode: NumericMode = NumericMode.DECIMAL
+    # number of decimal places kept by `NumericMode.SCALED`
+    numeric_scale: int = 8
+    # decode stream events into the slotted variants of `cpro.models.compact`
+    compact_models: bool = False
+    # decode REST responses into the lazy variants of `cpro.models.lazy`, decoding fields as they are read
+    lazy_responses: bool = False
+
+    def for_symbol(self, symbol_info) -> "DecodeOptions":
+        """
+        :param symbol_info: A `SymbolInfo` of `ExchangeInformationResponse`
+        :return: A copy of these options scaled to hold both the base and quote asset amounts of the symbol exactly
+        """
+        return replace(self, numeric_scale=max(symbol_info.baseAssetPrecision, symbol_info.quoteAssetPrecision))
+
+
+_default_options = DecodeOptions()
+_current_options: ContextVar[typing.Optional[DecodeOptions]] = ContextVar("cpro_decode_options", default=None)
+_current_raw_mode: ContextVar[typing.Optional[RawMode]] = ContextVar("cpro_raw_mode", default=None)
+
+
+def get_decode_options() -> DecodeOptions:
+    return _current_options.get() or _default_options
+
+
+def set_default_decode_options(options: DecodeOptions) -> None:
+    global _default_options
+    _default_options = options
+
+
+def model_class(cls: typing.Type[TModel]) -> typing.Type[TModel]:
+    """
+    :return: The class stream events of type `cls` should be decoded into under the current options
+    """
+    if get_decode_options().compact_models:
+        from cpro.models.compact import compact
+        return compact(cls)
+    return cls
+
+
+@contextlib.contextmanager
+def decode_options(options: typing.Optional[DecodeOptions]) -> typing.Iterator[DecodeOptions]:
+    """
+    Applies `options` to every model decoded (or encoded) within the block, `None` keeps the current options.
+    """
+    if options is None:
+        yield get_decode_options()
+        return
+    token = _current_options.set(options)
+    try:
+        yield options
+    finally:
+        _current_options.reset(token)
+
+
+def get_raw_mode(default: typing.Optional[RawMode] = None) -> RawMode:
+    """
+    :param default: The mode of the client, when none was set for the call
+    """
+    return _current_raw_mode.get() or default or RawMode.MODEL
+
+
+@contextlib.contextmanager
+def raw_responses(mode: typing.Optional[RawMode]) -> typing.Iterator[RawMode]:
+    """
+    Returns the responses of every request made within the block as `mode`, over the mode of the client. `None` keeps
+    the current mode.
+    """
+    if mode is None:
+        yield get_raw_mode()
+        return
+    token = _current_raw_mode.set(mode)
+    try:
+        yield mode
+    finally:
+        _current_raw_mode.reset(token)
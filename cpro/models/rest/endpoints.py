@@ -22,6 +22,7 @@ import typing
 from enum import Enum
 
 from cpro.client.rest import APIEndpoint, HTTPClient
+from cpro.models.options import RawMode, raw_responses
 from cpro.models.rest.enums import SecurityType
 from cpro.models.rest.request import CoinsInformationRequest, DepositAddressRequest, DepositHistoryRequest, \
     WithdrawHistoryRequest, RequestPayload, OrderBookRequest, RecentTradesRequest, GraphDataRequest, \
@@ -34,7 +35,7 @@ from cpro.models.rest.request import CoinsInformationRequest, DepositAddressRequ
     GetPaymentRequestRequest, CancelPaymentRequestRequest, SendPaymentRequestReminderRequest, CreateInvoiceRequest, \
     GetInvoicesRequest, CancelInvoiceRequest, QuoteFetchRequest, QuoteAcceptRequest, \
     SupportedFiatPaymentChannelsRequest, CashOutRequest, FiatOrderDetailRequest, FiatOrderHistoryRequest, \
-    WithdrawRequest, RetrieveOrderHistoryRequest
+    WithdrawRequest, RetrieveOrderHistoryRequest, CreateListenKeyRequest, ListenKeyRequest
 from cpro.models.rest.response import PingResponse, ExchangeInformationResponse, ServerTimeResponse, TResponsePayload, \
     CryptoAssetTradingPairListResponse, EmptyResponse, QuoteAcceptanceResponse
 
@@ -170,6 +171,18 @@ class APIEndpoints(Enum):
         "POST /openapi/v3/payment-request/payment-request-reminder",
         SendPaymentRequestReminderRequest, SecurityType.USER_DATA
     )
+    CREATE_LISTEN_KEY = APIEndpoint(
+        "POST /openapi/v1/userDataStream",
+        CreateListenKeyRequest, SecurityType.USER_STREAM
+    )
+    KEEPALIVE_LISTEN_KEY = APIEndpoint(
+        "PUT /openapi/v1/userDataStream",
+        ListenKeyRequest, SecurityType.USER_STREAM
+    )
+    CLOSE_LISTEN_KEY = APIEndpoint(
+        "DELETE /openapi/v1/userDataStream",
+        ListenKeyRequest, SecurityType.USER_STREAM
+    )
     # todo: separate the merchant API into its own part of the library, with callback support (NO DOCS)
     MERCHANT_CREATE_INVOICE = APIEndpoint(
         "POST /merchant-api/v1/invoices",
@@ -215,10 +228,28 @@ class APIEndpoints(Enum):
         FiatOrderHistoryRequest
     )
 
-    def execute(self, client: HTTPClient, payload: typing.Optional[RequestPayload] = None) -> TResponsePayload:
-        return client.do_request(self.value, payload)
+    def execute(
+            self, client: HTTPClient, payload: typing.Optional[RequestPayload] = None, *, raw: RawMode = None
+    ) -> TResponsePayload:
+        """
+        :param raw: Return the response as parsed JSON or as the bytes received, over the `raw` mode of `client`
+        """
+        with raw_responses(raw):
+            return client.do_request(self.value, payload)
 
     async def execute_async(
-            self, client: HTTPClient, payload: typing.Optional[RequestPayload] = None
+            self, client: HTTPClient, payload: typing.Optional[RequestPayload] = None, *, raw: RawMode = None
     ) -> TResponsePayload:
-        return await client.do_request(self.value, payload)
+        """
+        :param raw: Return the response as parsed JSON or as the bytes received, over the `raw` mode of `client`
+        """
+        with raw_responses(raw):
+            return await client.do_request(self.value, payload)
+
+    def stream(
+            self, client: HTTPClient, payload: typing.Optional[RequestPayload] = None, *, batch_size: int = None
+    ) -> typing.Union[typing.Iterator, typing.AsyncIterator]:
+        """
+        :return: The elements of the JSON array answered, as they arrive, iterated with `async for` on async clients
+        """
+        return client.stream_request(self.value, payload, batch_size=batch_size)
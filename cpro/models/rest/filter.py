@@ -20,11 +20,12 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import re
 import typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import *
 
-from dataclasses_json import dataclass_json
+from dataclasses_json import dataclass_json, config
 
+from cpro.models.fields import encode_number, decode_number
 from cpro.models.rest.enums import _FilterType
 
 P_INFINITY = 99999999999.00000000
@@ -53,9 +54,9 @@ class PriceFilter(FilterOption):
 
     LINK: https://coins-docs.github.io/rest-api/#price_filter
     """
-    minPrice: Decimal
-    maxPrice: Decimal
-    tickSize: Decimal
+    minPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    maxPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    tickSize: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
     @classmethod
     def create(cls, min_price: Decimal, max_price: Decimal, tick_size: Decimal) -> 'PriceFilter':
@@ -232,8 +233,8 @@ class StaticPriceRangeFilter(FilterOption):
 
     LINK: https://coins-docs.github.io/rest-api/#static_price_range
     """
-    priceUp: Decimal
-    priceDown: Decimal
+    priceUp: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    priceDown: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
     @classmethod
     def create(
@@ -265,9 +266,9 @@ class LotSizeFilter(FilterOption):
 
     LINK: https://coins-docs.github.io/rest-api/#lot_size
     """
-    minQty: Decimal
-    maxQty: Decimal
-    stepSize: Decimal
+    minQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    maxQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    stepSize: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
     @classmethod
     def create(
@@ -295,8 +296,8 @@ class NotionalFilter(FilterOption):
 
     LINK: https://coins-docs.github.io/rest-api/#notional
     """
-    minNotional: Decimal
-    maxNotional: Decimal
+    minNotional: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    maxNotional: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
     @classmethod
     def create(
@@ -322,7 +323,7 @@ class MinNotionalFilter(FilterOption):
         "minNotional": "0.00100000"
     },
     """
-    minNotional: Decimal
+    minNotional: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
     @classmethod
     def create(
@@ -415,5 +416,4 @@ def create_filter(data: dict) -> TFilterOption:
 
         raise ValueError(f"Unsupported filter type: {filter_type or 'None'}")
 
-    data.pop("filterType")
-    return __get_cls().create(**{camel_to_snake_case(k): v for k, v in data.items()})
+    return __get_cls().create(**{camel_to_snake_case(k): v for k, v in data.items() if k != "filterType"})
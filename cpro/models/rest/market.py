@@ -18,33 +18,47 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import typing
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import *
 
 from dataclasses_json import dataclass_json, Undefined, config, DataClassJsonMixin
 
+from cpro.models.fields import encode_timestamp, decode_timestamp, encode_number, decode_number
+
 
 @dataclass_json(undefined=Undefined.RAISE)
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MarketOrder:
-    price: Decimal
-    qty: Decimal
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    qty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+
+    @staticmethod
+    def decode_list(value: typing.List[typing.List[str]]) -> typing.List["MarketOrder"]:
+        """
+        Decodes the `[price, qty]` pairs of order books and depth streams
+        """
+        return [MarketOrder(decode_number(price), decode_number(qty)) for price, qty in value]
+
+    @staticmethod
+    def encode_list(value: typing.List["MarketOrder"]) -> typing.List[typing.Tuple[str, str]]:
+        return [(encode_number(order.price), encode_number(order.qty)) for order in value]
 
 
 @dataclass_json(undefined=Undefined.RAISE)
 @dataclass(frozen=True)
 class TradeInfo:
     id: int
-    price: Decimal
-    qty: Decimal
-    quoteQty: Decimal
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    qty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    quoteQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     isBuyerMaker: bool
     isBestMatch: bool
     time: datetime = field(
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -53,56 +67,56 @@ class TradeInfo:
 class MarketDatapoint(DataClassJsonMixin):
     openTime: datetime = field(
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
-    open: Decimal
-    high: Decimal
-    low: Decimal
-    close: Decimal
-    volume: Decimal
+    open: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    high: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    low: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    close: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    volume: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     closeTime: datetime = field(
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
-    quoteAssetVolume: Decimal
+    quoteAssetVolume: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     trades: int
-    takerBuyBaseAssetVolume: Decimal
-    takerBuyQuoteAssetVolume: Decimal
+    takerBuyBaseAssetVolume: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    takerBuyQuoteAssetVolume: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
 @dataclass(frozen=True)
 class TickerStatistics:
     symbol: str
-    priceChange: Decimal
+    priceChange: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     priceChangePercent: Decimal
-    weightedAvgPrice: Decimal
-    prevClosePrice: Decimal
-    lastPrice: Decimal
-    lastQty: Decimal
-    bidPrice: Decimal
-    bidQty: Decimal
-    askPrice: Decimal
-    askQty: Decimal
-    openPrice: Decimal
-    highPrice: Decimal
-    lowPrice: Decimal
-    volume: Decimal
-    quoteVolume: Decimal
+    weightedAvgPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    prevClosePrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    lastPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    lastQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    bidPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    bidQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    askPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    askQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    openPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    highPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    lowPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    volume: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    quoteVolume: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     openTime: datetime = field(
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     closeTime: datetime = field(
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     firstTradeId: int = field(
@@ -126,17 +140,17 @@ class TickerStatistics:
 @dataclass(frozen=True)
 class SymbolPriceTickerStatistics:
     symbol: str
-    price: Decimal
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
 @dataclass(frozen=True)
 class SymbolOrderBookTickerStatistics:
     symbol: str
-    bidPrice: Decimal
-    bidQty: Decimal
-    askPrice: Decimal
-    askQty: Decimal
+    bidPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    bidQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    askPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    askQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
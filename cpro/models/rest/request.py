@@ -20,17 +20,19 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import hashlib
 import hmac
-import json
 import typing
 from copy import copy
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from enum import Enum
 from time import time
 from urllib.parse import quote, urlencode, unquote
 from decimal import *
 
 from dataclasses_json import DataClassJsonMixin, config
 
+from cpro.codec import dumps, loads
+from cpro.models.fields import encode_timestamp, decode_timestamp, encode_number, decode_number
 from cpro.models.rest.enums import DepositStatus, ChartIntervals, OrderSides, OrderTypes, TimeInForce, \
     OrderResponseTypes, AntiSelfTradingBehaviours, ExchangeOrderStatus, PaymentOptions, DeliveryStatus
 from cpro.models.rest.response import TResponsePayload, CoinsInformationResponse, DepositAddressResponse, \
@@ -41,7 +43,7 @@ from cpro.models.rest.response import TResponsePayload, CoinsInformationResponse
     AccountInformationResponse, AccountTradeListResponse, CoinsPHWithdrawResponse, CoinsPHDepositResponse, \
     DepositOrderHistoryResponse, PaymentRequestPayload, InvoiceRequestPayload, WithdrawOrderHistoryResponse, \
     TradeFeeResponse, FetchQuoteResponse, SupportedFiatChannelResponse, QuoteAcceptanceResponse, CashOutResponse, \
-    FiatOrderDetailResponse, WithdrawRequestResponse
+    FiatOrderDetailResponse, WithdrawRequestResponse, ListenKeyResponse, EmptyResponse
 
 
 @dataclass
@@ -89,7 +91,9 @@ class EncodedPayload(DataClassJsonMixin):
 
 class RequestPayload(DataClassJsonMixin):
     def to_encoded(self) -> EncodedPayload:
-        return EncodedPayload(raw_params={k: v for k, v in self.to_dict().items() if v and v != 'null'})
+        return EncodedPayload(raw_params={
+            k: v.value if isinstance(v, Enum) else v for k, v in self.to_dict().items() if v and v != 'null'
+        })
 
     def expected_response(self) -> typing.Type[TResponsePayload]:
         raise NotImplementedError
@@ -104,8 +108,8 @@ class _OptionallyBatchedTickerRequest(RequestPayload):
     symbols: typing.Optional[typing.List[str]] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: quote(json.dumps(_, separators=(',', ':')), safe='"\','),
-            decoder=lambda _: json.loads(unquote(_))
+            encoder=lambda _: quote(dumps(_), safe='"\','),
+            decoder=lambda _: loads(unquote(_))
         )
     )
 
@@ -126,8 +130,8 @@ class CoinsInformationRequest(RequestPayload, DataClassJsonMixin):
     timestamp: datetime = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -143,8 +147,8 @@ class DepositAddressRequest(RequestPayload):
     timestamp: datetime = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -157,14 +161,14 @@ class WithdrawRequest(RequestPayload):
     coin: str
     network: str
     addressTag: str
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     withdrawOrderId: str
     recvWindow: int = 5000
     timestamp: datetime = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -179,15 +183,15 @@ class TransactionHistoryRequest(RequestPayload):
     startTime: datetime = field(
         default_factory=lambda: datetime.now() - timedelta(days=90),
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     endTime: datetime = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     offset: int = 0
@@ -196,8 +200,8 @@ class TransactionHistoryRequest(RequestPayload):
     timestamp: datetime = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -246,15 +250,15 @@ class GraphDataRequest(RequestPayload):
     startTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     endTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     limit: int = 500
@@ -305,15 +309,21 @@ class NewOrderRequest(RequestPayload):
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
     timeInForce: typing.Optional[TimeInForce] = None
-    quantity: typing.Optional[Decimal] = None
-    quoteOrderQty: typing.Optional[Decimal] = None
-    price: typing.Optional[Decimal] = None
+    quantity: typing.Optional[Decimal] = field(
+        default=None, metadata=config(encoder=encode_number, decoder=decode_number)
+    )
+    quoteOrderQty: typing.Optional[Decimal] = field(
+        default=None, metadata=config(encoder=encode_number, decoder=decode_number)
+    )
+    price: typing.Optional[Decimal] = field(
+        default=None, metadata=config(encoder=encode_number, decoder=decode_number)
+    )
 
     # A unique id among open orders. Automatically generated if not sent.
     # Orders with the same newClientOrderID can be accepted only when the previous one is filled,
@@ -321,7 +331,9 @@ class NewOrderRequest(RequestPayload):
     newClientOrderId: typing.Optional[str] = None
 
     # Used with STOP_LOSS, STOP_LOSS_LIMIT, TAKE_PROFIT, and TAKE_PROFIT_LIMIT orders.
-    stopPrice: typing.Optional[Decimal] = None
+    stopPrice: typing.Optional[Decimal] = field(
+        default=None, metadata=config(encoder=encode_number, decoder=decode_number)
+    )
 
     # Set the response JSON. ACK, RESULT, or FULL;
     # MARKET and LIMIT order types default to FULL, all other orders default to ACK.
@@ -358,8 +370,8 @@ class _SingleOrderRequest(RequestPayload):
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -385,8 +397,8 @@ class _AllOrdersRequest(RequestPayload):
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -413,15 +425,15 @@ class OrderHistoryRequest(RequestPayload):
     startTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     endTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     limit: typing.Optional[int] = None
@@ -429,8 +441,8 @@ class OrderHistoryRequest(RequestPayload):
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -445,8 +457,8 @@ class AccountInformationRequest(RequestPayload):
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -454,6 +466,23 @@ class AccountInformationRequest(RequestPayload):
         return AccountInformationResponse
 
 
+@dataclass(frozen=True)
+class CreateListenKeyRequest(RequestPayload):
+    # https://coins-docs.github.io/user-data-stream/#create-a-listenkey
+    def expected_response(self) -> typing.Type[TResponsePayload]:
+        return ListenKeyResponse
+
+
+@dataclass(frozen=True)
+class ListenKeyRequest(RequestPayload):
+    # https://coins-docs.github.io/user-data-stream/#pingkeep-alive-a-listenkey
+    # https://coins-docs.github.io/user-data-stream/#close-a-listenkey
+    listenKey: str
+
+    def expected_response(self) -> typing.Type[TResponsePayload]:
+        return EmptyResponse
+
+
 @dataclass(frozen=True)
 class AccountTradesRequest(RequestPayload):
     # https://coins-docs.github.io/rest-api/#account-trade-list-user_data
@@ -462,15 +491,15 @@ class AccountTradesRequest(RequestPayload):
     startTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     endTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     fromId: typing.Optional[int] = None
@@ -479,8 +508,8 @@ class AccountTradesRequest(RequestPayload):
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -492,14 +521,14 @@ class AccountTradesRequest(RequestPayload):
 class CoinsPHWithdrawRequest(RequestPayload):
     # https://coins-docs.github.io/rest-api/#withdraw-to-coins_ph-account-user_data
     coin: str
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     withdrawOrderId: str
     recvWindow: typing.Optional[int] = None
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -511,14 +540,14 @@ class CoinsPHWithdrawRequest(RequestPayload):
 class CoinsPHDepositRequest(RequestPayload):
     # https://coins-docs.github.io/rest-api/#deposit-to-exchange-account-user_data
     coin: str
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     depositOrderId: str
     recvWindow: typing.Optional[int] = None
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -537,23 +566,23 @@ class DepositOrderHistoryRequest(RequestPayload):
     startTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     endTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     recvWindow: typing.Optional[int] = None
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -572,23 +601,23 @@ class WithdrawOrderHistoryRequest(RequestPayload):
     startTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     endTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     recvWindow: typing.Optional[int] = None
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -604,8 +633,8 @@ class TradeFeeRequest(RequestPayload):
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -624,7 +653,7 @@ class CreatePaymentRequestRequest(RequestPayload):
     receiving_account: int
 
     # The requested amount to be transferred to the requestor’s receiving_account.
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
     # An arbitrary message that will be attached to the payment request.
     message: str
@@ -633,8 +662,8 @@ class CreatePaymentRequestRequest(RequestPayload):
     supported_payment_collectors: typing.Optional[typing.List[PaymentOptions]] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: quote(json.dumps(_, separators=(',', ':')), safe='"\','),
-            decoder=lambda _: json.loads(unquote(_))
+            encoder=lambda _: quote(dumps(_), safe='"\','),
+            decoder=lambda _: loads(unquote(_))
         )
     )
 
@@ -649,8 +678,8 @@ class CreatePaymentRequestRequest(RequestPayload):
     timestamp: typing.Optional[datetime] = field(
         default_factory=datetime.now,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -693,7 +722,7 @@ class CreateInvoiceRequest(RequestPayload):
     # https://coins-docs.github.io/rest-api/#creating-invoices
 
     # The amount expected from the customer.
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
     # Currency of transaction.
     currency: str
@@ -701,8 +730,8 @@ class CreateInvoiceRequest(RequestPayload):
     # Methods of payment that are available to a user when they view a payment request, e.g., [“coins_peso_wallet”]
     supported_payment_collectors: typing.Optional[typing.List[PaymentOptions]] = field(
         metadata=config(
-            encoder=lambda _: quote(json.dumps(_, separators=(',', ':')), safe='"\','),
-            decoder=lambda _: json.loads(unquote(_))
+            encoder=lambda _: quote(dumps(_), safe='"\','),
+            decoder=lambda _: loads(unquote(_))
         )
     )
 
@@ -726,15 +755,15 @@ class GetInvoicesRequest(RequestPayload):
     start_time: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     end_time: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     limit: int = None
@@ -795,15 +824,15 @@ class RetrieveOrderHistoryRequest(RequestPayload):
     startTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     endTime: typing.Optional[datetime] = field(
         default=None,
         metadata=config(
-            encoder=lambda _: _ and int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
     status: typing.Optional[DeliveryStatus] = None
@@ -18,7 +18,6 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import json
 import re
 import typing
 from abc import ABC
@@ -30,6 +29,8 @@ from decimal import *
 
 from dataclasses_json import dataclass_json, config, Undefined, DataClassJsonMixin
 
+from cpro.codec import dumps, loads
+from cpro.models.fields import encode_timestamp, decode_timestamp, encode_number, decode_number
 from cpro.models.rest.enums import OrderStatus, TimeInForce, OrderTypes, OrderSides, AccountTransactionStatus, \
     PaymentOptions, DeliveryStatus, SymbolStatus, OrderType, DepositStatus, WithdrawStatus
 from cpro.models.rest.filter import FilterOption, create_filter
@@ -63,8 +64,8 @@ class PingResponse(EmptyResponse):
 class ServerTimeResponse(ResponsePayload):
     # https://coins-docs.github.io/rest-api/#check-server-time
     serverTime: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
 
 
@@ -94,8 +95,8 @@ class ExchangeInformationResponse(ResponsePayload):
     # https://coins-docs.github.io/rest-api/#exchange-information
     timezone: str  # default: UTC - todo: currently this is ignored by the lib
     serverTime: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)  # todo: auto convert to timezone maybe-?
+        encoder=encode_timestamp,
+        decoder=decode_timestamp  # todo: auto convert to timezone maybe-?
     ))
     exchangeFilters: list  # empty -- Reason: https://coins-docs.github.io/rest-api/#exchange-filters
     symbols: list[SymbolInfo]
@@ -124,10 +125,10 @@ class NetworkPayload:
     unLockConfirm: int
     withdrawDesc: str
     withdrawEnable: bool
-    withdrawFee: Decimal
-    withdrawIntegerMultiple: Decimal
-    withdrawMax: Decimal
-    withdrawMin: Decimal
+    withdrawFee: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    withdrawIntegerMultiple: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    withdrawMax: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    withdrawMin: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     sameAddress: bool
 
 
@@ -139,8 +140,8 @@ class CoinPayload:
     name: str
     depositAllEnable: bool
     withdrawAllEnable: bool
-    free: Decimal
-    locked: Decimal
+    free: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    locked: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     networkList: list[NetworkPayload]
     legalMoney: bool
 
@@ -177,7 +178,7 @@ class WithdrawRequestResponse(ResponsePayload):
 @dataclass(frozen=True)
 class _TransactionInfo:
     id: str
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     coin: str
     network: str
     address: str
@@ -192,8 +193,8 @@ class DepositTransactionInfo(_TransactionInfo):
     status: DepositStatus
     insertTime: datetime = field(
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -216,11 +217,11 @@ class WithdrawTransactionInfo(_TransactionInfo):
     status: WithdrawStatus
     applyTime: datetime = field(
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
-    transactionFee: Decimal
+    transactionFee: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     withdrawOrderId: str
     info: str
 
@@ -244,14 +245,14 @@ class OrderBookResponse(ResponsePayload):
     lastUpdateId: int
     bids: list[MarketOrder] = field(
         metadata=config(
-            encoder=lambda _: [(__.price, __.qty) for __ in _],
-            decoder=lambda _: [MarketOrder(*__) for __ in _]
+            encoder=MarketOrder.encode_list,
+            decoder=MarketOrder.decode_list
         )
     )
     asks: list[MarketOrder] = field(
         metadata=config(
-            encoder=lambda _: [(__.price, __.qty) for __ in _],
-            decoder=lambda _: [MarketOrder(*__) for __ in _]
+            encoder=MarketOrder.encode_list,
+            decoder=MarketOrder.decode_list
         )
     )
 
@@ -350,7 +351,7 @@ class CryptoAssetTradingPairListResponse(ResponsePayload, DataClassJsonMixin):
 class CryptoAssetCurrentPriceAverageResponse(ResponsePayload):
     # https://coins-docs.github.io/rest-api/#current-average-price
     mins: int
-    price: Decimal
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
@@ -371,8 +372,8 @@ class NewOrderACKResponse(NewOrderResponse):
     orderId: int
     clientOrderId: str
     transactTime: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
 
 
@@ -380,23 +381,23 @@ class NewOrderACKResponse(NewOrderResponse):
 @dataclass(frozen=True)
 class NewOrderRESULTResponse(NewOrderACKResponse):
     # https://coins-docs.github.io/rest-api/#new-order--trade
-    price: Decimal
-    origQty: Decimal
-    executedQty: Decimal
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    origQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    executedQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     status: OrderStatus
     timeInForce: TimeInForce
     type: OrderTypes
     side: OrderSides
-    stopPrice: Decimal
-    origQuoteOrderQty: Decimal
+    stopPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    origQuoteOrderQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
 @dataclass(frozen=True)
 class OrderFill:
-    price: Decimal
-    qty: Decimal
-    commission: Decimal
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    qty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    commission: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     commissionAsset: str
     tradeId: str
 
@@ -408,6 +409,8 @@ class NewOrderFULLResponse(NewOrderRESULTResponse):
     fills: list[OrderFill]
 
 
+@dataclass_json(undefined=Undefined.RAISE)
+@dataclass(frozen=True)
 class _APIOrderResponse(ResponsePayload):
     # https://coins-docs.github.io/rest-api/#query-order-user_data
     # https://coins-docs.github.io/rest-api/#cancel-all-open-orders-on-a-symbol-trade
@@ -418,23 +421,23 @@ class _APIOrderResponse(ResponsePayload):
     orderId: int
     clientOrderId: str
     time: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     updateTime: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
-    price: Decimal
-    origQty: Decimal
-    executedQty: Decimal
-    cummulativeQuoteQty: Decimal
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    origQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    executedQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    cummulativeQuoteQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     status: OrderStatus
     timeInForce: TimeInForce
     type: OrderTypes
     side: OrderSides
-    stopPrice: Decimal
-    origQuoteOrderQty: Decimal
+    stopPrice: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    origQuoteOrderQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
@@ -492,8 +495,8 @@ class OrderHistoryResponse(ResponsePayload, DataClassJsonMixin):
 @dataclass(frozen=True)
 class CoinBalance:
     asset: str
-    free: Decimal
-    locked: Decimal
+    free: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    locked: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass(frozen=True)
@@ -504,8 +507,8 @@ class AccountInformationResponse(ResponsePayload, DataClassJsonMixin):
     canDeposit: bool
     accountType: str
     updateTime: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     balances: list[CoinBalance]
 
@@ -516,14 +519,14 @@ class AccountTrade(ResponsePayload, DataClassJsonMixin):
     symbol: str
     id: int
     orderId: int
-    price: Decimal
-    qty: Decimal
-    quoteQty: Decimal
-    commission: Decimal
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    qty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    quoteQty: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    commission: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     commissionAsset: str
     time: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     isBuyer: bool
     isMaker: bool
@@ -541,6 +544,13 @@ class AccountTradeListResponse(ResponsePayload, DataClassJsonMixin):
         return super().from_dict({"orders": [kvs]}, infer_missing=infer_missing)
 
 
+@dataclass_json(undefined=Undefined.RAISE)
+@dataclass(frozen=True)
+class ListenKeyResponse(ResponsePayload):
+    # https://coins-docs.github.io/user-data-stream/#create-a-listenkey
+    listenKey: str
+
+
 @dataclass(frozen=True)
 class CoinsPHWithdrawResponse(ResponsePayload, DataClassJsonMixin):
     # https://coins-docs.github.io/rest-api/#withdraw-to-coins_ph-account-user_data
@@ -559,7 +569,7 @@ class DepositOrderHistoryPayload(ResponsePayload, DataClassJsonMixin):
     coin: str
     address: str
     addressTag: str
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     id: int
     network: str
     transferType: str
@@ -588,19 +598,19 @@ class WithdrawOrderHistoryPayload(ResponsePayload, DataClassJsonMixin):
     # https://coins-docs.github.io/rest-api/#withdraw-order-history-withdrawal-order-which-withdraw-from-exchange-to-coins_ph-user_data
     coin: str
     address: str
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     id: int
     network: str
     withdrawOrderId: str
     transferType: str
     status: int
-    transactionFee: Decimal
+    transactionFee: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     confirmNo: int
     info: str
     txId: str
     applyTime: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
 
 
@@ -620,8 +630,8 @@ class WithdrawOrderHistoryResponse(ResponsePayload, DataClassJsonMixin):
 class TradeFeePayload:
     # https://coins-docs.github.io/rest-api/#trade-fee-user_data
     symbol: str
-    makerCommission: Decimal
-    takerCommission: Decimal
+    makerCommission: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    takerCommission: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass(frozen=True)
@@ -644,25 +654,25 @@ class PaymentRequestPayload(ResponsePayload, DataClassJsonMixin):
     message: str
     id: int
     invoice: int
-    amount: Decimal
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     currency: str
     status: AccountTransactionStatus
     created_at: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     updated_at: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     expires_at: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     supported_payment_collectors: typing.List[PaymentOptions] = field(
         metadata=config(
-            encoder=lambda _: quote(json.dumps(_, separators=(',', ':')), safe='"\','),
-            decoder=lambda _: json.loads(unquote(_))
+            encoder=lambda _: quote(dumps(_), safe='"\','),
+            decoder=lambda _: loads(unquote(_))
         )
     )
     payment_url: str
@@ -681,27 +691,28 @@ class InvoiceRequestPayload(ResponsePayload, DataClassJsonMixin):
     # https://coins-docs.github.io/rest-api/#retrieving-invoices
     # https://coins-docs.github.io/rest-api/#canceling-invoices
     id: str
-    amount: Decimal
-    amount_due: Decimal  # todo: verify, no type on docs
+    amount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    # todo: verify, no type on docs
+    amount_due: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     currency: str
     status: AccountTransactionStatus  # todo: verify, no type on docs
     external_transaction_id: str
     created_at: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     updated_at: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     expires_at: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     supported_payment_collectors: typing.List[PaymentOptions] = field(
         metadata=config(
-            encoder=lambda _: quote(json.dumps(_, separators=(',', ':')), safe='"\','),
-            decoder=lambda _: json.loads(unquote(_))
+            encoder=lambda _: quote(dumps(_), safe='"\','),
+            decoder=lambda _: loads(unquote(_))
         )
     )
     payment_url: str
@@ -728,9 +739,9 @@ class TradingPairPayload:
     # https://coins-docs.github.io/rest-api/#get-supported-trading-pairs
     sourceCurrency: str
     targetCurrency: str
-    minSourceAmount: Decimal
-    maxSourceAmount: Decimal
-    precision: Decimal
+    minSourceAmount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    maxSourceAmount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    precision: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass(frozen=True)
@@ -745,9 +756,9 @@ class QuotePayload:
     quoteId: str
     sourceCurrency: str
     targetCurrency: str
-    sourceAmount: Decimal
-    price: Decimal
-    targetAmount: Decimal
+    sourceAmount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    targetAmount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     expiry: int
 
 
@@ -781,13 +792,13 @@ class RetrieveOrderHistoryPayload:
     sourceCurrencyIcon: str
     targetCurrency: str
     targetCurrencyIcon: str
-    sourceAmount: Decimal
-    targetAmount: Decimal
-    price: Decimal
+    sourceAmount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    targetAmount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    price: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     status: DeliveryStatus
     createdAt: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     errorCode: str
     errorMessage: str
@@ -813,18 +824,18 @@ class SupportedFiatChannelPayload:
     paymentMethod: str
     channelIcon: str
     subjectIcon: str
-    maximum: Decimal
-    minimum: Decimal
-    dailyLimit: Decimal
-    monthlyLimit: Decimal
-    annualLimit: Decimal
-    remainingDailyLimit: Decimal
-    remainingMonthlyLimit: Decimal
-    remainingAnnualLimit: Decimal
+    maximum: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    minimum: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    dailyLimit: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    monthlyLimit: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    annualLimit: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    remainingDailyLimit: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    remainingMonthlyLimit: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    remainingAnnualLimit: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     precision: int
     fee: int
     feeType: int
-    maxWithdrawBalance: Decimal
+    maxWithdrawBalance: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
 
 
 @dataclass(frozen=True)
@@ -852,7 +863,7 @@ class FiatOrderDetailPayload:
     orderId: int
     paymentOrderId: int
     fiatCurrency: str
-    fiatAmount: Decimal
+    fiatAmount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     transactionType: int
     transactionChannel: str
     transactionSubject: str
@@ -860,8 +871,8 @@ class FiatOrderDetailPayload:
     transactionChannelName: str
     transactionSubjectName: str
     feeCurrency: str
-    channelFee: Decimal
-    platformFee: Decimal
+    channelFee: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    platformFee: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     status: str
     errorCode: str
     errorMessage: str
@@ -886,7 +897,7 @@ class FiatOrderHistoryPayload:
     internalOrderId: int
     paymentOrderId: int
     fiatCurrency: str
-    fiatAmount: Decimal
+    fiatAmount: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     transactionType: int
     transactionChannel: str
     transactionSubject: str
@@ -894,8 +905,8 @@ class FiatOrderHistoryPayload:
     transactionChannelName: str
     transactionSubjectName: str
     feeCurrency: str
-    channelFee: Decimal
-    platformFee: Decimal
+    channelFee: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
+    platformFee: Decimal = field(metadata=config(encoder=encode_number, decoder=decode_number))
     status: str
     errorCode: str
     errorMessage: str
@@ -0,0 +1,265 @@
+"""
+GNU GENERAL PUBLIC LICENSE
+Version 3, 29 June 2007
+
+Copyright (C) 2023-present xjrb10
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import typing
+from decimal import Decimal
+
+try:
+    import msgspec
+except ImportError as e:
+    raise ImportError("The struct model tier requires msgspec, install it with `pip install cpro.py[msgspec]`") from e
+
+from cpro.models.rest.enums import ChartIntervals, WSStreamDataEventTypes, ExecutionTypes, OrderSides, TimeInForce, \
+    OrderType, OrderStatus
+from cpro.models.ud_stream import UserDataStreamEventTypes
+
+# `msgspec.Struct` mirrors of the `ws_stream` and `ud_stream` models, selected through `ModelTier.STRUCT`. The raw
+# frame is decoded straight into these in a single pass, dispatching on the `e` field, with no intermediate `dict`.
+#
+# Unlike the dataclass tier these ignore `DecodeOptions`: timestamps are kept as the epoch milliseconds `int` sent by
+# the exchange and amounts are always `Decimal`. The undocumented fields ignored by the dataclasses (`M`, `B`) are left
+# out, along with any other unknown field.
+
+
+class StreamData(msgspec.Struct, frozen=True, gc=False, tag_field="e"):
+    @property
+    def eventType(self) -> WSStreamDataEventTypes:
+        return WSStreamDataEventTypes(self.__struct_config__.tag)
+
+
+class AggregateTradeData(StreamData, tag=WSStreamDataEventTypes.AGGREGATE_TRADE.value):
+    eventTime: int = msgspec.field(name="E")
+    symbol: str = msgspec.field(name="s")
+    aggregateTradeID: int = msgspec.field(name="a")
+    price: Decimal = msgspec.field(name="p")
+    quantity: Decimal = msgspec.field(name="q")
+    firstTradeID: int = msgspec.field(name="f")
+    lastTradeID: int = msgspec.field(name="l")
+    tradeTime: int = msgspec.field(name="T")
+    isBuyerMarketMaker: bool = msgspec.field(name="m")
+
+
+class TradeData(StreamData, tag=WSStreamDataEventTypes.TRADE.value):
+    eventTime: int = msgspec.field(name="E")
+    symbol: str = msgspec.field(name="s")
+    tradeID: int = msgspec.field(name="t")
+    price: Decimal = msgspec.field(name="p")
+    quantity: Decimal = msgspec.field(name="q")
+    buyerOrderID: Decimal = msgspec.field(name="b")
+    sellerOrderID: Decimal = msgspec.field(name="a")
+    tradeTime: int = msgspec.field(name="T")
+    isBuyerMarketMaker: bool = msgspec.field(name="m")
+
+
+class GraphPointData(msgspec.Struct, frozen=True, gc=False):
+    startTime: int = msgspec.field(name="t")
+    closeTime: int = msgspec.field(name="T")
+    symbol: str = msgspec.field(name="s")
+    interval: ChartIntervals = msgspec.field(name="i")
+    firstTradeID: int = msgspec.field(name="f")
+    lastTradeID: int = msgspec.field(name="L")
+    openPrice: Decimal = msgspec.field(name="o")
+    closePrice: Decimal = msgspec.field(name="c")
+    highPrice: Decimal = msgspec.field(name="h")
+    lowPrice: Decimal = msgspec.field(name="l")
+    baseAssetVolume: Decimal = msgspec.field(name="v")
+    totalTradeCount: int = msgspec.field(name="n")
+    isClosed: bool = msgspec.field(name="x")
+    quoteAssetVolume: Decimal = msgspec.field(name="q")
+    takerBuyBaseAssetVolume: Decimal = msgspec.field(name="V")
+    takerBuyQuoteAssetVolume: Decimal = msgspec.field(name="Q")
+
+
+class KlineCandlestickData(StreamData, tag=WSStreamDataEventTypes.KLINE.value):
+    eventTime: int = msgspec.field(name="E")
+    symbol: str = msgspec.field(name="s")
+    dataPoint: GraphPointData = msgspec.field(name="k")
+
+
+class IndividualSymbolMiniTickerData(StreamData, tag=WSStreamDataEventTypes._24H_MINI_TICKER.value):
+    eventTime: int = msgspec.field(name="E")
+    symbol: str = msgspec.field(name="s")
+    closePrice: Decimal = msgspec.field(name="c")
+    openPrice: Decimal = msgspec.field(name="o")
+    highPrice: Decimal = msgspec.field(name="h")
+    lowPrice: Decimal = msgspec.field(name="l")
+    totalTradedBaseAssetVolume: Decimal = msgspec.field(name="v")
+    totalTradedQuoteAssetVolume: Decimal = msgspec.field(name="q")
+
+
+class IndividualSymbolTickerData(StreamData, tag=WSStreamDataEventTypes._24H_TICKER.value):
+    eventTime: int = msgspec.field(name="E")
+    symbol: str = msgspec.field(name="s")
+    priceChange: Decimal = msgspec.field(name="p")
+    priceChangePercent: Decimal = msgspec.field(name="P")
+    weightedAveragePrice: Decimal = msgspec.field(name="w")
+    firstTradePrice: Decimal = msgspec.field(name="x")
+    lastPrice: Decimal = msgspec.field(name="c")
+    lastQuantity: Decimal = msgspec.field(name="Q")
+    bestBidPrice: Decimal = msgspec.field(name="b")
+    bestBidQuantity: Decimal = msgspec.field(name="B")
+    bestAskPrice: Decimal = msgspec.field(name="a")
+    bestAskQuantity: Decimal = msgspec.field(name="A")
+    openPrice: Decimal = msgspec.field(name="o")
+    highPrice: Decimal = msgspec.field(name="h")
+    lowPrice: Decimal = msgspec.field(name="l")
+    totalTradedBaseAssetVolume: Decimal = msgspec.field(name="v")
+    totalTradedQuoteAssetVolume: Decimal = msgspec.field(name="q")
+    statisticsOpenTime: int = msgspec.field(name="O")
+    statisticsCloseTime: int = msgspec.field(name="C")
+    firstTradeID: int = msgspec.field(name="F")
+    lastTradeID: int = msgspec.field(name="L")
+    totalTradeCount: int = msgspec.field(name="n")
+
+
+class IndividualSymbolBookTickerData(msgspec.Struct, frozen=True, gc=False):
+    # the only stream without an `e` field, decoded when no tagged struct matches
+    orderBookUpdateID: int = msgspec.field(name="u")
+    symbol: str = msgspec.field(name="s")
+    bestBidPrice: Decimal = msgspec.field(name="b")
+    bestBidQuantity: Decimal = msgspec.field(name="B")
+    bestAskPrice: Decimal = msgspec.field(name="a")
+    bestAskQuantity: Decimal = msgspec.field(name="A")
+
+
+class MarketOrder(msgspec.Struct, frozen=True, gc=False, array_like=True):
+    # decoded from the `[price, qty]` pairs of depth streams
+    price: Decimal
+    qty: Decimal
+
+
+class PartialBookDepthData(StreamData, tag=WSStreamDataEventTypes.PARTIAL_BOOK_DEPTH.value):
+    symbol: str = msgspec.field(name="s")
+    eventTime: int = msgspec.field(name="E")
+    lastUpdateID: int = msgspec.field(name="lastUpdateId")
+    bidsUpdated: typing.List[MarketOrder] = msgspec.field(name="b")
+    asksUpdated: typing.List[MarketOrder] = msgspec.field(name="a")
+
+
+class DiffDepthData(StreamData, tag=WSStreamDataEventTypes.DIFF_DEPTH.value):
+    eventTime: int = msgspec.field(name="E")
+    symbol: str = msgspec.field(name="s")
+    firstUpdateID: int = msgspec.field(name="U")
+    lastUpdateID: int = msgspec.field(name="u")
+    bidsUpdated: typing.List[MarketOrder] = msgspec.field(name="b")
+    asksUpdated: typing.List[MarketOrder] = msgspec.field(name="a")
+
+
+class UserStreamData(msgspec.Struct, frozen=True, gc=False, tag_field="e"):
+    @property
+    def eventType(self) -> UserDataStreamEventTypes:
+        return UserDataStreamEventTypes(self.__struct_config__.tag)
+
+
+class AccountBalanceUpdateData(msgspec.Struct, frozen=True, gc=False):
+    asset: str = msgspec.field(name="a")
+    free: Decimal = msgspec.field(name="f")
+    locked: Decimal = msgspec.field(name="l")
+
+
+class AccountUpdateData(UserStreamData, tag=UserDataStreamEventTypes.ACCOUNT_UPDATE.value):
+    # https://coins-docs.github.io/user-data-stream/#account-update
+    eventTime: int = msgspec.field(name="E")
+    lastAccountUpdatetime: int = msgspec.field(name="u")
+    balanceUpdates: typing.List[AccountBalanceUpdateData] = msgspec.field(name="B")
+
+
+class BalanceUpdateData(UserStreamData, tag=UserDataStreamEventTypes.BALANCE_UPDATE.value):
+    # https://coins-docs.github.io/user-data-stream/#balance-update
+    eventTime: int = msgspec.field(name="E")
+    asset: str = msgspec.field(name="a")
+    delta: Decimal = msgspec.field(name="d")
+    clearTime: int = msgspec.field(name="T")
+
+
+class OrderUpdateData(UserStreamData, tag=UserDataStreamEventTypes.ORDER_UPDATE.value):
+    eventTime: int = msgspec.field(name="E")
+    symbol: str = msgspec.field(name="s")
+    clientOrderID: str = msgspec.field(name="c")
+    side: OrderSides = msgspec.field(name="S")
+    orderType: OrderType = msgspec.field(name="o")
+    timeInForce: TimeInForce = msgspec.field(name="f")
+    orderQuantity: Decimal = msgspec.field(name="q")
+    orderPrice: Decimal = msgspec.field(name="p")
+    stopPrice: Decimal = msgspec.field(name="P")
+    currentExecutionType: ExecutionTypes = msgspec.field(name="x")
+    currentOrderStatus: OrderStatus = msgspec.field(name="X")
+    orderRejectReason: str = msgspec.field(name="r")
+    orderID: int = msgspec.field(name="i")
+    lastExecutedQuantity: Decimal = msgspec.field(name="l")
+    cumulativeFilledQuantity: Decimal = msgspec.field(name="z")
+    lastExecutedPrice: Decimal = msgspec.field(name="L")
+    commissionAmount: Decimal = msgspec.field(name="n")
+    tradeID: int = msgspec.field(name="t")
+    isOrderOnBook: bool = msgspec.field(name="w")
+    isTradeMakerSide: bool = msgspec.field(name="m")
+    orderCreationTime: int = msgspec.field(name="O")
+    cumulativeQuoteAssetTransactedQuantity: Decimal = msgspec.field(name="Z")
+    lastQuoteAssetTransactedQuantity: Decimal = msgspec.field(name="Y")
+    quoteOrderQuantity: Decimal = msgspec.field(name="Q")
+    commissionAsset: typing.Optional[str] = msgspec.field(default=None, name="N")
+    # 0 until the order is first traded
+    transactionTime: int = msgspec.field(default=0, name="T")
+
+
+class _Envelope(msgspec.Struct, gc=False):
+    # the keys telling stream events apart from the other frames, every other field is skipped over
+    e: typing.Optional[str] = None
+    u: typing.Optional[int] = None
+    s: typing.Optional[str] = None
+
+
+_envelope_decoder = msgspec.json.Decoder(_Envelope)
+_stream_data_decoder = msgspec.json.Decoder(typing.Union[
+    AggregateTradeData, TradeData, KlineCandlestickData, IndividualSymbolMiniTickerData, IndividualSymbolTickerData,
+    PartialBookDepthData, DiffDepthData
+])
+_book_ticker_decoder = msgspec.json.Decoder(IndividualSymbolBookTickerData)
+_user_stream_data_decoder = msgspec.json.Decoder(typing.Union[AccountUpdateData, BalanceUpdateData, OrderUpdateData])
+
+
+def decode_frame(json_data: typing.Union[str, bytes]) -> typing.Optional[msgspec.Struct]:
+    """
+    :return: The stream event held by a websocket frame, `None` for frames that are not stream events (RPC responses,
+    pongs, errors), which are left to `unmarshal_frame`
+    :raises ValueError: if the frame is a stream event which could not be decoded
+    """
+    try:
+        envelope = _envelope_decoder.decode(json_data)
+    except msgspec.DecodeError:
+        return None
+    if envelope.e is not None:
+        decoder = _stream_data_decoder
+    elif envelope.u is not None and envelope.s is not None:
+        # the book ticker is the only stream without an event type
+        decoder = _book_ticker_decoder
+    else:
+        return None
+    try:
+        return decoder.decode(json_data)
+    except msgspec.DecodeError as e:
+        raise ValueError(f"Unable to decode stream event: {e}") from e
+
+
+def decode_stream_data(json_data: typing.Union[str, bytes]) -> UserStreamData:
+    try:
+        return _user_stream_data_decoder.decode(json_data)
+    except msgspec.DecodeError as e:
+        raise ValueError(f"Unable to decode user data stream event: {e}") from e
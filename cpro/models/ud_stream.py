@@ -26,6 +26,8 @@ from enum import Enum
 
 from dataclasses_json import dataclass_json, Undefined, DataClassJsonMixin, config
 
+from cpro.models.events import EventDecoders
+from cpro.models.fields import encode_timestamp, decode_timestamp, encode_number, decode_number
 from cpro.models.rest.enums import ExecutionTypes, OrderSides, TimeInForce, OrderType, OrderStatus
 
 
@@ -48,55 +50,63 @@ class AccountBalanceUpdateData:
         field_name="a"
     ))
     free: Decimal = field(metadata=config(
-        field_name="f"
+        field_name="f",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     locked: Decimal = field(metadata=config(
-        field_name="l"
+        field_name="l",
+        encoder=encode_number,
+        decoder=decode_number
     ))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
 @dataclass
 class AccountUpdateData(UserStreamData):
+    # https://coins-docs.github.io/user-data-stream/#account-update
     eventType: UserDataStreamEventTypes = field(metadata=config(
         field_name="e"  # outboundAccountPosition
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
-    ))
-    asset: str = field(metadata=config(
-        field_name="a"
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
-    delta: Decimal = field(metadata=config(
-        field_name="d"
+    lastAccountUpdatetime: datetime = field(metadata=config(
+        field_name="u",
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
-    clearTime: datetime = field(metadata=config(
-        field_name="T",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+    balanceUpdates: list[AccountBalanceUpdateData] = field(metadata=config(
+        field_name="B",
     ))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
 @dataclass
 class BalanceUpdateData(UserStreamData):
+    # https://coins-docs.github.io/user-data-stream/#balance-update
     eventType: UserDataStreamEventTypes = field(metadata=config(
         field_name="e"  # balanceUpdate
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
-    lastAccountUpdatetime: datetime = field(metadata=config(
-        field_name="u",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+    asset: str = field(metadata=config(
+        field_name="a"
     ))
-    balanceUpdates: list[AccountBalanceUpdateData] = field(metadata=config(
-        field_name="B",
+    delta: Decimal = field(metadata=config(
+        field_name="d",
+        encoder=encode_number,
+        decoder=decode_number
+    ))
+    clearTime: datetime = field(metadata=config(
+        field_name="T",
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
 
 
@@ -108,8 +118,8 @@ class OrderUpdateData(UserStreamData):
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     symbol: str = field(metadata=config(
         field_name="s"
@@ -127,13 +137,19 @@ class OrderUpdateData(UserStreamData):
         field_name="f"
     ))
     orderQuantity: Decimal = field(metadata=config(
-        field_name="q"
+        field_name="q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     orderPrice: Decimal = field(metadata=config(
-        field_name="p"
+        field_name="p",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     stopPrice: Decimal = field(metadata=config(
-        field_name="P"
+        field_name="P",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     currentExecutionType: ExecutionTypes = field(metadata=config(
         field_name="x"
@@ -148,16 +164,24 @@ class OrderUpdateData(UserStreamData):
         field_name="i"
     ))
     lastExecutedQuantity: Decimal = field(metadata=config(
-        field_name="l"
+        field_name="l",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     cumulativeFilledQuantity: Decimal = field(metadata=config(
-        field_name="z"
+        field_name="z",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     lastExecutedPrice: Decimal = field(metadata=config(
-        field_name="L"
+        field_name="L",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     commissionAmount: Decimal = field(metadata=config(
-        field_name="n"
+        field_name="n",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     tradeID: int = field(metadata=config(
         field_name="t"
@@ -170,17 +194,23 @@ class OrderUpdateData(UserStreamData):
     ))
     orderCreationTime: datetime = field(metadata=config(
         field_name="O",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     cumulativeQuoteAssetTransactedQuantity: Decimal = field(metadata=config(
-        field_name="Z"
+        field_name="Z",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     lastQuoteAssetTransactedQuantity: Decimal = field(metadata=config(
-        field_name="Y"
+        field_name="Y",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     quoteOrderQuantity: Decimal = field(metadata=config(
-        field_name="Q"
+        field_name="Q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     commissionAsset: typing.Optional[str] = field(
         default=None,
@@ -190,18 +220,18 @@ class OrderUpdateData(UserStreamData):
         default=None,
         metadata=config(
             field_name="T",
-            encoder=lambda _: int(_.timestamp() * 1000) if _ is not None else None,
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0) if _ > 0 else None
+            encoder=encode_timestamp,
+            decoder=lambda _: decode_timestamp(_) if _ > 0 else None
         )
     )
 
 
+STREAM_DATA_DECODERS: EventDecoders[UserStreamData] = EventDecoders({
+    UserDataStreamEventTypes.ACCOUNT_UPDATE.value: AccountUpdateData,
+    UserDataStreamEventTypes.BALANCE_UPDATE.value: BalanceUpdateData,
+    UserDataStreamEventTypes.ORDER_UPDATE.value: OrderUpdateData,
+})
+
+
 def unmarshal_stream_data(data: dict) -> UserStreamData:
-    match data['e']:
-        case UserDataStreamEventTypes.ACCOUNT_UPDATE:
-            return AccountUpdateData.from_dict(data)
-        case UserDataStreamEventTypes.BALANCE_UPDATE:
-            return BalanceUpdateData.from_dict(data)
-        case UserDataStreamEventTypes.ORDER_UPDATE:
-            return OrderUpdateData.from_dict(data)
-    raise ValueError(f"Unhandled event: {data['e']}")
+    return STREAM_DATA_DECODERS.decode(data)
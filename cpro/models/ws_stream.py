@@ -18,23 +18,41 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import json
 import typing
+from abc import ABCMeta
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import *
 
 from dataclasses_json import dataclass_json, Undefined, config, DataClassJsonMixin
 
+from cpro.codec import dumps, loads
 from cpro.exception import CoinsAPIException
+from cpro.models.events import EventDecoders
+from cpro.models.fields import encode_timestamp, decode_timestamp, encode_number, decode_number
+from cpro.models.options import model_class
 from cpro.models.rest.enums import ChartIntervals, WSStreamDataEventTypes, WSStreamProcedures
 from cpro.models.rest.market import MarketOrder
 
 
+class _FrameMeta(ABCMeta):
+    def __setattr__(cls, name: str, value: typing.Any) -> None:
+        # `@dataclass_json` sets the generic `to_json` on every class it decorates, which would hide `WSFrame.to_json`
+        if name == "to_json" and value is DataClassJsonMixin.to_json:
+            return
+        super().__setattr__(name, value)
+
+
 @dataclass_json(undefined=Undefined.RAISE)
 @dataclass
-class WSFrame(DataClassJsonMixin):
-    pass
+class WSFrame(DataClassJsonMixin, metaclass=_FrameMeta):
+    def to_json(self, *args, **kwargs) -> str:
+        """
+        Serialises the frame through `cpro.codec`, formatting arguments fall back to `DataClassJsonMixin.to_json`
+        """
+        if args or kwargs:
+            return DataClassJsonMixin.to_json(self, *args, **kwargs)
+        return dumps(self.to_dict(encode_json=True))
 
 
 @dataclass_json(undefined=Undefined.RAISE)
@@ -51,8 +69,8 @@ class AggregateTradeData(StreamData):
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     symbol: str = field(metadata=config(
         field_name="s"
@@ -62,9 +80,13 @@ class AggregateTradeData(StreamData):
     ))
     price: Decimal = field(metadata=config(
         field_name="p",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     quantity: Decimal = field(metadata=config(
         field_name="q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     firstTradeID: int = field(metadata=config(
         field_name="f"
@@ -74,8 +96,8 @@ class AggregateTradeData(StreamData):
     ))
     tradeTime: datetime = field(metadata=config(
         field_name="T",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     isBuyerMarketMaker: bool = field(metadata=config(
         field_name="m"
@@ -94,8 +116,8 @@ class TradeData(StreamData):
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     symbol: str = field(metadata=config(
         field_name="s"
@@ -105,9 +127,13 @@ class TradeData(StreamData):
     ))
     price: Decimal = field(metadata=config(
         field_name="p",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     quantity: Decimal = field(metadata=config(
         field_name="q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     buyerOrderID: Decimal = field(metadata=config(
         field_name="b",
@@ -117,8 +143,8 @@ class TradeData(StreamData):
     ))
     tradeTime: datetime = field(metadata=config(
         field_name="T",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     isBuyerMarketMaker: bool = field(metadata=config(
         field_name="m"
@@ -134,13 +160,13 @@ class TradeData(StreamData):
 class GraphPointData:
     startTime: datetime = field(metadata=config(
         field_name="t",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     closeTime: datetime = field(metadata=config(
         field_name="T",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     symbol: str = field(metadata=config(
         field_name="s"
@@ -155,19 +181,29 @@ class GraphPointData:
         field_name="L"
     ))
     openPrice: Decimal = field(metadata=config(
-        field_name="o"
+        field_name="o",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     closePrice: Decimal = field(metadata=config(
-        field_name="c"
+        field_name="c",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     highPrice: Decimal = field(metadata=config(
-        field_name="h"
+        field_name="h",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     lowPrice: Decimal = field(metadata=config(
-        field_name="l"
+        field_name="l",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     baseAssetVolume: Decimal = field(metadata=config(
-        field_name="v"
+        field_name="v",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     totalTradeCount: int = field(metadata=config(
         field_name="n"
@@ -176,13 +212,19 @@ class GraphPointData:
         field_name="x"
     ))
     quoteAssetVolume: Decimal = field(metadata=config(
-        field_name="q"
+        field_name="q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     takerBuyBaseAssetVolume: Decimal = field(metadata=config(
-        field_name="V"
+        field_name="V",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     takerBuyQuoteAssetVolume: Decimal = field(metadata=config(
-        field_name="Q"
+        field_name="Q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     _ignored: typing.Optional[Decimal] = field(
         default=None,
@@ -198,8 +240,8 @@ class KlineCandlestickData(StreamData):
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     symbol: str = field(metadata=config(
         field_name="s"
@@ -217,29 +259,41 @@ class IndividualSymbolMiniTickerData(StreamData):
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     symbol: str = field(metadata=config(
         field_name="s"
     ))
     closePrice: Decimal = field(metadata=config(
-        field_name="c"
+        field_name="c",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     openPrice: Decimal = field(metadata=config(
-        field_name="o"
+        field_name="o",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     highPrice: Decimal = field(metadata=config(
-        field_name="h"
+        field_name="h",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     lowPrice: Decimal = field(metadata=config(
-        field_name="l"
+        field_name="l",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     totalTradedBaseAssetVolume: Decimal = field(metadata=config(
-        field_name="v"
+        field_name="v",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     totalTradedQuoteAssetVolume: Decimal = field(metadata=config(
-        field_name="q"
+        field_name="q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
 
 
@@ -251,66 +305,94 @@ class IndividualSymbolTickerData(StreamData):
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     symbol: str = field(metadata=config(
         field_name="s"
     ))
     priceChange: Decimal = field(metadata=config(
-        field_name="p"
+        field_name="p",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     priceChangePercent: Decimal = field(metadata=config(
         field_name="P"
     ))
     weightedAveragePrice: Decimal = field(metadata=config(
-        field_name="w"
+        field_name="w",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     firstTradePrice: Decimal = field(metadata=config(
-        field_name="x"
+        field_name="x",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     lastPrice: Decimal = field(metadata=config(
-        field_name="c"
+        field_name="c",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     lastQuantity: Decimal = field(metadata=config(
-        field_name="Q"
+        field_name="Q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     bestBidPrice: Decimal = field(metadata=config(
-        field_name="b"
+        field_name="b",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     bestBidQuantity: Decimal = field(metadata=config(
-        field_name="B"
+        field_name="B",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     bestAskPrice: Decimal = field(metadata=config(
-        field_name="a"
+        field_name="a",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     bestAskQuantity: Decimal = field(metadata=config(
-        field_name="A"
+        field_name="A",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     openPrice: Decimal = field(metadata=config(
-        field_name="o"
+        field_name="o",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     highPrice: Decimal = field(metadata=config(
-        field_name="h"
+        field_name="h",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     lowPrice: Decimal = field(metadata=config(
-        field_name="l"
+        field_name="l",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     totalTradedBaseAssetVolume: Decimal = field(metadata=config(
-        field_name="v"
+        field_name="v",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     totalTradedQuoteAssetVolume: Decimal = field(metadata=config(
-        field_name="q"
+        field_name="q",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     statisticsOpenTime: datetime = field(metadata=config(
         field_name="O",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     statisticsCloseTime: datetime = field(metadata=config(
         field_name="C",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     firstTradeID: int = field(metadata=config(
         field_name="F"
@@ -333,16 +415,24 @@ class IndividualSymbolBookTickerData(StreamData):
         field_name="s"
     ))
     bestBidPrice: Decimal = field(metadata=config(
-        field_name="b"
+        field_name="b",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     bestBidQuantity: Decimal = field(metadata=config(
-        field_name="B"
+        field_name="B",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     bestAskPrice: Decimal = field(metadata=config(
-        field_name="a"
+        field_name="a",
+        encoder=encode_number,
+        decoder=decode_number
     ))
     bestAskQuantity: Decimal = field(metadata=config(
-        field_name="A"
+        field_name="A",
+        encoder=encode_number,
+        decoder=decode_number
     ))
 
 
@@ -357,21 +447,21 @@ class PartialBookDepthData(StreamData):
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     lastUpdateID: int = field(metadata=config(
         field_name="lastUpdateId"
     ))
     bidsUpdated: list[MarketOrder] = field(metadata=config(
         field_name="b",
-        encoder=lambda _: [(__.price, __.qty) for __ in _],
-        decoder=lambda _: [MarketOrder(*__) for __ in _]
+        encoder=MarketOrder.encode_list,
+        decoder=MarketOrder.decode_list
     ))
     asksUpdated: list[MarketOrder] = field(metadata=config(
         field_name="a",
-        encoder=lambda _: [(__.price, __.qty) for __ in _],
-        decoder=lambda _: [MarketOrder(*__) for __ in _]
+        encoder=MarketOrder.encode_list,
+        decoder=MarketOrder.decode_list
     ))
 
 
@@ -383,8 +473,8 @@ class DiffDepthData(StreamData):
     ))
     eventTime: datetime = field(metadata=config(
         field_name="E",
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
     symbol: str = field(metadata=config(
         field_name="s"
@@ -397,13 +487,13 @@ class DiffDepthData(StreamData):
     ))
     bidsUpdated: list[MarketOrder] = field(metadata=config(
         field_name="b",
-        encoder=lambda _: [(__.price, __.qty) for __ in _],
-        decoder=lambda _: [MarketOrder(*__) for __ in _]
+        encoder=MarketOrder.encode_list,
+        decoder=MarketOrder.decode_list
     ))
     asksUpdated: list[MarketOrder] = field(metadata=config(
         field_name="a",
-        encoder=lambda _: [(__.price, __.qty) for __ in _],
-        decoder=lambda _: [MarketOrder(*__) for __ in _]
+        encoder=MarketOrder.encode_list,
+        decoder=MarketOrder.decode_list
     ))
 
 
@@ -422,8 +512,8 @@ class PingRequestFrame(RPCFrame):
     ping: datetime = field(
         default_factory=lambda: datetime.now(),
         metadata=config(
-            encoder=lambda _: int(_.timestamp() * 1000),
-            decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+            encoder=encode_timestamp,
+            decoder=decode_timestamp
         )
     )
 
@@ -432,8 +522,8 @@ class PingRequestFrame(RPCFrame):
 @dataclass
 class PingResponseFrame(RPCFrame):
     pong: datetime = field(metadata=config(
-        encoder=lambda _: int(_.timestamp() * 1000),
-        decoder=lambda _: datetime.fromtimestamp(_ / 1000.0)
+        encoder=encode_timestamp,
+        decoder=decode_timestamp
     ))
 
 
@@ -519,13 +609,23 @@ class SubscriptionListRequest(RPCRequestFrame):
         return SubscriptionListResponse
 
 
+STREAM_DATA_DECODERS: EventDecoders[StreamData] = EventDecoders({
+    WSStreamDataEventTypes.AGGREGATE_TRADE.value: AggregateTradeData,
+    WSStreamDataEventTypes.TRADE.value: TradeData,
+    WSStreamDataEventTypes.KLINE.value: KlineCandlestickData,
+    WSStreamDataEventTypes._24H_MINI_TICKER.value: IndividualSymbolMiniTickerData,
+    WSStreamDataEventTypes._24H_TICKER.value: IndividualSymbolTickerData,
+    WSStreamDataEventTypes.PARTIAL_BOOK_DEPTH.value: PartialBookDepthData,
+    WSStreamDataEventTypes.DIFF_DEPTH.value: DiffDepthData,
+})
+
+
 def unmarshal_frame(
-        json_data: str,
+        json_data: typing.Union[str, bytes],
         expected_response_type: typing.Optional[TRPCFrame] = None,
         expected_response_id: typing.Optional[int] = None
 ) -> WSFrame:
-    print(json_data)
-    received_object = json.loads(json_data)
+    received_object = loads(json_data)
     if (expected_response_type or expected_response_id) and not (expected_response_type and expected_response_id):
         # allow expected_response_type of PingResponseFrame without requiring ID, but resolve all ping requests with
         # the resulting latency, and the server time
@@ -547,20 +647,10 @@ def unmarshal_frame(
         return expected_response_type.from_dict(received_object)
 
     elif not (expected_response_type and expected_response_id):
-        match WSStreamDataEventTypes(received_object["e"]):
-            case WSStreamDataEventTypes.AGGREGATE_TRADE:
-                return AggregateTradeData.from_dict(received_object)
-            case WSStreamDataEventTypes.TRADE:
-                return TradeData.from_dict(received_object)
-            case WSStreamDataEventTypes.KLINE:
-                return KlineCandlestickData.from_dict(received_object)
-            case WSStreamDataEventTypes._24H_MINI_TICKER:
-                return IndividualSymbolMiniTickerData.from_dict(received_object)
-            case WSStreamDataEventTypes._24H_TICKER:
-                return IndividualSymbolTickerData.from_dict(received_object)
-            case WSStreamDataEventTypes.PARTIAL_BOOK_DEPTH:
-                return PartialBookDepthData.from_dict(received_object)
-            case WSStreamDataEventTypes.DIFF_DEPTH:
-                return DiffDepthData.from_dict(received_object)
+        if "e" in received_object:
+            return STREAM_DATA_DECODERS.decode(received_object)
+        if "u" in received_object and "s" in received_object:
+            # the book ticker is the only stream without an event type
+            return model_class(IndividualSymbolBookTickerData).from_dict(received_object)
 
     raise ValueError(f"Unable to unmarshal received frame: {json_data}")
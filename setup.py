@@ -13,6 +13,15 @@ setup(
         "websockets~=11.0.3"
     ],
     extras_require={
+        "fast": [
+            "orjson~=3.8.3"
+        ],
+        "msgspec": [
+            "msgspec>=0.18"
+        ],
+        "brotli": [
+            "Brotli>=1.0.9"
+        ],
         "test": [
             "pytest==7.4.0",
             "pytest-dotenv==0.5.2",
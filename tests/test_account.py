@@ -0,0 +1,165 @@
+import asyncio
+import json
+import time
+from decimal import Decimal
+
+import pytest
+
+from cpro.client.account import AccountState, AsyncAccountStateEngine, BlockingAccountStateEngine
+from cpro.client.rest import AsyncIOHTTPClient, BlockingHTTPClient
+from cpro.exception import CoinsAPIException, HTTPException
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import OrderStatus
+from cpro.models.rest.response import AccountInformationResponse, CurrentOpenOrdersResponse
+from tests.utils import _order_update
+
+ACCOUNT = {
+    "canTrade": True, "canWithdraw": True, "canDeposit": True, "accountType": "SPOT", "updateTime": 1000,
+    "balances": [
+        {"asset": "BTC", "free": "1.5", "locked": "0.5"},
+        {"asset": "PHP", "free": "1000", "locked": "0"},
+    ]
+}
+OPEN_ORDER = {
+    "symbol": "BTCPHP", "orderId": 1, "clientOrderId": "first", "time": 900, "updateTime": 900, "price": "100",
+    "origQty": "0.5", "executedQty": "0", "cummulativeQuoteQty": "0", "status": "NEW", "timeInForce": "GTC",
+    "type": "LIMIT", "side": "SELL", "stopPrice": "0", "origQuoteOrderQty": "0", "isWorking": True
+}
+
+
+def _seeded() -> AccountState:
+    state = AccountState()
+    state.reconcile_balances(AccountInformationResponse.from_dict(ACCOUNT))
+    state.reconcile_orders("BTCPHP", CurrentOpenOrdersResponse.from_dict([OPEN_ORDER]), requested_at=1000)
+    return state
+
+
+def test_orders_follow_events_in_order():
+    state = _seeded()
+    assert state.order(1).clientOrderID == "first"
+
+    assert state.apply(_order_update(2, "NEW", 1100))
+    assert state.order_by_client_id("second").status == OrderStatus.NEW
+    assert state.apply(_order_update(2, "FILLED", 1200))
+    assert not state.apply(_order_update(2, "PARTIALLY_FILLED", 1150))  # late event of a closed order
+    assert state.order(2) is None and [order.orderID for order in state.open_orders("BTCPHP")] == [1]
+
+    # missing from a later snapshot, so it was closed while the stream was away
+    state.reconcile_orders("BTCPHP", CurrentOpenOrdersResponse.from_dict([]), requested_at=2000)
+    assert state.open_orders("BTCPHP") == [] and state.order_by_client_id("first") is None
+
+
+def test_balances_by_update_time():
+    structs = pytest.importorskip("cpro.models.structs")
+    state = _seeded()
+    assert state.free("BTC") == Decimal("1.5")
+
+    assert state.apply(structs.decode_stream_data(json.dumps({
+        "e": "balanceUpdate", "E": 1200, "a": "PHP", "d": "-100", "T": 1100
+    })))
+    assert state.free("PHP") == Decimal(900)
+    assert state.apply(structs.decode_stream_data(json.dumps({
+        "e": "outboundAccountPosition", "E": 1300, "u": 1300, "B": [{"a": "BTC", "f": "1", "l": "1"}]
+    })))
+    assert state.balance("BTC").locked == Decimal(1)
+
+    # an older snapshot does not roll back newer balances
+    state.reconcile_balances(AccountInformationResponse.from_dict(ACCOUNT))
+    assert state.free("BTC") == Decimal(1) and state.free("PHP") == Decimal(900)
+
+
+class _SnapshotClient(AsyncIOHTTPClient):
+    async def do_request(self, request, request_payload=None):
+        if request is APIEndpoints.GET_ACCOUNT_INFORMATION.value:
+            return AccountInformationResponse.from_dict(ACCOUNT)
+        return CurrentOpenOrdersResponse.from_dict([OPEN_ORDER])
+
+
+class _ReplayedStream:
+    def __init__(self, events):
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        pass
+
+    async def __aiter__(self):
+        for event in self.events:
+            await asyncio.sleep(0)
+            yield event
+        await asyncio.Event().wait()  # stays connected
+
+
+@pytest.mark.asyncio
+async def test_async_engine():
+    placed_at = time.time_ns() // 1_000_000 + 60_000  # after the snapshot was requested
+    engine = AsyncAccountStateEngine(
+        _SnapshotClient(), _ReplayedStream([_order_update(2, "NEW", placed_at)]), ["BTCPHP"]
+    )
+    await engine.start()
+    try:
+        await asyncio.sleep(0.01)
+        assert engine.state.free("PHP") == Decimal(1000)
+        assert {order.orderID for order in engine.state.open_orders("BTCPHP")} == {1, 2}
+    finally:
+        await engine.stop()
+
+
+class _RejectingClient(AsyncIOHTTPClient):
+    async def do_request(self, request, request_payload=None):
+        raise CoinsAPIException(-2015, "Invalid API-key, IP, or permissions for action.")
+
+
+@pytest.mark.asyncio
+async def test_async_engine_raises_first_reconcile():
+    engine = AsyncAccountStateEngine(_RejectingClient(), _ReplayedStream([]), ["BTCPHP"])
+    with pytest.raises(CoinsAPIException):
+        await asyncio.wait_for(engine.start(), timeout=5)
+    assert engine._task.done()
+
+
+class _FailingAfterSnapshotClient(BlockingHTTPClient):
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    def do_request(self, request, request_payload=None):
+        self.requests += 1
+        if self.requests > 2:  # the first snapshot, then the gateway goes down
+            raise HTTPException("<html>Bad Gateway</html>", {}, 502)
+        if request is APIEndpoints.GET_ACCOUNT_INFORMATION.value:
+            return AccountInformationResponse.from_dict(ACCOUNT)
+        return CurrentOpenOrdersResponse.from_dict([OPEN_ORDER])
+
+
+class _TickingStream:
+    def __init__(self, events):
+        self.events = events
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def __iter__(self):
+        for event in self.events:
+            time.sleep(0.01)
+            yield event
+
+
+def test_blocking_engine_survives_periodic_reconcile():
+    placed_at = time.time_ns() // 1_000_000 + 60_000
+    events = [_order_update(2, "NEW", placed_at + i) for i in range(20)]
+    client = _FailingAfterSnapshotClient()
+    engine = BlockingAccountStateEngine(client, _TickingStream(events), ["BTCPHP"], reconcile_interval=0.02)
+    engine.start()
+    try:
+        time.sleep(0.3)
+        assert engine._thread.is_alive() and engine._error is None
+        assert client.requests > 3  # reconciled again after failing
+        assert {order.orderID for order in engine.state.open_orders("BTCPHP")} == {1, 2}
+    finally:
+        engine.stop()
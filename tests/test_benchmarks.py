@@ -0,0 +1,30 @@
+import warnings
+
+from benchmarks import suite
+
+
+def test_fixtures_decode():
+    benchmarks = {
+        **suite.encode_benchmarks(), **suite.sign_benchmarks(), **suite.decode_benchmarks(),
+        **suite.stream_benchmarks(), **suite.filter_benchmarks()
+    }
+    assert len([name for name in benchmarks if name.startswith("decode/")]) == 48
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for fn in benchmarks.values():
+            fn()
+
+
+def test_transport_against_stub():
+    with suite.StubServer() as server:
+        results = suite.transport_results(server.base_url, repeat=1)
+    assert set(results) == {
+        "transport/blocking/GET_ORDER_BOOK", "transport/async/GET_ORDER_BOOK",
+        "transport/blocking/NEW_ORDER", "transport/async/NEW_ORDER",
+    }
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"a": {"ops_per_sec": 100}, "b": {"ops_per_sec": 100}}}
+    results = {"results": {"a": {"ops_per_sec": 95}, "b": {"ops_per_sec": 80}, "c": {"ops_per_sec": 1}}}
+    assert suite.compare(baseline, results, threshold=0.1) == ["b"]
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from cpro.client.breaker import BreakerState, CircuitBreakers, CircuitOpenException, EndpointGroup, endpoint_group
+from cpro.exception import CoinsAPIException
+from cpro.models.rest.endpoints import APIEndpoints
+
+
+def _reset():
+    raise ConnectionResetError()
+
+
+def test_endpoint_groups():
+    assert endpoint_group(APIEndpoints.GET_ORDER_BOOK.value) == EndpointGroup.MARKET_DATA
+    assert endpoint_group(APIEndpoints.NEW_ORDER.value) == EndpointGroup.TRADING
+    assert endpoint_group(APIEndpoints.REQUEST_WITHDRAWAL.value) == EndpointGroup.WALLET
+    assert endpoint_group(APIEndpoints.FIAT_REQUEST_CASH_OUT.value) == EndpointGroup.FIAT
+    assert endpoint_group(APIEndpoints.CONVERSION_GET_QUOTE.value) == EndpointGroup.CONVERT
+
+
+def test_trips_per_group_and_recovers():
+    changes = []
+    breakers = CircuitBreakers(
+        window=4, min_calls=4, open_duration=0.05, on_state_change=lambda *change: changes.append(change)
+    )
+    market_data = breakers.for_endpoint(APIEndpoints.GET_ORDER_BOOK.value)
+    trading = breakers.for_endpoint(APIEndpoints.NEW_ORDER.value)
+
+    market_data.call(lambda: None)
+    for _ in range(3):
+        with pytest.raises(ConnectionResetError):
+            market_data.call(_reset)
+    assert market_data.state == BreakerState.OPEN
+    with pytest.raises(CircuitOpenException):
+        market_data.call(lambda: None)
+    assert trading.call(lambda: "placed") == "placed"  # not blocked by market data
+
+    # errors of the request itself say nothing about the exchange's health
+    for _ in range(4):
+        with pytest.raises(CoinsAPIException):
+            trading.call(lambda: (_ for _ in ()).throw(CoinsAPIException(-2010, "Insufficient balance")))
+    assert trading.state == BreakerState.CLOSED
+
+    time.sleep(0.06)
+    market_data.call(lambda: None)  # the half-open probe
+    assert market_data.state == BreakerState.CLOSED
+    assert [(group, new) for group, _, new in changes] == [
+        (EndpointGroup.MARKET_DATA, BreakerState.OPEN),
+        (EndpointGroup.MARKET_DATA, BreakerState.HALF_OPEN),
+        (EndpointGroup.MARKET_DATA, BreakerState.CLOSED),
+    ]
+    assert breakers.snapshot()["MARKET_DATA"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_trip():
+    breaker = CircuitBreakers(window=2, min_calls=2, slow_call_duration=0.01, open_duration=0.05)[EndpointGroup.FIAT]
+    for _ in range(2):
+        await breaker.call_async(asyncio.sleep, 0.02)
+    assert breaker.state == BreakerState.OPEN
+
+    await asyncio.sleep(0.06)
+    probe = asyncio.create_task(breaker.call_async(asyncio.sleep, 0.02))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenException):  # only one probe at a time
+        await breaker.call_async(asyncio.sleep, 0)
+    await probe
+    assert breaker.state == BreakerState.OPEN  # the probe was slow too
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe():
+    breaker = CircuitBreakers(window=2, min_calls=2, open_duration=0.05)[EndpointGroup.TRADING]
+    for _ in range(2):
+        with pytest.raises(ConnectionResetError):
+            await breaker.call_async(asyncio.to_thread, _reset)
+    assert breaker.state == BreakerState.OPEN
+
+    await asyncio.sleep(0.06)
+    probe = asyncio.create_task(breaker.call_async(asyncio.sleep, 1))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    # a cancelled probe proves nothing, the circuit stays half-open with the probe given back
+    assert breaker.state == BreakerState.HALF_OPEN
+    with pytest.raises(ConnectionResetError):
+        await breaker.call_async(asyncio.to_thread, _reset)
+    assert breaker.state == BreakerState.OPEN
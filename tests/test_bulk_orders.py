@@ -0,0 +1,100 @@
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+from aiohttp import web
+
+from cpro.client.ratelimit import AsyncRateLimiter
+from cpro.client.rest import APICredentials, AsyncIOHTTPClient
+from cpro.exception import CoinsAPIException
+from cpro.models.rest.enums import OrderSides, OrderTypes, OrderResponseTypes
+from cpro.models.rest.request import NewOrderRequest
+from cpro.models.rest.response import NewOrderACKResponse
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter():
+    limiter = AsyncRateLimiter(50, burst=5)
+    started = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(10)))
+    # 5 at once, then the other 5 at 50 per second
+    assert 0.08 <= time.monotonic() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_submit_orders():
+    async def new_order(request: web.Request) -> web.Response:
+        client_order_id = request.query["newClientOrderId"]
+        if client_order_id == "rejected":
+            return web.json_response({"code": -1013, "msg": "Filter failure: PRICE_FILTER"})
+        return web.json_response({
+            "symbol": request.query["symbol"], "orderId": int(client_order_id), "clientOrderId": client_order_id,
+            "transactTime": 1000
+        })
+
+    app = web.Application()
+    app.router.add_post("/openapi/v1/order", new_order)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+
+    async with AsyncIOHTTPClient(APICredentials("key", "secret")) as client:
+        client.API_BASE_URL = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+        orders = [
+            NewOrderRequest(
+                "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT, quantity=Decimal(1), price=Decimal(90 + i),
+                newClientOrderId=str(i), newOrderRespType=OrderResponseTypes.ACK
+            )
+            for i in range(1, 20)
+        ]
+        orders[4] = NewOrderRequest(
+            "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT, newClientOrderId="rejected",
+            newOrderRespType=OrderResponseTypes.ACK
+        )
+        orders[7] = object()  # not an order, fails before being sent
+
+        futures = client.submit_orders(orders, limiter=AsyncRateLimiter(1000))
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+    await runner.cleanup()
+    assert isinstance(results[4], CoinsAPIException) and isinstance(results[7], ValueError)
+    placed = [result for result in results if isinstance(result, NewOrderACKResponse)]
+    assert [result.orderId for result in placed] == [i for i in range(1, 20) if i not in (5, 8)]
+
+
+@pytest.mark.asyncio
+async def test_submit_orders_beyond_burst():
+    async def new_order(request: web.Request) -> web.Response:
+        # the exchange rejects orders signed longer than `recvWindow` ago
+        if time.time() * 1000 - int(request.query["timestamp"]) > int(request.query["recvWindow"]):
+            return web.json_response({"code": -1021, "msg": "Timestamp for this request is outside of the recvWindow."})
+        client_order_id = request.query["newClientOrderId"]
+        return web.json_response({
+            "symbol": request.query["symbol"], "orderId": int(client_order_id), "clientOrderId": client_order_id,
+            "transactTime": 1000
+        })
+
+    app = web.Application()
+    app.router.add_post("/openapi/v1/order", new_order)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+
+    async with AsyncIOHTTPClient(APICredentials("key", "secret")) as client:
+        client.API_BASE_URL = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+        orders = [
+            NewOrderRequest(
+                "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT, quantity=Decimal(1), price=Decimal(90 + i),
+                newClientOrderId=str(i), newOrderRespType=OrderResponseTypes.ACK, recvWindow=150
+            )
+            for i in range(1, 9)
+        ]
+        # 2 at once, then the other 6 over 300ms, twice the recvWindow of the orders
+        futures = client.submit_orders(orders, limiter=AsyncRateLimiter(20, burst=2))
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+    await runner.cleanup()
+    assert [result.orderId for result in results] == list(range(1, 9))
@@ -0,0 +1,49 @@
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+
+import pytest
+from dataclasses_json import dataclass_json
+
+from cpro import codec
+from cpro.models.ws_stream import StreamSubscribeRequest, TradeData, WSFrame, unmarshal_frame
+from tests.utils import TRADE
+
+
+@pytest.fixture(params=list(codec.CODECS))
+def json_codec(request):
+    try:
+        selected = codec.set_codec(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+    yield selected
+    codec.set_codec(None)
+
+
+def test_codec_round_trip(json_codec):
+    assert json_codec.loads(json.dumps(TRADE).encode()) == TRADE
+    assert json_codec.loads(memoryview(json.dumps(TRADE).encode())) == TRADE
+    assert json.loads(json_codec.dumps(TRADE)) == TRADE
+
+
+def test_frames_use_codec(json_codec):
+    trade = unmarshal_frame(json.dumps(TRADE).encode())
+    assert trade == TradeData.from_dict(TRADE)
+
+    request = StreamSubscribeRequest(params=["bnbbtc@trade"], id=1)
+    assert request.to_json() == '{"params":["bnbbtc@trade"],"method":"SUBSCRIBE","id":1}'
+    assert json.loads(request.to_json()) == json.loads(request.to_json(indent=None))
+
+
+def test_decimals_in_plain_notation(json_codec):
+    assert json_codec.dumps({"values": [Decimal("1E-8"), Decimal("1E+6")]}) == '{"values":["0.00000001","1000000"]}'
+
+
+def test_later_frames_use_codec(json_codec):
+    @dataclass_json
+    @dataclass
+    class CustomFrame(WSFrame):
+        amount: Decimal
+
+    assert CustomFrame.to_json is WSFrame.to_json
+    assert CustomFrame(Decimal("1.5")).to_json() == '{"amount":"1.5"}'
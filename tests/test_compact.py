@@ -0,0 +1,33 @@
+import dataclasses
+import json
+import pickle
+
+import pytest
+
+from cpro.models.binary import pack_model, unpack_model
+from cpro.models.compact import compact, original
+from cpro.models.options import DecodeOptions, decode_options
+from cpro.models.ws_stream import TradeData, KlineCandlestickData, GraphPointData, StreamData, unmarshal_frame
+from tests.utils import TRADE, KLINE
+
+
+def test_compact_matches_model():
+    trade = compact(TradeData).from_dict(TRADE)
+    assert not hasattr(trade, "__dict__")
+    assert isinstance(trade, TradeData) and isinstance(trade, StreamData)
+    assert original(type(trade)) is TradeData
+    assert trade.to_dict() == TradeData.from_dict(TRADE).to_dict()
+    assert json.loads(trade.to_json()) == json.loads(TradeData.from_dict(TRADE).to_json())
+    assert pickle.loads(pickle.dumps(trade)) == trade
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        trade.symbol = "ETHBTC"
+
+
+def test_compact_nested_and_binary():
+    with decode_options(DecodeOptions(compact_models=True)):
+        kline = unmarshal_frame(json.dumps(KLINE))
+    assert type(kline) is compact(KlineCandlestickData)
+    assert type(kline.dataPoint) is compact(GraphPointData)
+
+    unpacked = unpack_model(pack_model(kline))
+    assert type(unpacked) is type(kline) and unpacked == kline
@@ -0,0 +1,82 @@
+import gzip
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from aiohttp import web
+
+from cpro.client.compression import decompressor
+from cpro.client.rest import AsyncIOHTTPClient, BlockingHTTPClient
+from cpro.codec import dumps_bytes
+from cpro.models.rest.endpoints import APIEndpoints
+from tests.utils import EXCHANGE_INFORMATION
+
+BODY = dumps_bytes(EXCHANGE_INFORMATION)
+
+
+@pytest.mark.parametrize("encoding, compressed", [
+    ("gzip", gzip.compress(BODY)),
+    ("deflate", zlib.compress(BODY)),
+    ("deflate", zlib.compress(BODY)[2:-4]),  # raw deflate, without the zlib header
+])
+def test_streaming_decompression(encoding: str, compressed: bytes):
+    decoder = decompressor(encoding)
+    body = b"".join(decoder.decompress(compressed[i:i + 7]) for i in range(0, len(compressed), 7))
+    assert body + decoder.flush() == BODY
+    assert decompressor(None) is None
+    with pytest.raises(ValueError):
+        decompressor("zstd")
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        assert "gzip" in self.headers["Accept-Encoding"]
+        body = gzip.compress(BODY)
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+def test_blocking_client_decompresses():
+    server = ThreadingHTTPServer(("localhost", 0), _GzipHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = BlockingHTTPClient()
+    client.API_BASE_URL = f"http://localhost:{server.server_address[1]}"
+    try:
+        assert APIEndpoints.GET_EXCHANGE_INFO.execute(client).symbols[0].symbol == "COIN0PHP"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_decompresses():
+    async def exchange_information(request: web.Request) -> web.Response:
+        assert "gzip" in request.headers["Accept-Encoding"]
+        response = web.Response(body=BODY, content_type="application/json")
+        response.enable_compression()
+        return response
+
+    app = web.Application()
+    app.router.add_get(APIEndpoints.GET_EXCHANGE_INFO.value.endpoint, exchange_information)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    base_url = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+    async with AsyncIOHTTPClient() as client:
+        client.API_BASE_URL = base_url
+        assert (await APIEndpoints.GET_EXCHANGE_INFO.execute_async(client)).symbols[0].symbol == "COIN0PHP"
+
+    # outside of a context, the session only lives for the request
+    client = AsyncIOHTTPClient()
+    client.API_BASE_URL = base_url
+    assert (await APIEndpoints.GET_EXCHANGE_INFO.execute_async(client)).symbols[0].symbol == "COIN0PHP"
+    assert client._session is None
+    await runner.cleanup()
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from aiohttp import web
+
+from cpro.client.deadline import deadline, remaining
+from cpro.client.rest import APICredentials, AsyncIOHTTPClient, BlockingHTTPClient
+from cpro.exception import DeadlineExceeded
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.request import OrderBookRequest, QuerySingleOrderRequest
+
+
+class _RecordingClient(BlockingHTTPClient):
+    def _send(self, request, request_payload, url, *_):
+        return parse_qs(urlsplit(url).query)
+
+
+def test_deadlines_nest():
+    assert remaining() is None
+    with deadline(10):
+        with deadline(20):
+            assert 9 < remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+    assert remaining() is None
+
+
+def test_recv_window_follows_deadline():
+    client = _RecordingClient(APICredentials("key", "secret"))
+    query = client.do_request(APIEndpoints.QUERY_ORDER.value, QuerySingleOrderRequest(orderId=1))
+    assert "recvWindow" not in query
+
+    with deadline(2):
+        query = client.do_request(APIEndpoints.QUERY_ORDER.value, QuerySingleOrderRequest(orderId=1))
+        assert 1900 <= int(query["recvWindow"][0]) <= 2000
+        # a tighter window given by the caller is kept
+        query = client.do_request(APIEndpoints.QUERY_ORDER.value, QuerySingleOrderRequest(orderId=1, recvWindow=500))
+        assert query["recvWindow"] == ["500"]
+
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            client.do_request(APIEndpoints.QUERY_ORDER.value, QuerySingleOrderRequest(orderId=1))
+
+
+class _SlowBody(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "100")
+        self.end_headers()
+        self.wfile.write(b"{")
+        self.wfile.flush()
+        time.sleep(1)  # the body trickles in after the headers
+
+    def log_message(self, *_):
+        pass
+
+
+def test_blocking_body_read_within_deadline():
+    server = ThreadingHTTPServer(("localhost", 0), _SlowBody)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = BlockingHTTPClient()
+    client.API_BASE_URL = f"http://localhost:{server.server_address[1]}"
+    try:
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded), deadline(0.2):
+            APIEndpoints.GET_ORDER_BOOK.execute(client, OrderBookRequest("BTCPHP"))
+        assert time.monotonic() - started < 0.5
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _TricklingBody(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "100")
+        self.end_headers()
+        # every read gets a byte well within the timeout, the whole body does not
+        for _ in range(100):
+            self.wfile.write(b" ")
+            self.wfile.flush()
+            time.sleep(0.02)
+
+    def log_message(self, *_):
+        pass
+
+
+def test_blocking_trickling_body():
+    server = ThreadingHTTPServer(("localhost", 0), _TricklingBody)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = BlockingHTTPClient()
+    client.API_BASE_URL = f"http://localhost:{server.server_address[1]}"
+    client.timeouts[APIEndpoints.GET_ORDER_BOOK.value] = 0.2
+    try:
+        started = time.monotonic()
+        with pytest.raises(TimeoutError) as raised:
+            APIEndpoints.GET_ORDER_BOOK.execute(client, OrderBookRequest("BTCPHP"))
+        assert not isinstance(raised.value, DeadlineExceeded) and time.monotonic() - started < 0.5
+
+        del client.timeouts[APIEndpoints.GET_ORDER_BOOK.value]
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded), deadline(0.2):
+            APIEndpoints.GET_ORDER_BOOK.execute(client, OrderBookRequest("BTCPHP"))
+        assert time.monotonic() - started < 0.5
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_async_timeouts():
+    async def depth(_: web.Request) -> web.Response:
+        await asyncio.sleep(1)
+        return web.json_response({"lastUpdateId": 1, "bids": [], "asks": []})
+
+    app = web.Application()
+    app.router.add_get("/openapi/quote/v1/depth", depth)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+
+    async with AsyncIOHTTPClient(timeouts={APIEndpoints.GET_ORDER_BOOK: 0.1}) as client:
+        client.API_BASE_URL = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError) as error:
+            await APIEndpoints.GET_ORDER_BOOK.execute_async(client, OrderBookRequest("BTCPHP"))
+        # the endpoint was slow, the caller had no deadline to miss
+        assert not isinstance(error.value, DeadlineExceeded) and time.monotonic() - started < 0.5
+
+        with pytest.raises(DeadlineExceeded), deadline(0.05):
+            await APIEndpoints.GET_ORDER_BOOK.execute_async(client, OrderBookRequest("BTCPHP"))
+    await runner.cleanup()
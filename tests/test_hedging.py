@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from cpro.client.hedging import HedgePolicy
+from cpro.client.ratelimit import AsyncRateLimiter
+from cpro.client.rest import AsyncIOHTTPClient
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.request import OrderBookRequest
+
+ORDER_BOOK = APIEndpoints.GET_ORDER_BOOK.value
+
+
+def test_only_safe_endpoints():
+    with pytest.raises(ValueError):
+        HedgePolicy([APIEndpoints.GET_ORDER_BOOK, APIEndpoints.QUERY_ORDER])
+    with pytest.raises(ValueError):
+        HedgePolicy([APIEndpoints.CANCEL_ORDER])
+
+
+@pytest.mark.asyncio
+async def test_slow_requests_are_hedged():
+    served = []
+
+    async def depth(_: web.Request) -> web.Response:
+        served.append(time.monotonic())
+        if len(served) % 2:
+            await asyncio.sleep(1)  # every other request hangs
+        return web.json_response({"lastUpdateId": len(served), "bids": [["100", "1"]], "asks": [["101", "2"]]})
+
+    app = web.Application()
+    app.router.add_get("/openapi/quote/v1/depth", depth)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+
+    hedging = HedgePolicy(initial_delay=0.02, reserve=1, limiter=AsyncRateLimiter(100))
+    async with AsyncIOHTTPClient(hedging=hedging) as client:
+        client.API_BASE_URL = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+        started = time.monotonic()
+        book = await APIEndpoints.GET_ORDER_BOOK.execute_async(client, OrderBookRequest("BTCPHP"))
+        assert book.lastUpdateId == 2 and time.monotonic() - started < 0.5
+
+        # out of hedge budget, so the next slow request is waited out
+        await APIEndpoints.GET_ORDER_BOOK.execute_async(client, OrderBookRequest("BTCPHP"))
+    await runner.cleanup()
+
+    assert hedging.stats[ORDER_BOOK].snapshot() == {"requests": 2, "hedged": 1, "won": 1, "throttled": 1}
+    # the cancelled primary counts too
+    assert hedging.latencies[ORDER_BOOK].count == 3
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_keeps_slow_tail():
+    hedging = HedgePolicy(min_samples=10, initial_delay=0.01, ratio=1, reserve=100)
+    calls = []
+
+    async def send(_, delay):
+        calls.append(delay)
+        # every primary is slow, every hedge fast
+        await asyncio.sleep(delay if len(calls) % 2 else 0)
+        return delay
+
+    for _ in range(10):
+        assert await hedging.run(send, ORDER_BOOK, 0.05) == 0.05
+    await asyncio.sleep(0)  # lets the last primary unwind its cancellation
+    # the primaries, cancelled at ~10ms, keep the delay from sinking to the fast hedges' latency
+    assert hedging.latencies[ORDER_BOOK].count == 20
+    assert hedging.delay(ORDER_BOOK) >= 0.01
@@ -0,0 +1,51 @@
+import warnings
+
+from benchmarks.suite import load_fixture
+from cpro.client.rest import BlockingHTTPClient
+from cpro.models.lazy import lazy, LazyList
+from cpro.models.options import DecodeOptions, NumericMode, decode_options
+from cpro.models.rest import response
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.response import ExchangeInformationResponse, DailyTickerResponse
+from tests.utils import EXCHANGE_INFORMATION
+
+
+def test_lazy_response_decodes_on_access():
+    response = lazy(ExchangeInformationResponse).from_dict(EXCHANGE_INFORMATION)
+    assert isinstance(response, ExchangeInformationResponse)
+    assert isinstance(response.symbols, LazyList) and len(response.symbols) == 200
+
+    symbol = response.symbols.find(symbol="COIN42PHP")
+    assert symbol.baseAsset == "COIN42"
+    assert response.symbols[42] is symbol
+    assert [i for i, item in enumerate(response.symbols._items) if type(item) is type(symbol)] == [42]
+    assert symbol.filters[0].tickSize == symbol.filters[0].minPrice
+
+    assert response.to_dict() == ExchangeInformationResponse.from_dict(EXCHANGE_INFORMATION).to_dict()
+
+
+def test_lazy_equals_eager():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for name, data in load_fixture("rest_responses").items():
+            model = getattr(response, name)
+            eager, deferred = model.from_dict(data), lazy(model).from_dict(data)
+            assert deferred == eager and eager == deferred, name
+
+
+def test_lazy_keeps_decode_options():
+    tickers = [{
+        "symbol": "BTCPHP", "priceChange": "1.5", "priceChangePercent": "0.1", "weightedAvgPrice": "1", "prevClosePrice": "1",
+        "lastPrice": "1", "lastQty": "1", "bidPrice": "1", "bidQty": "1", "askPrice": "1", "askQty": "1",
+        "openPrice": "1", "highPrice": "1", "lowPrice": "1", "volume": "1", "quoteVolume": "1",
+        "openTime": 1672515782136, "closeTime": 1672515782136, "firstId": 1, "lastId": 2, "count": 2
+    }]
+    with decode_options(DecodeOptions(numeric_mode=NumericMode.FLOAT)):
+        response = lazy(DailyTickerResponse).from_dict(tickers)
+    assert response.tickers[0].priceChange == 1.5
+
+
+def test_client_lazy_responses():
+    client = BlockingHTTPClient(decode_options=DecodeOptions(lazy_responses=True))
+    response = client.decode_response(APIEndpoints.GET_EXCHANGE_INFO.value, None, EXCHANGE_INFORMATION)
+    assert type(response) is lazy(ExchangeInformationResponse)
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from cpro.client.metrics import LatencyHistogram, LatencyMetrics
+from cpro.client.recorder import FrameReplayer
+from cpro.client.wss import AsyncIOWSClient
+from cpro.models.options import RawMode
+from cpro.models.ws_stream import TradeData
+from tests.utils import TRADE, _record
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 10001):
+        histogram.record(value)
+
+    assert histogram.count == 10000
+    for percentile in (50, 90, 99):
+        expected = percentile * 100
+        assert expected <= histogram.percentile(percentile) <= expected * 1.125
+    assert histogram.percentile(100) == 10000
+
+
+def test_observe_corrects_clock_offset():
+    metrics = LatencyMetrics()
+    # server clock is 250ms ahead of ours, round trip of 10ms
+    metrics.update_clock_offset(server_time_ms=1_000_255, sent_ns=1_000_000_000_000, received_ns=1_000_010_000_000)
+    assert metrics.clock_offset_ms == pytest.approx(250)
+
+    trade = TradeData.from_dict({**TRADE, "E": 1_000_270, "T": 1_000_250})
+    received_ns = 1_000_030_000_000  # 1_000_280 in server time
+    metrics.observe(trade, received_ns, received_ns + 50_000, received_ns + 80_000)
+
+    stream = metrics.streams["bnbbtc@trade"]
+    assert stream.network.max == pytest.approx(10_000, rel=0.01)
+    assert stream.trade.max == pytest.approx(30_000, rel=0.01)
+    assert stream.decode.max == 50
+    assert stream.handoff.max == 30
+    assert metrics.degraded(threshold_ms=5) == ["bnbbtc@trade"]
+    assert metrics.degraded(threshold_ms=50) == []
+
+
+@pytest.mark.asyncio
+async def test_client_reports_metrics(tmp_path):
+    _record(str(tmp_path), count=10)
+    metrics = LatencyMetrics()
+
+    async with FrameReplayer(str(tmp_path)).serve(speed=None) as server:
+        client = AsyncIOWSClient("bnbbtc@trade", metrics=metrics)
+        client.BASE_URL = f"ws://localhost:{server.sockets[0].getsockname()[1]}/"
+        async with client:
+            async for _ in client.listen():
+                pass
+
+    assert metrics.snapshot()["streams"]["bnbbtc@trade"]["decode"]["count"] == 10
+
+
+@pytest.mark.asyncio
+async def test_client_observes_before_delivering(tmp_path):
+    _record(str(tmp_path), count=10)
+    metrics = LatencyMetrics()
+
+    async with FrameReplayer(str(tmp_path)).serve(speed=None) as server:
+        client = AsyncIOWSClient("bnbbtc@trade", metrics=metrics)
+        client.BASE_URL = f"ws://localhost:{server.sockets[0].getsockname()[1]}/"
+        async with client:
+            async for _ in client.listen():
+                break
+
+    assert metrics.snapshot()["streams"]["bnbbtc@trade"]["decode"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_handoff_measures_consumer(tmp_path):
+    _record(str(tmp_path), count=4)
+    metrics = LatencyMetrics()
+
+    async with FrameReplayer(str(tmp_path)).serve(speed=None) as server:
+        client = AsyncIOWSClient("bnbbtc@trade", metrics=metrics)
+        client.BASE_URL = f"ws://localhost:{server.sockets[0].getsockname()[1]}/"
+        async with client:
+            received = 0
+            async for _ in client.listen():
+                received += 1
+                if received == 3:
+                    break
+                await asyncio.sleep(0.02)
+            # frames listened to raw carry no model to observe
+            async for _ in client.listen(raw=RawMode.JSON):
+                break
+
+    stream = metrics.streams["bnbbtc@trade"]
+    assert stream.decode.count == 3 and stream.handoff.count == 2
+    assert stream.handoff.min >= 20_000
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+import pytest
+from dataclasses_json import DataClassJsonMixin
+
+from cpro.models.options import DecodeOptions, NumericMode, decode_options
+from cpro.models.rest.request import NewOrderRequest, CoinsPHWithdrawRequest
+from cpro.models.rest.enums import OrderSides, OrderTypes
+from cpro.models.ws_stream import TradeData, DiffDepthData
+from tests.utils import TRADE, DIFF_DEPTH
+
+
+@pytest.mark.parametrize("mode, price, qty", [
+    (NumericMode.DECIMAL, Decimal("0.0024"), Decimal("10")),
+    (NumericMode.FLOAT, 0.0024, 10.0),
+    (NumericMode.SCALED, 240000, 1000000000),
+])
+def test_numeric_modes_round_trip(mode, price, qty):
+    with decode_options(DecodeOptions(numeric_mode=mode)):
+        depth = DiffDepthData.from_dict(DIFF_DEPTH)
+        trade = TradeData.from_dict(TRADE)
+        assert DiffDepthData.from_dict(depth.to_dict()) == depth
+        assert TradeData.from_json(trade.to_json()) == trade
+
+    bid = depth.bidsUpdated[0]
+    assert (bid.price, bid.qty) == (price, qty)
+    assert type(bid.price) is type(price)
+
+
+def test_scaled_for_symbol():
+    class Symbol:
+        baseAssetPrecision = 2
+        quoteAssetPrecision = 4
+
+    options = DecodeOptions(numeric_mode=NumericMode.SCALED).for_symbol(Symbol)
+    with decode_options(options):
+        trade = TradeData.from_dict({**TRADE, "p": "-1.5", "q": "1E+2"})
+        assert (trade.price, trade.quantity) == (-15000, 1000000)
+        assert trade.to_dict()["p"] == "-1.5000"
+
+
+def test_request_plain_notation():
+    request = NewOrderRequest(
+        symbol="BTCPHP", side=OrderSides.BUY, type=OrderTypes.LIMIT, quantity=Decimal("1E-8"), price=Decimal("1E+6")
+    )
+    params = request.to_encoded().raw_params
+    assert (params["quantity"], params["price"]) == ("0.00000001", "1000000")
+
+
+def test_request_int_amounts():
+    request = NewOrderRequest(symbol="BTCPHP", side=OrderSides.BUY, type=OrderTypes.LIMIT, quantity=1, price=3000000)
+    params = request.to_encoded().raw_params
+    assert (params["quantity"], params["price"]) == ("1", "3000000")
+    assert CoinsPHWithdrawRequest("PHP", 500, "w-1").to_encoded().raw_params["amount"] == "500"
+
+    # only scaled ints are taken as such
+    with decode_options(DecodeOptions(numeric_mode=NumericMode.SCALED)):
+        params = request.to_encoded().raw_params
+    assert (params["quantity"], params["price"]) == ("0.00000001", "0.03000000")
+
+
+def test_only_prices_and_amounts_follow_mode():
+    @dataclass
+    class Foreign(DataClassJsonMixin):
+        value: Decimal
+
+    with decode_options(DecodeOptions(numeric_mode=NumericMode.SCALED)):
+        trade = TradeData.from_dict({**TRADE, "b": 1234567890123456789})
+        foreign = Foreign.from_dict({"value": "0.00000001"})
+
+    assert trade.buyerOrderID == Decimal(1234567890123456789)
+    assert foreign.value == Decimal("1E-8")
+    assert foreign.to_dict() == {"value": Decimal("1E-8")}
@@ -0,0 +1,193 @@
+import asyncio
+import re
+from decimal import Decimal
+
+import pytest
+
+from cpro.client.orders import AsyncOrderManager, BlockingOrderManager, ClientOrderIDGenerator
+from cpro.client.rest import AsyncIOHTTPClient, BlockingHTTPClient
+from cpro.exception import CoinsAPIException
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import OrderSides, OrderStatus, OrderTypes, TimeInForce
+from cpro.models.rest.request import NewOrderRequest
+from cpro.models.rest.response import CancelledOrdersList, NewOrderACKResponse, CancelOrderResponse, \
+    NewOrderRESULTResponse, QueryOrderResponse
+from tests.utils import _order_update
+
+
+def _limit(symbol: str = "BTCPHP", **kwargs) -> NewOrderRequest:
+    return NewOrderRequest(symbol, OrderSides.BUY, OrderTypes.LIMIT, timeInForce=TimeInForce.GOOD_TIL_CANCELLED,
+                           quantity=Decimal(1), price=Decimal(90), **kwargs)
+
+
+def _api_order(request, order_id: int, status: str = "CANCELED") -> dict:
+    return {
+        "symbol": request.symbol, "orderId": order_id, "clientOrderId": request.newClientOrderId, "time": 1000,
+        "updateTime": 1000, "price": "90", "origQty": "1", "executedQty": "0", "cummulativeQuoteQty": "0",
+        "status": status, "timeInForce": "GTC", "type": "LIMIT", "side": "BUY", "stopPrice": "0",
+        "origQuoteOrderQty": "0"
+    }
+
+
+class _Exchange:
+    def __init__(self, on_placed=None):
+        self.placed = {}
+        self.calls = []
+        self.on_placed = on_placed
+
+    def handle(self, request, payload):
+        self.calls.append((request, payload))
+        if request is APIEndpoints.NEW_ORDER.value:
+            order_id = len(self.placed) + 1
+            self.placed[order_id] = payload
+            if self.on_placed is not None:
+                return self.on_placed(order_id, payload)
+            return NewOrderACKResponse.from_dict({
+                "symbol": payload.symbol, "orderId": order_id, "clientOrderId": payload.newClientOrderId,
+                "transactTime": 1000
+            })
+        if request is APIEndpoints.QUERY_ORDER.value:
+            for order_id, placed in self.placed.items():
+                if placed.newClientOrderId == payload.origClientOrderId:
+                    return QueryOrderResponse.from_dict({**_api_order(placed, order_id, "FILLED"), "isWorking": False})
+            raise CoinsAPIException(-2013, "Order does not exist.")
+        if request is APIEndpoints.CANCEL_ORDER.value:
+            return CancelOrderResponse.from_dict(_api_order(self.placed[payload.orderId], payload.orderId))
+        return CancelledOrdersList.from_dict([
+            _api_order(placed, order_id) for order_id, placed in self.placed.items() if placed.symbol == payload.symbol
+        ])
+
+
+class _BlockingExchangeClient(BlockingHTTPClient):
+    def __init__(self, exchange: _Exchange):
+        super().__init__()
+        self.exchange = exchange
+
+    def do_request(self, request, request_payload=None):
+        return self.exchange.handle(request, request_payload)
+
+
+class _AsyncExchangeClient(AsyncIOHTTPClient):
+    def __init__(self, exchange: _Exchange):
+        super().__init__()
+        self.exchange = exchange
+
+    async def do_request(self, request, request_payload=None):
+        await asyncio.sleep(0)
+        return self.exchange.handle(request, request_payload)
+
+
+def test_client_order_ids():
+    generate = ClientOrderIDGenerator("bot")
+    ids = [generate() for _ in range(1000)]
+    assert len(set(ids)) == 1000 and ClientOrderIDGenerator("bot")() not in ids
+    assert all(re.fullmatch(r"bot[0-9a-z]{1,33}", client_order_id) for client_order_id in ids)
+    with pytest.raises(ValueError):
+        ClientOrderIDGenerator("x" * 20)
+
+
+def test_orders_follow_stream():
+    exchange = _Exchange()
+    manager = BlockingOrderManager(_BlockingExchangeClient(exchange))
+    order = manager.place(_limit())
+    kept = manager.place(_limit(newClientOrderId="mine"))
+    assert exchange.placed[1].newClientOrderId == order.clientOrderId and kept.clientOrderId == "mine"
+    assert order.orderId == 1 and order.status == OrderStatus.NEW and manager.orders.by_order_id(1) is order
+
+    assert manager.apply(_order_update(1, "PARTIALLY_FILLED", 1100, order.clientOrderId)) is order
+    assert order.status == OrderStatus.PARTIALLY_FILLED
+    assert manager.apply(_order_update(1, "NEW", 1050, order.clientOrderId)) is None  # stale
+    assert manager.apply(_order_update(9, "NEW", 1100, "elsewhere")) is None  # not placed here
+    manager.apply(_order_update(1, "FILLED", 1200, order.clientOrderId))
+    assert order.clientOrderId not in manager.orders and manager.orders.open_orders("BTCPHP") == [kept]
+
+    manager.cancel("mine")
+    assert exchange.calls[-1][1].orderId == 2 and len(manager.orders) == 0
+
+
+def test_flatten():
+    exchange = _Exchange()
+    manager = BlockingOrderManager(_BlockingExchangeClient(exchange), concurrency=2)
+    for symbol in ("BTCPHP", "ETHPHP", "XRPPHP"):
+        manager.place(_limit(symbol))
+    cancelled = manager.flatten()
+    assert set(cancelled) == {"BTCPHP", "ETHPHP", "XRPPHP"} and len(manager.orders) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_flatten():
+    exchange = _Exchange()
+    manager = AsyncOrderManager(_AsyncExchangeClient(exchange))
+    orders = await asyncio.gather(*(manager.place(_limit(symbol)) for symbol in ("BTCPHP", "BTCPHP", "ETHPHP")))
+    assert len({order.clientOrderId for order in orders}) == 3
+    assert manager.orders.symbols() == ["BTCPHP", "ETHPHP"]
+
+    cancelled = await manager.flatten(["BTCPHP"])
+    assert len(cancelled["BTCPHP"].orders) == 2
+    assert manager.orders.open_orders("BTCPHP") == [] and len(manager.orders) == 1
+
+
+def _result(order_id: int, request, status: str, transact_time: int) -> NewOrderRESULTResponse:
+    return NewOrderRESULTResponse.from_dict({
+        "symbol": request.symbol, "orderId": order_id, "clientOrderId": request.newClientOrderId,
+        "transactTime": transact_time, "price": "90", "origQty": "1", "executedQty": "0", "status": status,
+        "timeInForce": "GTC", "type": "LIMIT", "side": "BUY", "stopPrice": "0", "origQuoteOrderQty": "0"
+    })
+
+
+def test_response_after_stream():
+    manager = None
+
+    def fill_first(order_id, request):
+        # the stream reports the fill before the response of the placement arrives
+        manager.apply(_order_update(order_id, "FILLED", 1200, request.newClientOrderId))
+        return _result(order_id, request, "NEW", 1000)
+
+    manager = BlockingOrderManager(_BlockingExchangeClient(_Exchange(fill_first)))
+    order = manager.place(_limit())
+    assert order.status == OrderStatus.FILLED and not order.is_open and len(manager.orders) == 0
+
+    def partially_fill_first(order_id, request):
+        manager.apply(_order_update(order_id, "PARTIALLY_FILLED", 1200, request.newClientOrderId))
+        return _result(order_id, request, "NEW", 1000)
+
+    manager = BlockingOrderManager(_BlockingExchangeClient(_Exchange(partially_fill_first)))
+    order = manager.place(_limit())
+    assert order.status == OrderStatus.PARTIALLY_FILLED and order.updateTime == 1200
+    assert manager.orders.open_orders("BTCPHP") == [order]
+
+
+def test_placement_outcome_unknown():
+    def time_out(*_):
+        raise TimeoutError
+
+    exchange = _Exchange(time_out)
+    manager = BlockingOrderManager(_BlockingExchangeClient(exchange))
+    with pytest.raises(TimeoutError):
+        manager.place(_limit())
+    order, = manager.orders.pending()
+    assert manager.reconcile(order) is order
+    assert order.status == OrderStatus.FILLED and order.orderId == 1 and len(manager.orders) == 0
+
+    def reject(*_):
+        raise CoinsAPIException(-2010, "Account has insufficient balance for requested action.")
+
+    manager = BlockingOrderManager(_BlockingExchangeClient(_Exchange(reject)))
+    with pytest.raises(CoinsAPIException):
+        manager.place(_limit())
+    assert len(manager.orders) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_placement_cancelled():
+    exchange = _Exchange()
+    manager = AsyncOrderManager(_AsyncExchangeClient(exchange))
+    task = asyncio.ensure_future(manager.place(_limit()))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    order, = manager.orders.pending()
+
+    # the exchange never saw it
+    assert await manager.reconcile(order) is None and len(manager.orders) == 0
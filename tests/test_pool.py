@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import queue
+import struct
+import time
+
+import pytest
+
+from cpro.client.pool import SharedRingBuffer, shard_for, _ShardWorker
+from cpro.client.recorder import FrameReplayer
+from cpro.client.wss import AsyncIOWSClient
+from cpro.models.binary import pack_model, unpack_model
+from cpro.models.ws_stream import TradeData, DiffDepthData, KlineCandlestickData
+from tests.utils import TRADE, DIFF_DEPTH, KLINE, _record
+
+
+def test_binary_roundtrip():
+    for model in (TradeData.from_dict(TRADE), DiffDepthData.from_dict(DIFF_DEPTH), KlineCandlestickData.from_dict(KLINE)):
+        assert unpack_model(pack_model(model)) == model
+
+
+def test_ring_buffer_wraparound():
+    ring = SharedRingBuffer(64)
+    try:
+        for i in range(100):
+            payload = bytes([i]) * (i % 20 + 1)
+            assert ring.put(payload, timeout=0)
+            assert ring.get_nowait() == payload
+        assert ring.get_nowait() is None
+
+        assert ring.put(b"x" * 40, timeout=0)
+        assert not ring.put(b"y" * 40, timeout=0)
+    finally:
+        ring.close()
+
+
+def _produce(name: str, capacity: int, items, count: int) -> None:
+    ring = SharedRingBuffer(capacity, name=name, items=items)
+    for i in range(count):
+        ring.put(struct.pack("<Q", i) * (i % 7 + 1))
+    ring.close()
+
+
+def test_ring_buffer_across_processes():
+    count = 50000
+    context = multiprocessing.get_context("spawn")
+    items = context.Semaphore(0)
+    ring = SharedRingBuffer(1024, items=items)
+    producer = context.Process(target=_produce, args=(ring.name, 1024, items, count), daemon=True)
+    producer.start()
+    try:
+        # poll rather than wait on the semaphore so that both sides update the header at the same time
+        received = []
+        while len(received) < count:
+            alive = producer.is_alive()
+            data = ring.get_nowait()
+            if data is not None:
+                received.append(data)
+            elif not alive:
+                break
+        producer.join(timeout=30)
+        assert received == [struct.pack("<Q", i) * (i % 7 + 1) for i in range(count)]
+        assert ring.get_nowait() is None
+    finally:
+        producer.kill()
+        ring.close()
+
+
+def test_shard_for_moves_minimal_streams():
+    streams = [f"sym{i}usdt@depth" for i in range(200)]
+    before = {stream: shard_for(stream, 4) for stream in streams}
+    after = {stream: shard_for(stream, 5) for stream in streams}
+
+    assert set(before.values()) == {0, 1, 2, 3}
+    assert all(after[stream] in (before[stream], 4) for stream in streams)
+    assert shard_for("sym1usdt@depth", 4) == shard_for("sym1usdt@trade", 4)
+
+
+@pytest.mark.asyncio
+async def test_shard_reconnects(tmp_path, monkeypatch):
+    _record(str(tmp_path), count=3)
+    control = queue.Queue()
+    worker = _ShardWorker(SharedRingBuffer(64 * 1024), control)
+    worker.reconnect_delay = 0.01
+    received = []
+
+    # the replayer closes every connection once it has sent the recording
+    async with FrameReplayer(str(tmp_path)).serve(speed=None) as server:
+        monkeypatch.setattr(AsyncIOWSClient, "BASE_URL", f"ws://localhost:{server.sockets[0].getsockname()[1]}/")
+        runner = asyncio.create_task(worker.run())
+        control.put(("subscribe", ["bnbbtc@trade"]))
+        started = time.monotonic()
+        while len(received) < 9 and time.monotonic() - started < 5:
+            data = worker.ring.get_nowait()
+            if data is None:
+                await asyncio.sleep(0.005)
+            else:
+                received.append(unpack_model(data).tradeID)
+        control.put(("stop", []))
+        await asyncio.wait_for(runner, timeout=5)
+
+    assert received == [0, 1, 2] * 3 and worker.connections >= 3
@@ -0,0 +1,64 @@
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from cpro.client.recorder import FrameReplayer
+from cpro.client.rest import AsyncIOHTTPClient
+from cpro.client.wss import AsyncIOWSClient
+from cpro.exception import CoinsAPIException
+from cpro.models.options import RawMode
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.request import OrderBookRequest
+from cpro.models.rest.response import OrderBookResponse
+from tests.utils import _record
+
+DEPTH = {"lastUpdateId": 1, "bids": [["100", "1"]], "asks": [["101", "2"]]}
+
+
+@pytest.mark.asyncio
+async def test_raw_rest_responses():
+    async def depth(request: web.Request) -> web.Response:
+        if request.query["symbol"] == "NOPE":
+            return web.json_response({"code": -1121, "msg": "Invalid symbol."})
+        if request.query["symbol"] == "DOWN":
+            return web.Response(status=502, text="Bad Gateway")
+        return web.json_response(DEPTH)
+
+    app = web.Application()
+    app.router.add_get(APIEndpoints.GET_ORDER_BOOK.value.endpoint, depth)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+
+    async with AsyncIOHTTPClient(raw=RawMode.BYTES) as client:
+        client.API_BASE_URL = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+        body = await APIEndpoints.GET_ORDER_BOOK.execute_async(client, OrderBookRequest("BTCPHP"))
+        assert isinstance(body, bytes) and json.loads(body) == DEPTH
+        # per call over the mode of the client
+        assert await APIEndpoints.GET_ORDER_BOOK.execute_async(
+            client, OrderBookRequest("BTCPHP"), raw=RawMode.JSON
+        ) == DEPTH
+        assert isinstance(await APIEndpoints.GET_ORDER_BOOK.execute_async(
+            client, OrderBookRequest("BTCPHP"), raw=RawMode.MODEL
+        ), OrderBookResponse)
+
+        # errors are still raised
+        with pytest.raises(CoinsAPIException):
+            await APIEndpoints.GET_ORDER_BOOK.execute_async(client, OrderBookRequest("NOPE"))
+        with pytest.raises(aiohttp.ClientResponseError):
+            await APIEndpoints.GET_ORDER_BOOK.execute_async(client, OrderBookRequest("DOWN"))
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_raw_stream_frames(tmp_path):
+    _record(str(tmp_path), count=3)
+    async with FrameReplayer(str(tmp_path)).serve(speed=100.0) as server:
+        client = AsyncIOWSClient("bnbbtc@trade")
+        client.BASE_URL = f"ws://localhost:{server.sockets[0].getsockname()[1]}/"
+        async with client:
+            frames = [frame async for frame in client.listen(raw=RawMode.JSON)]
+    assert [frame["t"] for frame in frames] == [0, 1, 2]
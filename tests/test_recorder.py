@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from cpro.client.recorder import FrameReplayer
+from cpro.client.wss import AsyncIOWSClient
+from cpro.models.ws_stream import TradeData
+from tests.utils import _record
+
+
+def test_record_and_replay(tmp_path):
+    _record(str(tmp_path))
+    assert len(os.listdir(tmp_path)) > 1  # rotated into several segments
+
+    replayer = FrameReplayer(str(tmp_path))
+    assert [received_ns for received_ns, _ in replayer.frames()][:2] == [1_000_000_000, 1_001_000_000]
+
+    trades = list(replayer.replay())
+    assert len(trades) == 50
+    assert all(isinstance(trade, TradeData) for trade in trades)
+    assert [trade.tradeID for trade in trades] == list(range(50))
+
+
+@pytest.mark.asyncio
+async def test_replay_server(tmp_path):
+    _record(str(tmp_path), count=10)
+    replayer = FrameReplayer(str(tmp_path))
+
+    async with replayer.serve(speed=100.0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncIOWSClient("bnbbtc@trade")
+        client.BASE_URL = f"ws://localhost:{port}/"
+        async with client:
+            trades = [frame async for frame in client.listen()]
+
+    assert [trade.tradeID for trade in trades] == list(range(10))
@@ -0,0 +1,160 @@
+import time
+import typing
+from decimal import Decimal
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from cpro.client.deadline import deadline
+from cpro.client.rest import APICredentials, AsyncIOHTTPClient
+from cpro.client.retry import Retrier, RetryBudget, RetryPolicy, NO_SUCH_ORDER
+from cpro.exception import CoinsAPIException, HTTPException
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import OrderSides, OrderTypes, OrderResponseTypes, OrderStatus
+from cpro.models.rest.request import NewOrderRequest
+from cpro.models.rest.response import NewOrderRESULTResponse
+
+
+class _Exchange:
+    """
+    Fails the first `failures` requests of every path with a 502, orders are placed even when their response fails
+    """
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.requests = []
+        self.orders = {}
+
+    def _fail(self, request: web.Request) -> bool:
+        self.requests.append(request.path)
+        return self.requests.count(request.path) <= self.failures
+
+    async def time(self, request: web.Request) -> web.Response:
+        if self._fail(request):
+            return web.Response(status=502, text="<html>Bad Gateway</html>")
+        return web.json_response({"serverTime": 1000})
+
+    async def order(self, request: web.Request) -> web.Response:
+        if request.method == "GET":
+            self.requests.append("query")
+            order = self.orders.get(request.query["origClientOrderId"])
+            if order is None:
+                return web.json_response({"code": NO_SUCH_ORDER, "msg": "Order does not exist."})
+            return web.json_response(order)
+        client_order_id = request.query.get("newClientOrderId", "generated")
+        self.orders[client_order_id] = {
+            "symbol": request.query["symbol"], "orderId": len(self.orders) + 1, "clientOrderId": client_order_id,
+            "time": 1000, "updateTime": 1000, "price": request.query["price"], "origQty": request.query["quantity"],
+            "executedQty": "0", "cummulativeQuoteQty": "0", "status": "NEW", "timeInForce": "GTC", "type": "LIMIT",
+            "side": "BUY", "stopPrice": "0", "origQuoteOrderQty": "0", "isWorking": True
+        }
+        if self._fail(request):
+            return web.Response(status=502)
+        return web.json_response({
+            key: value for key, value in self.orders[client_order_id].items()
+            if key not in ("time", "updateTime", "cummulativeQuoteQty", "isWorking")
+        } | {"transactTime": 1000})
+
+
+async def _serve(exchange: _Exchange) -> typing.Tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_get("/openapi/v1/time", exchange.time)
+    app.router.add_route("*", "/openapi/v1/order", exchange.order)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    return runner, f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+
+
+def _order(**kwargs) -> NewOrderRequest:
+    return NewOrderRequest(
+        "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT, price=Decimal(90), quantity=Decimal(1),
+        newOrderRespType=OrderResponseTypes.RESULT, **kwargs
+    )
+
+
+def _client(base_url: str, retrier: Retrier) -> AsyncIOHTTPClient:
+    client = AsyncIOHTTPClient(APICredentials("key", "secret"), retrier=retrier)
+    client.API_BASE_URL = base_url
+    return client
+
+
+@pytest.mark.asyncio
+async def test_gets_retry_within_budget():
+    exchange = _Exchange(failures=2)
+    runner, base_url = await _serve(exchange)
+    fast = RetryPolicy(base_delay=0.001)
+    retrier = Retrier({APIEndpoints.GET_SERVER_TIME: fast}, budget=RetryBudget(reserve=3))
+    async with _client(base_url, retrier) as client:
+        assert (await APIEndpoints.GET_SERVER_TIME.execute_async(client)).serverTime
+        # one retry left in the budget, not enough for 2 more failures
+        exchange.failures += 3
+        with pytest.raises(aiohttp.ClientResponseError):
+            await APIEndpoints.GET_SERVER_TIME.execute_async(client)
+    await runner.cleanup()
+
+    stats = retrier.metrics.snapshot()["GET /openapi/v1/time"]
+    assert stats["requests"] == 2 and stats["retries"] == 3 and stats["recovered"] == 1
+    assert stats["budget_exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_orders_reconcile_before_retrying():
+    exchange = _Exchange(failures=1)
+    runner, base_url = await _serve(exchange)
+    retrier = Retrier()
+    async with _client(base_url, retrier) as client:
+        response = await APIEndpoints.NEW_ORDER.execute_async(client, _order(newClientOrderId="grid-1"))
+        assert isinstance(response, NewOrderRESULTResponse) and response.status == OrderStatus.NEW
+        assert exchange.requests == ["/openapi/v1/order", "query"]  # found, so not placed twice
+
+        # without a client order id the order can not be looked up, so it is not retried
+        exchange.failures += 1
+        with pytest.raises(aiohttp.ClientResponseError):
+            await APIEndpoints.NEW_ORDER.execute_async(client, _order())
+    await runner.cleanup()
+    assert retrier.metrics.snapshot()["POST /openapi/v1/order"]["reconciled"] == 1
+
+
+def test_throttling_delay():
+    policy = RetryPolicy()
+    assert policy.delay(1, HTTPException("", {"retry-after": "12"}, 429)) == 12
+    assert policy.delay(1, HTTPException("", {"retry-after": "1"}, 429)) == policy.throttled_delay
+    assert policy.delay(1, HTTPException("", {}, 429)) == policy.throttled_delay
+    assert policy.delay(1, CoinsAPIException(-1003, "Too many requests.")) == policy.throttled_delay
+    assert policy.delay(1, HTTPException("", {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, 429)) == \
+           policy.throttled_delay
+    assert policy.delay(1, HTTPException("", {}, 503)) <= policy.base_delay
+
+
+@pytest.mark.asyncio
+async def test_throttled_requests_wait():
+    requests = []
+
+    async def server_time(_: web.Request) -> web.Response:
+        requests.append(time.monotonic())
+        if len(requests) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0.3"})
+        return web.json_response({"serverTime": 1000})
+
+    app = web.Application()
+    app.router.add_get("/openapi/v1/time", server_time)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    base_url = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+
+    retrier = Retrier({APIEndpoints.GET_SERVER_TIME: RetryPolicy(throttled_delay=0.1)})
+    async with _client(base_url, retrier) as client:
+        assert (await APIEndpoints.GET_SERVER_TIME.execute_async(client)).serverTime
+        assert requests[1] - requests[0] >= 0.3
+
+        # a wait the deadline cannot cover is not retried
+        del requests[:]
+        with deadline(0.2), pytest.raises(aiohttp.ClientResponseError):
+            await APIEndpoints.GET_SERVER_TIME.execute_async(client)
+        assert len(requests) == 1
+    await runner.cleanup()
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from cpro.client.rest import AsyncIOHTTPClient
+from cpro.client.scheduler import AsyncRequestScheduler, Lane
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.request import CancelSingleOrderRequest, GraphDataRequest
+from cpro.models.rest.enums import ChartIntervals
+
+
+class _RecordingClient(AsyncIOHTTPClient):
+    def __init__(self, scheduler: AsyncRequestScheduler):
+        super().__init__(scheduler=scheduler)
+        self.sent = []
+        self.gate = asyncio.Event()
+
+    async def _send(self, request, request_payload, *_):
+        self.sent.append(request)
+        await self.gate.wait()
+
+
+@pytest.mark.asyncio
+async def test_cancels_skip_ahead_of_backfill():
+    scheduler = AsyncRequestScheduler(1)
+    client = _RecordingClient(scheduler)
+
+    async def graph():
+        await client._guarded_send(APIEndpoints.GET_GRAPH_DATA.value, GraphDataRequest("BTCPHP", ChartIntervals._1m))
+
+    async def cancel():
+        await client._guarded_send(APIEndpoints.CANCEL_ORDER.value, CancelSingleOrderRequest(orderId=1))
+
+    tasks = [asyncio.create_task(graph()) for _ in range(10)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(cancel()))
+    await asyncio.sleep(0)
+    assert scheduler.queued == 10
+
+    client.gate.set()
+    await asyncio.gather(*tasks)
+    # the first backfill request was already running
+    assert client.sent[1] is APIEndpoints.CANCEL_ORDER.value
+    assert scheduler.snapshot()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_weighted_fair_share():
+    scheduler = AsyncRequestScheduler(1)
+    order = []
+    await scheduler.acquire(Lane.ACCOUNT)  # holds the only slot
+
+    async def request(lane: Lane):
+        await scheduler.acquire(lane)
+        order.append(lane)
+        scheduler.release()
+
+    tasks = [asyncio.create_task(request(Lane.MARKET_DATA)) for _ in range(3)]
+    tasks += [asyncio.create_task(request(Lane.ORDER)) for _ in range(16)]
+    await asyncio.sleep(0)
+    tasks[-1].cancel()  # given up on while queued
+    scheduler.release()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # 8 orders per market data request (ties go to the earlier request), but market data is never starved
+    assert order.index(Lane.MARKET_DATA) == 7 and order.count(Lane.ORDER) == 15
+    assert order[-1] == Lane.MARKET_DATA and scheduler.snapshot()["active"] == 0
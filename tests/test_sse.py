@@ -1,8 +1,13 @@
+import asyncio
 import os
+import threading
 
 import pytest
+from aiohttp import web
 
-from cpro.client.sse import AsyncSSEClient, BlockingSSEClient
+from cpro.client.rest import AsyncIOHTTPClient, BlockingHTTPClient
+from cpro.client.sse import AsyncSSEClient, BlockingSSEClient, KeepAliveThread
+from cpro.exception import HTTPException
 
 
 @pytest.mark.asyncio
@@ -16,3 +21,81 @@ def test_user_data_stream_sync():
     with BlockingSSEClient(api_key=os.getenv("API_KEY")) as client:
         for payload in client:
             print(payload)
+
+
+class _UnavailableClient(BlockingHTTPClient):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.called = threading.Event()
+
+    def do_request(self, request, request_payload=None):
+        self.calls += 1
+        if self.calls >= 2:
+            self.called.set()
+        raise HTTPException(body="Service Unavailable", headers=dict(), status=503)
+
+
+class _AsyncUnavailableClient(AsyncIOHTTPClient):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def do_request(self, request, request_payload=None):
+        self.calls += 1
+        raise HTTPException(body="Service Unavailable", headers=dict(), status=503)
+
+
+def test_keepalive_survives_errors():
+    http_client = _UnavailableClient()
+    thread = KeepAliveThread(http_client=http_client, interval=0.01, listen_key="key", daemon=True)
+    thread.start()
+    try:
+        assert http_client.called.wait(timeout=5)
+        assert thread.is_alive()
+    finally:
+        thread.stop()
+        thread.join()
+
+
+@pytest.mark.asyncio
+async def test_async_keepalive_survives_errors():
+    http_client = _AsyncUnavailableClient()
+    client = AsyncSSEClient(http_client=http_client)
+    client.listen_key = "key"
+    task = asyncio.create_task(client.send_keepalive(0.01))
+    await asyncio.sleep(0.1)
+    assert http_client.calls >= 2 and not task.done()
+    task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_listen_key_calls_share_a_session():
+    peers = []
+
+    async def user_data_stream(request: web.Request) -> web.Response:
+        peers.append((request.method, request.transport.get_extra_info("peername")))
+        return web.json_response({"listenKey": "key"} if request.method == "POST" else {})
+
+    app = web.Application()
+    app.router.add_route("*", "/openapi/v1/userDataStream", user_data_stream)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+
+    client = AsyncSSEClient(api_key="key", keepalive_interval=0.01)
+    client.http_client.API_BASE_URL = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+    async with client:
+        await asyncio.sleep(0.05)
+    await runner.cleanup()
+
+    methods = [method for method, _ in peers]
+    assert methods[0] == "POST" and "PUT" in methods and methods[-1] == "DELETE"
+    assert len({peer for _, peer in peers}) == 1  # every call went over the same pooled connection
+    assert client.http_client._session is None
+
+    # a given client is left open
+    http_client = AsyncIOHTTPClient()
+    async with http_client:
+        assert not AsyncSSEClient(http_client=http_client)._owns_http_client
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from aiohttp import web
+
+from cpro.client.rest import APICredentials, AsyncIOHTTPClient, BlockingHTTPClient
+from cpro.client.streaming import JSONArraySplitter
+from cpro.exception import CoinsAPIException
+from cpro.models.rest.endpoints import APIEndpoints
+from cpro.models.rest.enums import ChartIntervals
+from cpro.models.rest.request import AccountTradesRequest, GraphDataRequest
+from cpro.models.rest.response import AccountTrade, MarketDatapoint
+
+DOCUMENT = b' [ {"a": "],\\"[{", "b": [1, {"c": null}]}, "\\\\", -1.5e3 ,true, [], {}, "\xc3\xa9" ] '
+KLINES = [
+    [1672515780000 + i * 60000, "100.5", "101", "99", "100.75", "12.5", 1672515839999 + i * 60000, "1259.4", 12,
+     "6.1", "614.5", "0"] for i in range(50)
+]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, len(DOCUMENT)])
+def test_splits_elements_across_chunks(size: int):
+    splitter = JSONArraySplitter()
+    elements = []
+    for i in range(0, len(DOCUMENT), size):
+        elements += splitter.feed(DOCUMENT[i:i + size])
+    assert splitter.close() is None
+    assert [json.loads(_) for _ in elements] == json.loads(DOCUMENT)
+    # only the element being received is kept
+    assert len(splitter._buffer) <= 2
+
+
+def test_other_documents_are_kept_whole():
+    splitter = JSONArraySplitter()
+    assert splitter.feed(b'{"code": -1121, ') == [] and splitter.feed(b'"msg": "Invalid symbol."}') == []
+    assert splitter.close() == b'{"code": -1121, "msg": "Invalid symbol."}'
+
+    splitter = JSONArraySplitter()
+    splitter.feed(b'[1, 2')
+    with pytest.raises(ValueError):
+        splitter.close()
+
+
+class _KlinesHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        if "symbol=NOPE" in self.path:
+            self.wfile.write(b'{"code": -1121, "msg": "Invalid symbol."}')
+            return
+        body = json.dumps(KLINES).encode()
+        for i in range(0, len(body), 100):
+            self.wfile.write(body[i:i + 100])
+            self.wfile.flush()
+
+    def log_message(self, *_):
+        pass
+
+
+def test_blocking_stream():
+    server = ThreadingHTTPServer(("localhost", 0), _KlinesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = BlockingHTTPClient()
+    client.API_BASE_URL = f"http://localhost:{server.server_address[1]}"
+    try:
+        klines = list(APIEndpoints.GET_GRAPH_DATA.stream(client, GraphDataRequest("BTCPHP", ChartIntervals._1m)))
+        assert len(klines) == 50 and all(isinstance(_, MarketDatapoint) for _ in klines)
+        assert klines == APIEndpoints.GET_GRAPH_DATA.execute(
+            client, GraphDataRequest("BTCPHP", ChartIntervals._1m)
+        ).datapoints
+
+        batches = APIEndpoints.GET_GRAPH_DATA.stream(
+            client, GraphDataRequest("BTCPHP", ChartIntervals._1m), batch_size=16
+        )
+        assert [len(_) for _ in batches] == [16, 16, 16, 2]
+
+        with pytest.raises(CoinsAPIException):
+            list(APIEndpoints.GET_GRAPH_DATA.stream(client, GraphDataRequest("NOPE", ChartIntervals._1m)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_async_stream_yields_before_the_body_ends():
+    trade = {
+        "symbol": "BTCPHP", "id": 1, "orderId": 2, "price": "100", "qty": "1", "quoteQty": "100", "commission": "0.1",
+        "commissionAsset": "PHP", "time": 1672515782136, "isBuyer": True, "isMaker": False, "isBestMatch": True
+    }
+    rest = asyncio.Event()
+
+    async def my_trades(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(b"[" + json.dumps(trade).encode() + b",")
+        await rest.wait()
+        await response.write(json.dumps({**trade, "id": 2}).encode() + b"]")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get(APIEndpoints.GET_ACCOUNT_TRADE_LIST.value.endpoint, my_trades)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+
+    async with AsyncIOHTTPClient(APICredentials("key", "secret")) as client:
+        client.API_BASE_URL = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+        trades = APIEndpoints.GET_ACCOUNT_TRADE_LIST.stream(client, AccountTradesRequest("BTCPHP"))
+        first = await asyncio.wait_for(trades.__anext__(), 1)
+        assert isinstance(first, AccountTrade) and first.id == 1
+        rest.set()
+        assert [_.id async for _ in trades] == [2]
+    await runner.cleanup()
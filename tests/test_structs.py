@@ -0,0 +1,71 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("msgspec")
+
+from cpro.client.metrics import LatencyMetrics
+from cpro.client.recorder import FrameRecorder, FrameReplayer, FrameSource
+from cpro.models import structs
+from cpro.models.options import ModelTier
+from cpro.models.rest.enums import WSStreamDataEventTypes, ChartIntervals, OrderSides
+from cpro.models.ud_stream import UserDataStreamEventTypes
+from cpro.models.ws_stream import TradeData, unmarshal_frame
+from tests.utils import TRADE, DIFF_DEPTH, KLINE, BOOK_TICKER, ORDER_UPDATE
+
+
+def test_struct_matches_dataclass():
+    trade = structs.decode_frame(json.dumps(TRADE).encode())
+    expected = TradeData.from_dict(TRADE)
+    assert isinstance(trade, structs.TradeData)
+    assert trade.eventType == WSStreamDataEventTypes.TRADE
+    assert (trade.symbol, trade.tradeID, trade.price, trade.quantity) == \
+           (expected.symbol, expected.tradeID, expected.price, expected.quantity)
+    assert trade.eventTime == TRADE["E"]
+    assert LatencyMetrics.stream_key(trade) == "bnbbtc@trade"
+
+
+def test_struct_nested_and_untagged():
+    kline = structs.decode_frame(json.dumps(KLINE))
+    assert kline.dataPoint.interval == ChartIntervals._1m
+
+    depth = structs.decode_frame(json.dumps(DIFF_DEPTH))
+    assert [(level.price, level.qty) for level in depth.asksUpdated] == \
+           [(Decimal("0.0026"), Decimal("100")), (Decimal("0.0027"), Decimal("1.5"))]
+
+    ticker = structs.decode_frame(json.dumps(BOOK_TICKER))
+    assert isinstance(ticker, structs.IndividualSymbolBookTickerData)
+    assert ticker.bestAskQuantity == Decimal("40.66")
+
+    assert structs.decode_frame('{"pong": 1672515782136}') is None
+    assert structs.decode_frame('{"result": null, "id": 1}') is None
+
+
+def test_struct_malformed_event():
+    with pytest.raises(ValueError):
+        structs.decode_frame(json.dumps({**TRADE, "p": None}))
+    with pytest.raises(ValueError):
+        structs.decode_frame(json.dumps({**BOOK_TICKER, "b": []}))
+
+
+def test_struct_user_data_stream():
+    order = structs.decode_stream_data(json.dumps(ORDER_UPDATE))
+    assert order.eventType == UserDataStreamEventTypes.ORDER_UPDATE
+    assert order.side == OrderSides.BUY and order.commissionAsset is None
+    balance = structs.decode_stream_data(json.dumps({
+        "e": "balanceUpdate", "E": 1573200697110, "a": "BTC", "d": "100.00000000", "T": 1573200697068
+    }))
+    assert balance.delta == Decimal(100)
+    with pytest.raises(ValueError):
+        structs.decode_stream_data('{"e": "unknown"}')
+
+
+def test_replay_struct_tier(tmp_path):
+    with FrameRecorder(str(tmp_path), FrameSource.WEBSOCKET_STREAM) as recorder:
+        recorder.record(json.dumps(TRADE))
+        recorder.record('{"pong": 1672515782136}')
+
+    trade, pong = FrameReplayer(str(tmp_path), model_tier=ModelTier.STRUCT).replay()
+    assert isinstance(trade, structs.TradeData)
+    assert pong == unmarshal_frame('{"pong": 1672515782136}')  # non stream frames keep the dataclass tier
@@ -0,0 +1,93 @@
+import time
+from datetime import datetime
+from decimal import Decimal
+from urllib.parse import parse_qs
+
+import pytest
+from aiohttp import web
+
+from cpro.client.deadline import deadline
+from cpro.client.rest import APICredentials, AsyncIOHTTPClient
+from cpro.client.template import OrderTemplate
+from cpro.exception import DeadlineExceeded
+from cpro.models.options import RawMode
+from cpro.models.rest.enums import OrderSides, OrderTypes, TimeInForce, AntiSelfTradingBehaviours, OrderResponseTypes
+from cpro.models.rest.request import NewOrderRequest
+from cpro.models.rest.response import NewOrderACKResponse
+
+CREDENTIALS = APICredentials(
+    "tAQfOrPIZAhym0qHISRt8EFvxPemdBm5j5WMlkm3Ke9aFp0EGWC2CGM8GHV4kCYW",
+    "lH3ELTNiFxCQTmi9pPcWWikhsjO04Yoqw3euoHUuOLC3GYBW64ZqzQsiOEHXQS76"
+)
+
+
+def _signed(request: NewOrderRequest) -> str:
+    return request.to_encoded().sign(CREDENTIALS.api_key, CREDENTIALS.api_secret).params
+
+
+@pytest.mark.parametrize("fixed", [
+    dict(timeInForce=TimeInForce.GOOD_TIL_CANCELLED),
+    dict(stpFlag=AntiSelfTradingBehaviours.CANCEL_BOTH, newOrderRespType=OrderResponseTypes.ACK, recvWindow=5000),
+])
+def test_matches_request_encoding(fixed):
+    template = OrderTemplate(CREDENTIALS, "BTCPHP", OrderSides.SELL, OrderTypes.LIMIT, **fixed)
+
+    placed_at = datetime.fromtimestamp(1538323200)
+    assert template.encode(
+        price=Decimal("1E+3"), quantity="0.10", client_order_id="quote-1", timestamp=placed_at
+    ) == _signed(NewOrderRequest(
+        "BTCPHP", OrderSides.SELL, OrderTypes.LIMIT, timestamp=placed_at, price=Decimal(1000),
+        quantity=Decimal("0.10"), newClientOrderId="quote-1", **fixed
+    ))
+    # left out when not given, like the `None` fields of a request
+    assert template.encode(quantity=Decimal(1), timestamp=1538323200000) == _signed(NewOrderRequest(
+        "BTCPHP", OrderSides.SELL, OrderTypes.LIMIT, timestamp=1538323200000, quantity=Decimal(1), **fixed
+    ))
+
+
+def test_recv_window_follows_deadline():
+    template = OrderTemplate(CREDENTIALS, "BTCPHP", OrderSides.SELL, OrderTypes.LIMIT, recvWindow=5000)
+    placed_at = time.time_ns() // 1_000_000
+    with deadline(1):
+        encoded = template.encode(price=Decimal(90), quantity=Decimal(1), timestamp=placed_at)
+    window = int(parse_qs(encoded)["recvWindow"][0])
+    assert 900 <= window <= 1000
+    assert encoded == _signed(NewOrderRequest(
+        "BTCPHP", OrderSides.SELL, OrderTypes.LIMIT, timestamp=placed_at, price=Decimal(90), quantity=Decimal(1),
+        recvWindow=window
+    ))
+    # the template's own window is kept when tighter, and outside of deadlines
+    with deadline(10):
+        assert parse_qs(template.encode(quantity=Decimal(1)))["recvWindow"] == ["5000"]
+    assert parse_qs(template.encode(quantity=Decimal(1)))["recvWindow"] == ["5000"]
+    with deadline(0), pytest.raises(DeadlineExceeded):
+        template.encode(quantity=Decimal(1))
+
+
+@pytest.mark.asyncio
+async def test_send_order():
+    async def new_order(request: web.Request) -> web.Response:
+        assert request.headers["X-COINS-APIKEY"] == CREDENTIALS.api_key and "signature" in request.query
+        return web.json_response({
+            "symbol": request.query["symbol"], "orderId": 1, "clientOrderId": request.query["newClientOrderId"],
+            "transactTime": int(request.query["timestamp"])
+        })
+
+    app = web.Application()
+    app.router.add_post("/openapi/v1/order", new_order)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+
+    template = OrderTemplate(
+        CREDENTIALS, "BTCPHP", OrderSides.BUY, OrderTypes.LIMIT_MAKER, newOrderRespType=OrderResponseTypes.ACK
+    )
+    async with AsyncIOHTTPClient(CREDENTIALS) as client:
+        client.API_BASE_URL = f"http://localhost:{site._server.sockets[0].getsockname()[1]}"
+        response = await client.send_order(template, price=Decimal(90), quantity=Decimal(1), client_order_id="q-1")
+        client.raw = RawMode.JSON
+        raw = await client.send_order(template, price=Decimal(90), quantity=Decimal(1), client_order_id="q-2")
+    await runner.cleanup()
+    assert isinstance(response, NewOrderACKResponse) and response.clientOrderId == "q-1"
+    assert raw["clientOrderId"] == "q-2"
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+from cpro.models.binary import pack_model, unpack_model
+from cpro.models.fields import EpochMillis
+from cpro.models.options import DecodeOptions, TimestampMode, decode_options, get_decode_options
+from cpro.models.ws_stream import TradeData
+from tests.utils import TRADE
+
+EPOCH_MILLIS = DecodeOptions(timestamp_mode=TimestampMode.EPOCH_MILLIS)
+
+
+def test_default_decodes_datetime():
+    trade = TradeData.from_dict(TRADE)
+    assert isinstance(trade.eventTime, datetime)
+    assert trade.to_dict()["E"] == TRADE["E"]
+
+
+def test_epoch_millis_mode():
+    with decode_options(EPOCH_MILLIS):
+        trade = TradeData.from_dict(TRADE)
+    assert get_decode_options().timestamp_mode == TimestampMode.DATETIME
+
+    assert isinstance(trade.eventTime, EpochMillis)
+    assert trade.eventTime == TRADE["E"]
+    assert trade.eventTime.to_datetime() == datetime(2022, 12, 31, 19, 43, 2, 136000, tzinfo=timezone.utc)
+    assert trade.to_dict()["E"] == TRADE["E"]
+    assert unpack_model(pack_model(trade)) == trade
+    assert isinstance(unpack_model(pack_model(trade)).eventTime, EpochMillis)
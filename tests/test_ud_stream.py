@@ -0,0 +1,59 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from cpro.client.recorder import FrameRecorder, FrameReplayer, FrameSource
+from cpro.models.compact import compact
+from cpro.models.options import DecodeOptions, decode_options, ModelTier
+from cpro.models.rest.enums import OrderStatus
+from cpro.models.ud_stream import AccountUpdateData, BalanceUpdateData, OrderUpdateData, UserDataStreamEventTypes, \
+    unmarshal_stream_data
+from cpro.models.ws_stream import IndividualSymbolBookTickerData, unmarshal_frame
+from tests.utils import BOOK_TICKER, ORDER_UPDATE, ACCOUNT_UPDATE, BALANCE_UPDATE
+
+CORPUS = [ACCOUNT_UPDATE, BALANCE_UPDATE, ORDER_UPDATE]
+
+
+@pytest.fixture
+def corpus(tmp_path) -> str:
+    with FrameRecorder(str(tmp_path), FrameSource.USER_DATA_STREAM) as recorder:
+        for event in CORPUS:
+            recorder.record(json.dumps(event))
+    return str(tmp_path)
+
+
+def test_unmarshal_corpus(corpus):
+    account, balance, order = FrameReplayer(corpus).replay()
+
+    assert isinstance(account, AccountUpdateData)
+    assert account.eventType == UserDataStreamEventTypes.ACCOUNT_UPDATE
+    assert account.lastAccountUpdatetime == datetime.fromtimestamp(1564034571.073)
+    assert [(_.asset, _.free) for _ in account.balanceUpdates] == [("ETH", Decimal(10000))]
+
+    assert isinstance(balance, BalanceUpdateData)
+    assert (balance.asset, balance.delta) == ("BTC", Decimal(100))
+
+    assert isinstance(order, OrderUpdateData)
+    assert order.currentOrderStatus == OrderStatus.NEW and order.orderID == 4293153
+
+    for event, data in zip((account, balance, order), CORPUS):
+        assert type(event).from_dict(event.to_dict(encode_json=True)) == event
+
+
+def test_struct_tier_agrees(corpus):
+    pytest.importorskip("msgspec")
+    dataclasses = list(FrameReplayer(corpus).replay())
+    structs = list(FrameReplayer(corpus, model_tier=ModelTier.STRUCT).replay())
+    assert [_.eventType for _ in structs] == [_.eventType for _ in dataclasses]
+    assert structs[0].balanceUpdates[0].free == dataclasses[0].balanceUpdates[0].free
+    assert structs[1].delta == dataclasses[1].delta
+
+
+def test_unhandled_and_compact():
+    with pytest.raises(ValueError):
+        unmarshal_stream_data({"e": "listenKeyExpired", "E": 1576653824250})
+    with decode_options(DecodeOptions(compact_models=True)):
+        assert type(unmarshal_stream_data(BALANCE_UPDATE)) is compact(BalanceUpdateData)
+    assert isinstance(unmarshal_frame(json.dumps(BOOK_TICKER)), IndividualSymbolBookTickerData)
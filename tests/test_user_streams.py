@@ -0,0 +1,71 @@
+import asyncio
+import json
+from collections import Counter
+
+import pytest
+from aiohttp import web
+from websockets import server as async_server
+
+from cpro.client.user_streams import AsyncUserDataStreamManager, INVALID_LISTEN_KEY
+from cpro.models.ud_stream import BalanceUpdateData
+from tests.utils import BALANCE_UPDATE
+
+
+class _Exchange:
+    """
+    Serves the listen key endpoints and user data streams, every key of the "expiring" account is rejected once
+    """
+
+    def __init__(self):
+        self.issued = Counter()
+        self.renewed = Counter()
+        self.rejected = set()
+
+    async def listen_key(self, request: web.Request) -> web.Response:
+        api_key = request.headers["X-COINS-APIKEY"]
+        if request.method == "POST":
+            self.issued[api_key] += 1
+            return web.json_response({"listenKey": f"{api_key}-{self.issued[api_key]}"})
+        listen_key = request.query["listenKey"]
+        if request.method == "PUT":
+            self.renewed[listen_key] += 1
+            if api_key == "expiring" and listen_key not in self.rejected:
+                self.rejected.add(listen_key)
+                return web.json_response({"code": INVALID_LISTEN_KEY, "msg": "This listenKey does not exist."})
+        return web.json_response({})
+
+    async def stream(self, websocket, *_) -> None:
+        listen_key = websocket.path.rsplit("/", 1)[-1]
+        await websocket.send(json.dumps({**BALANCE_UPDATE, "a": listen_key}))
+        await websocket.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_merged_streams_rotate_expired_keys():
+    exchange = _Exchange()
+    app = web.Application()
+    app.router.add_route("*", "/openapi/v1/userDataStream", exchange.listen_key)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    http_port = site._server.sockets[0].getsockname()[1]
+
+    async with async_server.serve(exchange.stream, "localhost", 0) as ws_server:
+        manager = AsyncUserDataStreamManager(
+            {"main": "steady", "sub": "expiring"}, keepalive_interval=0.1, retry_delay=0.01, reconnect_delay=0.01
+        )
+        manager.API_BASE_URL = f"http://localhost:{http_port}"
+        manager.BASE_WS_URL = f"ws://localhost:{ws_server.sockets[0].getsockname()[1]}"
+        seen = set()
+        async with manager:
+            async for account, event in manager:
+                assert isinstance(event, BalanceUpdateData)
+                seen.add((account, event.asset))
+                if ("sub", "expiring-2") in seen and ("main", "steady-1") in seen:
+                    break
+
+        assert manager.streams["sub"].rotations >= 1
+        assert manager.streams["main"].rotations == 0 and exchange.renewed["steady-1"] >= 1
+
+    await runner.cleanup()
@@ -18,12 +18,76 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import json
+
+from cpro.client.recorder import FrameRecorder, FrameSource
 from cpro.client.rest import HTTPClient, AsyncIOHTTPClient
 from cpro.models.rest.endpoints import APIEndpoints
 from cpro.models.rest.response import TResponsePayload
+from cpro.models.ud_stream import OrderUpdateData
+
+TRADE = {
+    "e": "trade", "E": 1672515782136, "s": "BNBBTC", "t": 12345, "p": "0.001", "q": "100",
+    "b": 88, "a": 50, "T": 1672515782136, "m": True, "M": True
+}
+DIFF_DEPTH = {
+    "e": "depthUpdate", "E": 1672515782136, "s": "BNBBTC", "U": 157, "u": 160,
+    "b": [["0.0024", "10"]], "a": [["0.0026", "100"], ["0.0027", "1.5"]]
+}
+KLINE = {
+    "e": "kline", "E": 1672515782136, "s": "BNBBTC",
+    "k": {
+        "t": 1672515780000, "T": 1672515839999, "s": "BNBBTC", "i": "1m", "f": 100, "L": 200, "o": "0.0010",
+        "c": "0.0020", "h": "0.0025", "l": "0.0015", "v": "1000", "n": 100, "x": False, "q": "1.0000",
+        "V": "500", "Q": "0.500", "B": "123456"
+    }
+}
+BOOK_TICKER = {"u": 400900217, "s": "BNBUSDT", "b": "25.35190000", "B": "31.21000000", "a": "25.36520000", "A": "40.66"}
+# https://coins-docs.github.io/user-data-stream/
+ORDER_UPDATE = {
+    "e": "executionReport", "E": 1499405658658, "s": "ETHBTC", "c": "mUvoqJxFIILMdfAW5iGSOW", "S": "BUY",
+    "o": "LIMIT", "f": "GTC", "q": "1.00000000", "p": "0.10264410", "P": "0.00000000", "x": "NEW", "X": "NEW",
+    "r": "NONE", "i": 4293153, "l": "0.00000000", "z": "0.00000000", "L": "0.00000000", "n": "0", "N": None,
+    "T": 1499405658657, "t": -1, "w": True, "m": False, "O": 1499405658657, "Z": "0.00000000", "Y": "0.00000000",
+    "Q": "0.00000000"
+}
+ACCOUNT_UPDATE = {
+    "e": "outboundAccountPosition", "E": 1564034571105, "u": 1564034571073,
+    "B": [{"a": "ETH", "f": "10000.000000", "l": "0.000000"}]
+}
+BALANCE_UPDATE = {"e": "balanceUpdate", "E": 1573200697110, "a": "BTC", "d": "100.00000000", "T": 1573200697068}
 
 
 async def _test_endpoint(client: HTTPClient, endpoint: APIEndpoints, *args, **kwargs) -> TResponsePayload:
     return await endpoint.execute_async(client, *args, **kwargs) \
         if isinstance(client, AsyncIOHTTPClient) else \
         endpoint.execute(client, *args, **kwargs)
+
+
+def _symbol(i: int) -> dict:
+    return {
+        "symbol": f"COIN{i}PHP", "status": "trading", "baseAsset": f"COIN{i}", "baseAssetPrecision": 8,
+        "quoteAsset": "PHP", "quoteAssetPrecision": 2, "orderTypes": ["LIMIT", "MARKET"],
+        "filters": [{"filterType": "PRICE_FILTER", "minPrice": "0.01", "maxPrice": "1000000", "tickSize": "0.01"}]
+    }
+
+
+EXCHANGE_INFORMATION = {
+    "timezone": "UTC", "serverTime": 1672515782136, "exchangeFilters": [],
+    "symbols": [_symbol(i) for i in range(200)]
+}
+
+
+def _record(directory, count: int = 50, segment_size: int = 1024):
+    with FrameRecorder(directory, FrameSource.WEBSOCKET_STREAM, segment_size=segment_size) as recorder:
+        for i in range(count):
+            recorder.record(json.dumps({**TRADE, "t": i}), received_ns=1_000_000_000 + i * 1_000_000)
+
+
+def _order_update(order_id: int, status: str, event_time: int, client_order_id: str = "second") -> OrderUpdateData:
+    return OrderUpdateData.from_dict({
+        "e": "executionReport", "E": event_time, "s": "BTCPHP", "c": client_order_id, "S": "BUY", "o": "LIMIT",
+        "f": "GTC", "q": "1.00000000", "p": "90", "P": "0", "x": "NEW", "X": status, "r": "NONE", "i": order_id,
+        "l": "0", "z": "0", "L": "0", "n": "0", "N": None, "T": event_time, "t": -1, "w": True, "m": False,
+        "O": event_time, "Z": "0", "Y": "0", "Q": "0"
+    })